@@ -1,5 +1,20 @@
 # -------------- Used by both HashMaps (SC & OA)  -------------- #
 
+import bisect
+import itertools
+import mmap
+import operator
+import pickle
+import random
+import struct
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 class DynamicArrayException(Exception):
     pass
 
@@ -70,6 +85,56 @@ class DynamicArray:
         return len(self._data)
 
 
+def as_list(items) -> list:
+    """
+    Return items as a list. A DynamicArray is copied element by element
+    since it cannot be iterated; any other iterable is passed to list().
+    """
+    if isinstance(items, list):
+        return items
+    if isinstance(items, DynamicArray):
+        return [items[i] for i in range(items.length())]
+    return list(items)
+
+
+# Pairs of an iterable without a length are loaded at least this many at a time,
+# and at most a quarter more than have been loaded so far
+BULK_CHUNK_SIZE = 1 << 16
+
+
+def bulk_length(items) -> int:
+    """
+    Return number of items without consuming them, or the length an iterator
+    reports about itself, 0 if it reports none.
+    """
+    if isinstance(items, DynamicArray):
+        return items.length()
+    return operator.length_hint(items)
+
+
+def bulk_chunks(items):
+    """
+    Yield items to bulk load in chunks that have a length. Items with a length come
+    as one chunk. Any other iterable is read a chunk at a time so it is never held in
+    memory whole; chunks grow with the number of items loaded, so a table making room
+    for each chunk still resizes only a logarithmic number of times.
+    """
+    if isinstance(items, DynamicArray):
+        items = as_list(items)
+    if hasattr(items, '__len__'):
+        yield items
+        return
+
+    iterator = iter(items)
+    loaded = 0
+    while True:
+        chunk = list(itertools.islice(iterator, max(BULK_CHUNK_SIZE, loaded // 4)))
+        if not chunk:
+            return
+        yield chunk
+        loaded += len(chunk)
+
+
 def hash_function_1(key: str) -> int:
     """Sample Hash function #1 to be used with HashMap implementation"""
     hash = 0
@@ -88,6 +153,185 @@ def hash_function_2(key: str) -> int:
     return hash
 
 
+# Below this many keys the fixed cost of the NumPy calls outweighs the per-key loop
+NUMPY_BATCH_MIN = 128
+
+
+def _code_points(keys: list):
+    """
+    Return code points of all keys joined together as one NumPy array,
+    together with the offsets where each key starts and ends.
+    """
+    lengths = np.fromiter(map(len, keys), dtype=np.int64, count=len(keys))
+    ends = np.cumsum(lengths)
+    codes = np.frombuffer(''.join(keys).encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+    return codes.astype(np.int64), ends - lengths, ends
+
+
+def _hash_function_1_batch(keys: list) -> list:
+    """Vectorised hash_function_1: every key's hash is a difference of two prefix sums."""
+    if len(keys) < NUMPY_BATCH_MIN or not all(type(key) is str for key in keys):
+        return [hash_function_1(key) for key in keys]
+
+    codes, starts, ends = _code_points(keys)
+    totals = np.concatenate(([0], np.cumsum(codes)))
+    return (totals[ends] - totals[starts]).tolist()
+
+
+def _hash_function_2_batch(keys: list) -> list:
+    """
+    Vectorised hash_function_2: code points are weighted by their position within
+    their own key before taking prefix sums.
+    Falls back to the scalar function when the sums could overflow 64 bits.
+    """
+    if len(keys) < NUMPY_BATCH_MIN or not all(type(key) is str for key in keys):
+        return [hash_function_2(key) for key in keys]
+
+    codes, starts, ends = _code_points(keys)
+    if codes.size == 0 or codes.size * int((ends - starts).max()) * 0x110000 >= 1 << 63:
+        return [hash_function_2(key) for key in keys]
+
+    positions = np.arange(1, codes.size + 1) - np.repeat(starts, ends - starts)
+    totals = np.concatenate(([0], np.cumsum(codes * positions)))
+    return (totals[ends] - totals[starts]).tolist()
+
+
+# Vectorised versions of hash functions, hash_many calls them with the whole list of keys
+BATCH_HASH_FUNCTIONS = {hash_function_1: _hash_function_1_batch,
+                        hash_function_2: _hash_function_2_batch} if np is not None else {}
+
+
+def hash_many(function, keys: list) -> list:
+    """
+    Return hash of every key in keys, in order.
+    A hash function registered in BATCH_HASH_FUNCTIONS hashes the whole list in one call,
+    any other function is called once per key.
+    """
+    batch = BATCH_HASH_FUNCTIONS.get(function)
+    if batch is not None:
+        return batch(keys)
+    return list(map(function, keys))
+
+
+# ------- Seedable hash functions usable by both HashMaps ------- #
+
+MASK_64 = (1 << 64) - 1
+
+
+def _key_words(key) -> (tuple, bytes):
+    """
+    Return key as a tuple of little-endian 64-bit words and the remaining tail bytes.
+    Strings are encoded as UTF-8; bytes, bytearray and memoryview are used as they are.
+    """
+    data = key.encode('utf-8') if isinstance(key, str) else bytes(key)
+    body = len(data) - len(data) % 8
+    words = struct.unpack_from('<%dQ' % (body // 8), data)
+    return words, data[body:]
+
+
+def fnv1a_hash(key, seed: int = 0) -> int:
+    """
+    64-bit FNV-1a hash that mixes in a whole 64-bit word per step instead of a byte,
+    followed by a final fold so the high bits reach the low bits.
+    """
+    words, tail = _key_words(key)
+    hash = (0xcbf29ce484222325 ^ seed) & MASK_64
+    for word in words:
+        hash = ((hash ^ word) * 0x100000001b3) & MASK_64
+    hash = ((hash ^ int.from_bytes(tail, 'little') ^ len(tail)) * 0x100000001b3) & MASK_64
+    return hash ^ (hash >> 32)
+
+
+def murmur_hash(key, seed: int = 0) -> int:
+    """64-bit MurmurHash64A: every word is multiplied and shifted before it is mixed in."""
+    words, tail = _key_words(key)
+    m, r = 0xc6a4a7935bd1e995, 47
+    hash = (seed ^ ((len(words) * 8 + len(tail)) * m)) & MASK_64
+
+    for k in words:
+        k = (k * m) & MASK_64
+        k ^= k >> r
+        k = (k * m) & MASK_64
+        hash = ((hash ^ k) * m) & MASK_64
+
+    if tail:
+        hash = ((hash ^ int.from_bytes(tail, 'little')) * m) & MASK_64
+
+    hash ^= hash >> r
+    hash = (hash * m) & MASK_64
+    return hash ^ (hash >> r)
+
+
+def _rotl(x: int, b: int) -> int:
+    """Rotate 64-bit integer left by b bits."""
+    return ((x << b) | (x >> (64 - b))) & MASK_64
+
+
+def siphash(key, seed: int = 0) -> int:
+    """
+    SipHash-2-4 keyed with the low 128 bits of seed, so hash values cannot
+    be predicted by anyone who does not know the seed.
+    """
+    data = key.encode('utf-8') if isinstance(key, str) else bytes(key)
+    k0, k1 = seed & MASK_64, (seed >> 64) & MASK_64
+    v0, v1 = k0 ^ 0x736f6d6570736575, k1 ^ 0x646f72616e646f6d
+    v2, v3 = k0 ^ 0x6c7967656e657261, k1 ^ 0x7465646279746573
+
+    # Last word holds the tail bytes and the input length in its top byte
+    body = len(data) - len(data) % 8
+    words = list(struct.unpack_from('<%dQ' % (body // 8), data))
+    words.append(int.from_bytes(data[body:], 'little') | ((len(data) & 0xff) << 56))
+
+    def sip_rounds(v0, v1, v2, v3, rounds):
+        for _ in range(rounds):
+            v0 = (v0 + v1) & MASK_64
+            v1 = _rotl(v1, 13) ^ v0
+            v0 = _rotl(v0, 32)
+            v2 = (v2 + v3) & MASK_64
+            v3 = _rotl(v3, 16) ^ v2
+            v0 = (v0 + v3) & MASK_64
+            v3 = _rotl(v3, 21) ^ v0
+            v2 = (v2 + v1) & MASK_64
+            v1 = _rotl(v1, 17) ^ v2
+            v2 = _rotl(v2, 32)
+        return v0, v1, v2, v3
+
+    for word in words:
+        v3 ^= word
+        v0, v1, v2, v3 = sip_rounds(v0, v1, v2, v3, 2)
+        v0 ^= word
+
+    v2 ^= 0xff
+    v0, v1, v2, v3 = sip_rounds(v0, v1, v2, v3, 4)
+    return v0 ^ v1 ^ v2 ^ v3
+
+
+def python_hash(key, seed: int = 0) -> int:
+    """
+    Built-in hash of key combined with seed, much faster than the hashes above since
+    strings cache their hash. String hashes differ between processes unless
+    PYTHONHASHSEED is set, so values of this hash should not be written to files.
+    """
+    return hash((key, seed))
+
+
+def seeded_hash_function(function, seed: int = None):
+    """
+    Return a one-argument hash function for a HashMap that calls function with a fixed seed.
+    A random 128-bit seed is drawn when none is given, so every map hashes differently.
+    The seed is available as the seed attribute of the returned function.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(128)
+
+    def hash_function(key) -> int:
+        return function(key, seed)
+
+    hash_function.seed = seed
+    hash_function.__name__ = function.__name__
+    return hash_function
+
+
 # --------- For use in Separate Chaining (SC) HashMap  --------- #
 
 class SLNode:
@@ -95,11 +339,15 @@ class SLNode:
     Singly Linked List node for use in a hash map
     """
 
-    def __init__(self, key: str, value: object, next: "SLNode" = None) -> None:
-        """Initialize node given a key and value."""
+    # Maps hold one node per key, so nodes do without a per-instance __dict__
+    __slots__ = ('key', 'value', 'next', 'hash')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """Initialize node given a key, value and optionally the full hash of the key."""
         self.key = key
         self.value = value
         self.next = next
+        self.hash = hash
 
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
@@ -133,9 +381,11 @@ class LinkedListIterator:
 class LinkedList:
     """
     Class implementing a Singly Linked List
-    Supported methods are: insert, remove, contains, length, iterator
+    Supported methods are: insert, insert_node, remove, pop, contains, length, iterator
     """
 
+    __slots__ = ('_head', '_size')
+
     def __init__(self) -> None:
         """
         Initialize new linked list;
@@ -160,35 +410,55 @@ class LinkedList:
         """Return an iterator for the list, starting at the head."""
         return LinkedListIterator(self._head)
 
-    def insert(self, key: str, value: object) -> None:
+    def insert(self, key: str, value: object, hash: int = None) -> None:
         """Insert new node at front of the list."""
-        self._head = SLNode(key, value, self._head)
+        self._head = SLNode(key, value, self._head, hash)
+        self._size += 1
+
+    def insert_node(self, node: SLNode) -> None:
+        """
+        Insert an existing node at front of the list.
+        Node is relinked in place, no new node is allocated.
+        """
+        node.next = self._head
+        self._head = node
         self._size += 1
 
-    def remove(self, key: str) -> bool:
+    def remove(self, key: str, hash: int = None) -> bool:
         """
         Remove first node with matching key.
+        When the key's hash is given, stored hashes are compared before keys.
         Return True if removal was successful, False otherwise.
         """
+        return self.pop(key, hash) is not None
+
+    def pop(self, key: str, hash: int = None) -> SLNode:
+        """
+        Unlink first node with matching key and return it, or None if no match.
+        When the key's hash is given, stored hashes are compared before keys.
+        """
         previous, node = None, self._head
         while node:
 
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 if previous:
                     previous.next = node.next
                 else:
                     self._head = node.next
                 self._size -= 1
-                return True
+                return node
 
             previous, node = node, node.next
-        return False
+        return None
 
-    def contains(self, key: str) -> SLNode:
-        """Return node with matching key, or None if no match"""
+    def contains(self, key: str, hash: int = None) -> SLNode:
+        """
+        Return node with matching key, or None if no match.
+        When the key's hash is given, stored hashes are compared before keys.
+        """
         node = self._head
         while node:
-            if node.key == key:
+            if (hash is None or node.hash == hash) and node.key == key:
                 return node
             node = node.next
         return node
@@ -198,14 +468,177 @@ class LinkedList:
         return self._size
 
 
+class TreeBucket:
+    """
+    Separate chaining bucket for long chains: nodes are kept sorted by (hash, key) in
+    parallel lists and found by binary search, so a lookup costs O(log n) comparisons
+    instead of a walk over every node. Keys with the same hash that cannot be ordered
+    against each other are found by scanning the run of nodes with that hash.
+    Supports the same methods as LinkedList: insert, insert_node, remove, pop, contains, length, iterator
+    """
+
+    def __init__(self, nodes=()) -> None:
+        """Initialize new bucket holding given nodes."""
+        self._hashes = []
+        self._keys = []
+        self._nodes = []
+        self._ordered_keys = True
+        for node in nodes:
+            self.insert_node(node)
+
+    def __str__(self) -> str:
+        """Override string method to provide more readable output."""
+        return 'TREE [' + ' -> '.join(str(node) for node in self._nodes) + ']'
+
+    def __iter__(self):
+        """Return an iterator over the nodes in (hash, key) order."""
+        return iter(list(self._nodes))
+
+    def _locate(self, key: str, hash: int) -> (int, bool):
+        """
+        Return index of the node with given key, or where it would be inserted,
+        and whether the node was found.
+        """
+        lo = bisect.bisect_left(self._hashes, hash)
+        hi = bisect.bisect_right(self._hashes, hash, lo)
+
+        if self._ordered_keys:
+            try:
+                index = bisect.bisect_left(self._keys, key, lo, hi)
+                return index, index < hi and self._keys[index] == key
+            except TypeError:
+                # Runs are no longer sorted by key once unorderable keys were inserted
+                self._ordered_keys = False
+
+        for index in range(lo, hi):
+            if self._keys[index] == key:
+                return index, True
+        return hi, False
+
+    def insert(self, key: str, value: object, hash: int = None) -> None:
+        """Insert new node for a key that is not in the bucket."""
+        self.insert_node(SLNode(key, value, None, hash))
+
+    def insert_node(self, node: SLNode) -> None:
+        """Insert an existing node for a key that is not in the bucket."""
+        index, _ = self._locate(node.key, node.hash)
+        self._hashes.insert(index, node.hash)
+        self._keys.insert(index, node.key)
+        self._nodes.insert(index, node)
+
+    def remove(self, key: str, hash: int) -> bool:
+        """
+        Remove node with matching key and hash.
+        Return True if removal was successful, False otherwise.
+        """
+        return self.pop(key, hash) is not None
+
+    def pop(self, key: str, hash: int) -> SLNode:
+        """Remove node with matching key and hash and return it, or None if no match."""
+        index, found = self._locate(key, hash)
+        if not found:
+            return None
+
+        del self._hashes[index]
+        del self._keys[index]
+        return self._nodes.pop(index)
+
+    def contains(self, key: str, hash: int) -> SLNode:
+        """Return node with matching key and hash, or None if no match."""
+        index, found = self._locate(key, hash)
+        return self._nodes[index] if found else None
+
+    def length(self) -> int:
+        """Return the length of the bucket."""
+        return len(self._nodes)
+
+
+class CacheNode(SLNode):
+    """
+    SLNode that is also linked into a DoublyLinkedList ordering the entries of a cache,
+    so a hash map chain and the cache's order share one node per entry
+    """
+
+    __slots__ = ('older', 'newer', 'expires', 'size', 'group')
+
+    def __init__(self, key: str, value: object, next: "SLNode" = None, hash: int = None) -> None:
+        """Initialize node given a key, value and optionally the full hash of the key."""
+        super().__init__(key, value, next, hash)
+        self.older = None
+        self.newer = None
+        self.expires = None
+        self.size = 0
+        self.group = None
+
+
+class DoublyLinkedList:
+    """
+    Intrusive circular Doubly Linked List of objects with older / newer attributes,
+    ordered from oldest to newest; the list itself is the sentinel
+    Supported methods are: append, insert_after, unlink, first, next_of, is_empty, length, iterator
+    """
+
+    def __init__(self) -> None:
+        """Initialize new empty list."""
+        self.older = self
+        self.newer = self
+        self._size = 0
+
+    def __iter__(self):
+        """Return a generator over the nodes, oldest first."""
+        node = self.newer
+        while node is not self:
+            following = node.newer
+            yield node
+            node = following
+
+    def insert_after(self, node, anchor=None) -> None:
+        """Link node right after anchor, or at the oldest end when anchor is None."""
+        if anchor is None:
+            anchor = self
+        node.older = anchor
+        node.newer = anchor.newer
+        anchor.newer.older = node
+        anchor.newer = node
+        self._size += 1
+
+    def append(self, node) -> None:
+        """Link node at the newest end."""
+        self.insert_after(node, self.older)
+
+    def unlink(self, node) -> None:
+        """Unlink node from the list."""
+        node.older.newer = node.newer
+        node.newer.older = node.older
+        node.older = node.newer = None
+        self._size -= 1
+
+    def first(self):
+        """Return oldest node, or None if the list is empty."""
+        return None if self.newer is self else self.newer
+
+    def next_of(self, node):
+        """Return node after given node, or None if it is the newest."""
+        return None if node.newer is self else node.newer
+
+    def is_empty(self) -> bool:
+        """Return True if the list has no nodes."""
+        return self.newer is self
+
+    def length(self) -> int:
+        """Return the length of the list."""
+        return self._size
+
+
 # ---------- For use in Open Addressing (OA) HashMap  ---------- #
 
 class HashEntry:
 
-    def __init__(self, key: str, value: object) -> None:
-        """Initialize an entry for use in a hash map."""
+    def __init__(self, key: str, value: object, hash: int = None) -> None:
+        """Initialize an entry for use in a hash map, optionally with the full hash of the key."""
         self.key = key
         self.value = value
+        self.hash = hash
 
         # Set this value to True when you "delete" a HashEntry
         self.is_tombstone = False
@@ -213,3 +646,793 @@ class HashEntry:
     def __str__(self) -> str:
         """Override string method to provide more readable output."""
         return f"K: {self.key} V: {self.value} TS: {self.is_tombstone}"
+
+
+# ----------- Bloom filter in front of either HashMap ----------- #
+
+class BloomFilter:
+    """
+    Register-blocked Bloom filter: a key sets four bits of a single 64-bit word,
+    so adding or checking a key reads one word of the array
+    Keys are hashed with the built-in hash, which strings cache, independently of the
+    map's hash function, so keys whose map hashes collide are still told apart
+    Keys cannot be removed; a map rebuilds its filter once enough keys were removed
+
+    rejections counts might_contain calls that ruled a key out and false_positives
+    the calls a map reported as having let a missing key through
+    """
+
+    def __init__(self, expected: int, bits_per_key: int = 10) -> None:
+        """Initialize new empty filter sized for expected keys."""
+        self._bits_per_key = bits_per_key
+        self.rejections = 0
+        self.false_positives = 0
+        self.reset(expected)
+
+    def reset(self, expected: int) -> None:
+        """Remove every key and resize filter for expected keys, counters are kept."""
+        self._words = array('Q', bytes(8 * max(1, (expected * self._bits_per_key + 63) // 64)))
+        self._count = 0
+
+    def _word_and_mask(self, key) -> (int, int):
+        """Return index of the word a key lives in and the mask of its four bits."""
+        # Multiplying by 2^64 / golden ratio mixes every bit of the hash into the high bits
+        h = ((hash(key) & MASK_64) * 0x9E3779B97F4A7C15) & MASK_64
+        mask = 1 << (h >> 58) | 1 << (h >> 52 & 63) | 1 << (h >> 46 & 63) | 1 << (h >> 40 & 63)
+        return (h >> 8) % len(self._words), mask
+
+    def add(self, key) -> None:
+        """Add key to the filter."""
+        index, mask = self._word_and_mask(key)
+        self._words[index] |= mask
+        self._count += 1
+
+    def might_contain(self, key) -> bool:
+        """Return False if key was never added, True if it may have been."""
+        # Same as _word_and_mask, inlined since every lookup of the map pays for it
+        h = ((hash(key) & MASK_64) * 0x9E3779B97F4A7C15) & MASK_64
+        mask = 1 << (h >> 58) | 1 << (h >> 52 & 63) | 1 << (h >> 46 & 63) | 1 << (h >> 40 & 63)
+
+        if self._words[(h >> 8) % len(self._words)] & mask != mask:
+            self.rejections += 1
+            return False
+        return True
+
+    def stats(self) -> (int, float, float):
+        """
+        Return memory of the bit array in bytes, false positive rate estimated from
+        the share of bits set, and false positive rate observed over checked missing keys
+        """
+        bits = len(self._words) * 64
+        filled = sum(bin(word).count('1') for word in self._words) / bits
+        missing = self.rejections + self.false_positives
+        return (self._words.itemsize * len(self._words), filled ** 4,
+                self.false_positives / missing if missing else 0.0)
+
+
+# ----- Fixed-layout slot table for shared memory and files ----- #
+
+SLOT_EMPTY, SLOT_LIVE, SLOT_TOMBSTONE = 0, 1, 2
+
+# Value type tags in the heap, values of any other type are pickled
+_VALUE_BYTES, _VALUE_STR, _VALUE_INT, _VALUE_NONE, _VALUE_PICKLE, _VALUE_FLOAT = 0, 1, 2, 3, 4, 5
+_FLOAT = struct.Struct('<d')
+
+# Key hashed when a table is created and again when it is opened, to catch a different hash function
+HASH_CHECK_KEY = 'slot table'
+
+
+def _encode_value(value: object) -> (int, bytes):
+    """Return type tag and bytes a value is stored as."""
+    if value is None:
+        return _VALUE_NONE, b''
+    if type(value) is str:
+        return _VALUE_STR, value.encode('utf-8')
+    if type(value) is int and -(1 << 63) <= value < (1 << 63):
+        return _VALUE_INT, value.to_bytes(8, 'little', signed=True)
+    if type(value) is float:
+        return _VALUE_FLOAT, _FLOAT.pack(value)
+    if type(value) is bytes:
+        return _VALUE_BYTES, value
+    return _VALUE_PICKLE, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+
+def _decode_value(tag: int, data, allow_pickle: bool) -> object:
+    """
+    Return value stored as given type tag and bytes
+    Unpickling can run arbitrary code, so pickled values are refused unless allow_pickle is set.
+    """
+    if tag == _VALUE_STR:
+        return str(data, 'utf-8')
+    if tag == _VALUE_INT:
+        return int.from_bytes(data, 'little', signed=True)
+    if tag == _VALUE_NONE:
+        return None
+    if tag == _VALUE_FLOAT:
+        return _FLOAT.unpack(data)[0]
+    if tag == _VALUE_PICKLE:
+        if not allow_pickle:
+            raise ValueError("value is pickled, pass allow_pickle=True only for data from a trusted source")
+        return pickle.loads(data)
+    return bytes(data)
+
+
+class SlotTable:
+    """
+    Open addressing bucket array with a fixed binary layout inside a buffer,
+    such as a shared memory block or a memory-mapped file:
+
+    header  magic, layout version, write sequence, capacity, size, tombstones,
+            heap bytes used, heap capacity, hash of HASH_CHECK_KEY
+    slots   capacity times (hash, key offset, value offset, state)
+    heap    keys as length + UTF-8 bytes, values as type tag + length + bytes
+
+    Keys are strings and are found by quadratic probing over the stored 64-bit hashes.
+    Nothing is deserialized beyond the slots probed and the record being read.
+    The write sequence is odd while a write is in progress (a seqlock).
+
+    Values other than bytes, strings, 64-bit integers, floats and None are pickled. Reading
+    one back raises ValueError unless the table was wrapped with allow_pickle, since
+    unpickling data from an untrusted file or shared memory block can run arbitrary code.
+    """
+
+    MAGIC = b'HMAP'
+    LAYOUT_VERSION = 2
+    HEADER = struct.Struct('<4sIQQQQQQQ')
+    SLOT = struct.Struct('<QQQQ')
+    _COUNTS = struct.Struct('<QQQ')
+    _COUNTS_OFFSET = 24
+    _LENGTH = struct.Struct('<I')
+    _VALUE = struct.Struct('<BI')
+
+    def __init__(self, buffer, allow_pickle: bool = False) -> None:
+        """Wrap a buffer that already holds a slot table, reading pickled values only with allow_pickle."""
+        self._buffer = memoryview(buffer).cast('B')
+        self._allow_pickle = allow_pickle
+        if len(self._buffer) < self.HEADER.size:
+            raise ValueError("buffer does not hold a slot table")
+
+        magic, version, _, capacity, _, _, _, heap_capacity, check = self.HEADER.unpack_from(self._buffer)
+        if magic != self.MAGIC or version != self.LAYOUT_VERSION:
+            raise ValueError("buffer does not hold a slot table")
+
+        self.capacity = capacity
+        self.heap_capacity = heap_capacity
+        self.hash_check = check
+        self._heap_start = self.HEADER.size + capacity * self.SLOT.size
+
+    @classmethod
+    def required_size(cls, capacity: int, heap_capacity: int) -> int:
+        """Return number of bytes a slot table of given capacity and heap size needs."""
+        return cls.HEADER.size + capacity * cls.SLOT.size + heap_capacity
+
+    @classmethod
+    def initialize(cls, buffer, capacity: int, heap_capacity: int, function) -> "SlotTable":
+        """Write an empty slot table for keys hashed by function into buffer and return it."""
+        buffer = memoryview(buffer).cast('B')
+        if len(buffer) < cls.required_size(capacity, heap_capacity):
+            raise ValueError("buffer too small for slot table")
+
+        check = function(HASH_CHECK_KEY) & MASK_64
+        cls.HEADER.pack_into(buffer, 0, cls.MAGIC, cls.LAYOUT_VERSION, 0, capacity, 0, 0, 0, heap_capacity, check)
+        start = cls.HEADER.size
+        buffer[start:start + capacity * cls.SLOT.size] = bytes(capacity * cls.SLOT.size)
+        return cls(buffer)
+
+    @classmethod
+    def build(cls, capacity: int, entries: list, function) -> bytes:
+        """
+        Return the bytes of a full slot table of given capacity
+        Input: Capacity (int), (hash, key, value) tuples (list), Hash function (function)
+        """
+        slots = bytearray(capacity * cls.SLOT.size)
+        pack_slot, pack_length, pack_value = cls.SLOT.pack_into, cls._LENGTH.pack, cls._VALUE.pack
+        states = bytearray(capacity)
+        heap = []
+        heap_used = 0
+
+        # Records are only collected here and joined once at the end
+        for hash_value, key, value in entries:
+            hash_value &= MASK_64
+            data = key.encode('utf-8')
+            tag, value_data = _encode_value(value)
+
+            j = 0
+            index = hash_value % capacity
+            while states[index]:
+                j += 1
+                index = (hash_value + j * j) % capacity
+            states[index] = SLOT_LIVE
+
+            value_offset = heap_used + cls._LENGTH.size + len(data)
+            pack_slot(slots, index * cls.SLOT.size, hash_value, heap_used, value_offset, SLOT_LIVE)
+            heap += (pack_length(len(data)), data, pack_value(tag, len(value_data)), value_data)
+            heap_used = value_offset + cls._VALUE.size + len(value_data)
+
+        header = cls.HEADER.pack(cls.MAGIC, cls.LAYOUT_VERSION, 0, capacity, len(entries), 0, heap_used, heap_used,
+                                 function(HASH_CHECK_KEY) & MASK_64)
+        return b''.join([header, slots] + heap)
+
+    def check_function(self, function) -> None:
+        """Raise ValueError if the table was not built with keys hashed by function."""
+        if function(HASH_CHECK_KEY) & MASK_64 != self.hash_check:
+            raise ValueError("slot table was built with a different hash function")
+
+    def release(self) -> None:
+        """Release the view of the buffer so the buffer can be closed."""
+        self._buffer.release()
+
+    def sequence(self) -> int:
+        """Return the write sequence number, odd while a write is in progress."""
+        return int.from_bytes(self._buffer[8:16], 'little')
+
+    def set_sequence(self, sequence: int) -> None:
+        """Store the write sequence number."""
+        self._buffer[8:16] = sequence.to_bytes(8, 'little')
+
+    def counts(self) -> (int, int, int):
+        """Return size, tombstones and heap bytes used."""
+        return self._COUNTS.unpack_from(self._buffer, self._COUNTS_OFFSET)
+
+    def set_counts(self, size: int, tombstones: int, heap_used: int) -> None:
+        """Store size, tombstones and heap bytes used."""
+        self._COUNTS.pack_into(self._buffer, self._COUNTS_OFFSET, size, tombstones, heap_used)
+
+    def read_slot(self, index: int) -> (int, int, int, int):
+        """Return hash, key offset, value offset and state of a slot."""
+        return self.SLOT.unpack_from(self._buffer, self.HEADER.size + index * self.SLOT.size)
+
+    def write_slot(self, index: int, hash: int, key_offset: int, value_offset: int, state: int) -> None:
+        """Store hash, key offset, value offset and state of a slot."""
+        self.SLOT.pack_into(self._buffer, self.HEADER.size + index * self.SLOT.size,
+                            hash, key_offset, value_offset, state)
+
+    def find(self, hash_value: int, data: bytes) -> (int, tuple):
+        """
+        Return bucket index and slot of the live key with given hash and UTF-8 bytes, None otherwise
+        """
+        capacity, slot_size = self.capacity, self.SLOT.size
+        unpack, buffer, start = self.SLOT.unpack_from, self._buffer, self.HEADER.size
+
+        for j in range(capacity):
+            index = (hash_value + j * j) % capacity
+            slot = unpack(buffer, start + index * slot_size)
+            state = slot[3]
+
+            if state == SLOT_EMPTY:
+                break
+
+            if state == SLOT_LIVE and slot[0] == hash_value and self.key_equals(slot[1], data):
+                return index, slot
+
+        return None, None
+
+    def items(self) -> list:
+        """Return list of key/value tuples of every live slot."""
+        pairs = []
+        for index in range(self.capacity):
+            _, key_offset, value_offset, state = self.read_slot(index)
+            if state == SLOT_LIVE:
+                pairs.append((self.read_key(key_offset), self.read_value(value_offset)))
+        return pairs
+
+    def read_key(self, offset: int) -> str:
+        """Return key stored at given heap offset."""
+        start = self._heap_start + offset + self._LENGTH.size
+        length, = self._LENGTH.unpack_from(self._buffer, start - self._LENGTH.size)
+        return str(self._buffer[start:start + length], 'utf-8')
+
+    def key_equals(self, offset: int, data: bytes) -> bool:
+        """Return True if the key stored at given heap offset has the given UTF-8 bytes."""
+        start = self._heap_start + offset + self._LENGTH.size
+        length, = self._LENGTH.unpack_from(self._buffer, start - self._LENGTH.size)
+        return length == len(data) and self._buffer[start:start + length] == data
+
+    def read_value(self, offset: int) -> object:
+        """Return value stored at given heap offset."""
+        start = self._heap_start + offset + self._VALUE.size
+        tag, length = self._VALUE.unpack_from(self._buffer, start - self._VALUE.size)
+        return _decode_value(tag, self._buffer[start:start + length], self._allow_pickle)
+
+    def _append(self, heap_used: int, prefix: bytes, data: bytes) -> int:
+        """Copy prefix and data to the end of the used heap and return the new heap size."""
+        end = heap_used + len(prefix) + len(data)
+        if end > self.heap_capacity:
+            raise ValueError("slot table heap is full")
+
+        start = self._heap_start + heap_used
+        self._buffer[start:start + len(prefix)] = prefix
+        self._buffer[start + len(prefix):self._heap_start + end] = data
+        return end
+
+    def append_key(self, heap_used: int, data: bytes) -> int:
+        """Store UTF-8 key bytes after heap_used bytes of heap and return the new heap size."""
+        return self._append(heap_used, self._LENGTH.pack(len(data)), data)
+
+    def append_value(self, heap_used: int, value: object) -> int:
+        """Store value after heap_used bytes of heap and return the new heap size."""
+        tag, data = _encode_value(value)
+        return self._append(heap_used, self._VALUE.pack(tag, len(data)), data)
+
+    def _record_size(self, offset: int, prefix: struct.Struct) -> int:
+        """Return number of bytes of the record at given heap offset, its length prefix included."""
+        return prefix.size + prefix.unpack_from(self._buffer, self._heap_start + offset)[-1]
+
+    def compact(self) -> None:
+        """
+        Drop tombstones and the heap records no live slot points to, in place
+        Records keep their order and slide towards the start of the heap, then the live
+        slots are placed again by probing. The caller holds the write sequence odd.
+        """
+        live = [self.read_slot(index) for index in range(self.capacity)]
+        live = [slot for slot in live if slot[3] == SLOT_LIVE]
+
+        # Every key and value record in heap order, with the live slot and field pointing at it
+        records = sorted([(slot[1], number, 1) for number, slot in enumerate(live)] +
+                         [(slot[2], number, 2) for number, slot in enumerate(live)])
+        offsets = [[hash_value, 0, 0] for hash_value, _, _, _ in live]
+        buffer, start = self._buffer, self._heap_start
+        heap_used = 0
+
+        # A record only ever moves down over dead bytes, so it cannot overwrite one not moved yet
+        for offset, number, field in records:
+            length = self._record_size(offset, self._LENGTH if field == 1 else self._VALUE)
+            if offset != heap_used:
+                buffer[start + heap_used:start + heap_used + length] = bytes(buffer[start + offset:start + offset + length])
+            offsets[number][field] = heap_used
+            heap_used += length
+
+        slots_start = self.HEADER.size
+        buffer[slots_start:start] = bytes(start - slots_start)
+
+        for hash_value, key_offset, value_offset in offsets:
+            j = 0
+            index = hash_value % self.capacity
+            while self.read_slot(index)[3] != SLOT_EMPTY:
+                j += 1
+                index = (hash_value + j * j) % self.capacity
+            self.write_slot(index, hash_value, key_offset, value_offset, SLOT_LIVE)
+
+        self.set_counts(len(live), 0, heap_used)
+
+
+class MappedHashMap:
+    """
+    Read-mostly hash map served straight from a slot table file mapped into memory,
+    returned by HashMap.open of both hash maps
+
+    Opening maps the file instead of reading it, so only the pages of the buckets and
+    records that lookups touch are ever read from disk. The mapping is copy-on-write:
+    removing a key marks its bucket in a private copy of that page and the file is not changed.
+    Keys put after opening are kept in an overlay dict in front of the mapping.
+    """
+
+    def __init__(self, path: str, function, allow_pickle: bool = False) -> None:
+        """
+        Maps slot table file at path, keys must have been hashed by function
+        Pickled values are only read with allow_pickle, set it only for trusted files
+
+        Input: Path (string), Hash function (function), Read pickled values (boolean)
+        """
+        with open(path, 'rb') as file:
+            self._mapping = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+        try:
+            self._table = SlotTable(self._mapping, allow_pickle)
+        except ValueError:
+            self._mapping.close()
+            raise
+
+        try:
+            self._table.check_function(function)
+        except ValueError:
+            self.close()
+            raise
+
+        self._hash_function = function
+        self._overlay = {}
+
+    def close(self) -> None:
+        """
+        Unmaps the file, the map cannot be used afterwards
+        """
+        self._table.release()
+        self._mapping.close()
+
+    def _find_slot(self, key: str) -> (int, tuple):
+        """
+        Returns bucket index and slot of the live key in the mapping, None otherwise
+
+        Input: Key (string)
+        Output: Index (int), Slot (tuple)
+        """
+        return self._table.find(self._hash_function(key) & MASK_64, key.encode('utf-8'))
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (string)
+        Output: Value (object)
+        """
+        if key in self._overlay:
+            return self._overlay[key]
+
+        index, slot = self._find_slot(key)
+        if index is None:
+            return None
+        return self._table.read_value(slot[2])
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns true if given key is in hash map, False otherwise
+
+        Input: Key (string)
+        Output: Boolean
+        """
+        return key in self._overlay or self._find_slot(key)[0] is not None
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+
+        Input: Key (string), Value (object)
+        """
+        if key not in self._overlay:
+            self._remove_slot(key)
+        self._overlay[key] = value
+
+    def _remove_slot(self, key: str) -> None:
+        """
+        Marks bucket of given key in the mapping as a tombstone if the key is there
+
+        Input: Key (string)
+        """
+        index, slot = self._find_slot(key)
+
+        if index is not None:
+            size, tombstones, heap_used = self._table.counts()
+            self._table.write_slot(index, slot[0], slot[1], slot[2], SLOT_TOMBSTONE)
+            self._table.set_counts(size - 1, tombstones + 1, heap_used)
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value if it exists within hash map
+
+        Input: Key (string)
+        """
+        if self._overlay.pop(key, self) is self:
+            self._remove_slot(key)
+
+    def get_size(self) -> int:
+        """
+        Returns number of key/value pairs stored in hash map
+        """
+        return self._table.counts()[0] + len(self._overlay)
+
+    def get_capacity(self) -> int:
+        """
+        Returns number of buckets in the mapped table
+        """
+        return self._table.capacity
+
+    def table_load(self) -> float:
+        """
+        Returns load factor of the mapped table
+
+        Output: Load factor (float)
+        """
+        return self._table.counts()[0] / self._table.capacity
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map
+
+        Output: Array (DynamicArray)
+        """
+        return DynamicArray(self._table.items() + list(self._overlay.items()))
+
+    def __iter__(self):
+        """
+        Iterator implementation for hash map
+        """
+        self._index = 0
+        self._live = self.get_keys_and_values()
+        return self
+
+    def __next__(self):
+        """
+        Returns next item in hash map as a HashEntry based on iterator's current location
+        """
+        if self._index >= self._live.length():
+            raise StopIteration
+
+        key, value = self._live[self._index]
+        self._index += 1
+        return HashEntry(key, value)
+
+
+def save_slot_table(path: str, capacity: int, pairs: list, function) -> None:
+    """
+    Writes key/value pairs to a file as a slot table of given capacity that
+    MappedHashMap can serve lookups from, keys are hashed by function
+
+    Input: Path (string), Capacity (int), Pairs (list), Hash function (function)
+    """
+    entries = [(hash_value, key, value)
+               for hash_value, (key, value) in zip(hash_many(function, [key for key, _ in pairs]), pairs)]
+    with open(path, 'wb') as file:
+        file.write(SlotTable.build(capacity, entries, function))
+
+
+# ------- Immutable map built on a minimal perfect hash ------- #
+
+class FrozenHashMap:
+    """
+    Immutable hash map returned by HashMap.freeze of both hash maps, built with a
+    CHD (compress, hash and displace) minimal perfect hash
+
+    Keys are hashed once with function(key, seed) into a value h, which picks one of
+    about size / KEYS_PER_BUCKET buckets, each with a displacement k, and the
+    key is stored at slot (f1 + (k // size) * f2 + k) % size, where f1 and f2 are h modulo
+    two fixed primes. Every key gets its own slot and no slot is left empty,
+    so a lookup is one hash, one displacement and one key comparison.
+    Dividing by numbers below 2^30, a single digit of a Python int, keeps this fast.
+
+    function must change every bit of its result with the seed, as python_hash, murmur_hash
+    and siphash do; keys that differ only in their last bytes keep related fnv1a_hash values.
+
+    Keys and values are kept in two flat lists ordered by slot, displacements in an array.
+    """
+
+    # Larger buckets save displacements but leave too few single keys to fill the
+    # last free slots, so the buckets of two keys placed last need ever more tries
+    KEYS_PER_BUCKET = 2
+
+    # Header of a saved map: magic, format version, size, bucket count, seed, hash of HASH_CHECK_KEY
+    HEADER = struct.Struct('<4sIQQQQ')
+    MAGIC = b'FHMP'
+    VERSION = 2
+
+    # Type tag and length in front of every saved key and value, as in a SlotTable heap
+    RECORD = struct.Struct('<BI')
+
+    # Seeds tried before giving up, a few are only needed for very small maps
+    MAX_SEEDS = 64
+
+    # Largest primes below 2^30, so f1 and f2 depend on every bit of the hash
+    # even when the size is a power of two
+    F1_PRIME, F2_PRIME = 1073741789, 1073741783
+
+    # Stands in for the key of the single slot of an empty map, equal to no key
+    _NO_KEY = object()
+
+    def __init__(self, pairs, function=python_hash) -> None:
+        """
+        Builds map from key/value pairs, the last value of a repeated key wins
+
+        Input: Iterable of (key, value) tuples or DynamicArray, Seeded hash function (function)
+        """
+        pairs = list(dict(as_list(pairs)).items())
+        self._hash_function = function
+
+        for seed in range(self.MAX_SEEDS):
+            if self._build(pairs, seed):
+                return
+
+        raise ValueError('no perfect hash found, hash function may not mix its seed into every bit')
+
+    def _build(self, pairs: list, seed: int) -> bool:
+        """
+        Places every pair in a slot of its own using given seed, False if that failed
+
+        Input: Pairs (list), Seed (int)
+        Output: Boolean
+        """
+        size = len(pairs)
+        slots = max(1, size)
+        bucket_count = max(1, -(-size // self.KEYS_PER_BUCKET))
+        function = self._hash_function
+
+        # Seeds are spread over all 64 bits, small ones barely change the low bits of some hashes
+        seed = (seed * 0x9E3779B97F4A7C15) & MASK_64
+        hashes = [function(key, seed) for key, _ in pairs]
+        buckets = [[] for _ in range(bucket_count)]
+        for index, h in enumerate(hashes):
+            buckets[h % bucket_count].append(index)
+
+        # Counting sort so the largest buckets are placed while the table is still empty
+        by_size = [[] for _ in range(max(2, max(len(bucket) for bucket in buckets) + 1))]
+        for bucket_index, bucket in enumerate(buckets):
+            by_size[len(bucket)].append(bucket_index)
+
+        taken = bytearray(slots)
+        slot_of = [0] * size
+        displacements = array('Q', bytes(8 * bucket_count))
+
+        for bucket_size in range(len(by_size) - 1, 1, -1):
+            for bucket_index in by_size[bucket_size]:
+                members = buckets[bucket_index]
+                offsets = [(hashes[index] % self.F1_PRIME % slots, hashes[index] % self.F2_PRIME)
+                           for index in members]
+
+                # Keys sharing both offsets land on the same slot for every displacement
+                if len({(f1, f2 % slots) for f1, f2 in offsets}) < bucket_size:
+                    return False
+
+                for k in range(slots * slots):
+                    d0 = k // slots
+                    positions = [(f1 + d0 * f2 + k) % slots for f1, f2 in offsets]
+                    if len(set(positions)) == bucket_size and not any(taken[p] for p in positions):
+                        break
+                else:
+                    return False
+
+                displacements[bucket_index] = k
+                for index, position in zip(members, positions):
+                    taken[position] = 1
+                    slot_of[index] = position
+
+        # A single key can be sent straight to any free slot
+        free = (position for position in range(slots) if not taken[position])
+        for bucket_index in by_size[1]:
+            index = buckets[bucket_index][0]
+            position = next(free)
+            displacements[bucket_index] = (position - hashes[index] % self.F1_PRIME) % slots
+            slot_of[index] = position
+
+        self._keys = [self._NO_KEY] * slots
+        self._values = [None] * slots
+        for (key, value), position in zip(pairs, slot_of):
+            self._keys[position] = key
+            self._values[position] = value
+
+        self._size = size
+        self._slots = slots
+        self._bucket_count = bucket_count
+        self._displacements = displacements
+        self._seed = seed
+        return True
+
+    def _slot(self, key) -> int:
+        """
+        Returns the only slot given key can be stored in
+
+        Input: Key (object)
+        Output: Slot (int)
+        """
+        slots = self._slots
+        h = self._hash_function(key, self._seed)
+        k = self._displacements[h % self._bucket_count]
+        return (h % self.F1_PRIME + (k // slots) * (h % self.F2_PRIME) + k) % slots
+
+    def get(self, key) -> object:
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (object)
+        Output: Value (object)
+        """
+        # Same as _slot, inlined since it is all a lookup does
+        slots = self._slots
+        h = self._hash_function(key, self._seed)
+        k = self._displacements[h % self._bucket_count]
+        position = (h % self.F1_PRIME + (k // slots) * (h % self.F2_PRIME) + k) % slots
+
+        if self._keys[position] == key:
+            return self._values[position]
+        return None
+
+    def contains_key(self, key) -> bool:
+        """
+        Returns True if given key is in hash map, False otherwise
+
+        Input: Key (object)
+        Output: Boolean
+        """
+        return self._keys[self._slot(key)] == key
+
+    def get_size(self) -> int:
+        """
+        Returns number of key/value pairs stored in hash map
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Returns number of slots, equal to the size since no slot is left empty
+        """
+        return self._slots
+
+    def table_load(self) -> float:
+        """
+        Returns load factor of the table
+
+        Output: Load factor (float)
+        """
+        return self._size / self._slots
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map
+
+        Output: Array (DynamicArray)
+        """
+        return DynamicArray(list(zip(self._keys[:self._size], self._values[:self._size])))
+
+    def __iter__(self):
+        """
+        Iterator implementation for hash map
+        """
+        self._index = 0
+        return self
+
+    def __next__(self):
+        """
+        Returns next item in hash map as a HashEntry based on iterator's current location
+        """
+        if self._index >= self._size:
+            raise StopIteration
+
+        entry = HashEntry(self._keys[self._index], self._values[self._index])
+        self._index += 1
+        return entry
+
+    def save(self, path: str) -> None:
+        """
+        Writes hash map to a file as its displacements followed by the keys and then the values
+        in slot order, encoded like SlotTable values; keys and values of other types than
+        bytes, strings, 64-bit integers, floats and None are pickled
+
+        Input: Path (string)
+        """
+        header = self.HEADER.pack(self.MAGIC, self.VERSION, self._size, self._bucket_count, self._seed,
+                                  self._hash_function(HASH_CHECK_KEY, self._seed) & MASK_64)
+        records = []
+        for item in self._keys[:self._size] + self._values[:self._size]:
+            tag, data = _encode_value(item)
+            records += (self.RECORD.pack(tag, len(data)), data)
+
+        with open(path, 'wb') as file:
+            file.write(header)
+            file.write(self._displacements.tobytes())
+            file.write(b''.join(records))
+
+    @classmethod
+    def open(cls, path: str, function=python_hash, allow_pickle: bool = False) -> "FrozenHashMap":
+        """
+        Returns hash map saved to path by save
+        If function hashes differently than the one it was saved with, as python_hash does
+        in another process, the perfect hash is rebuilt from the saved keys.
+        Pickled keys and values raise ValueError unless allow_pickle is set, which must
+        only be done for trusted files since unpickling can run arbitrary code.
+
+        Input: Path (string), Seeded hash function (function), Read pickled keys and values (boolean)
+        Output: Hash map (FrozenHashMap)
+        """
+        with open(path, 'rb') as file:
+            magic, version, size, bucket_count, seed, check = cls.HEADER.unpack(file.read(cls.HEADER.size))
+            if magic != cls.MAGIC or version != cls.VERSION:
+                raise ValueError('not a frozen hash map file')
+
+            displacements = array('Q')
+            displacements.frombytes(file.read(8 * bucket_count))
+            data = memoryview(file.read())
+
+        items = []
+        offset = 0
+        for _ in range(2 * size):
+            tag, length = cls.RECORD.unpack_from(data, offset)
+            offset += cls.RECORD.size + length
+            items.append(_decode_value(tag, data[offset - length:offset], allow_pickle))
+        keys, values = (items[:size], items[size:]) if size else ([cls._NO_KEY], [None])
+
+        if function(HASH_CHECK_KEY, seed) & MASK_64 != check:
+            return cls(zip(keys[:size], values[:size]), function)
+
+        frozen = cls.__new__(cls)
+        frozen._hash_function = function
+        frozen._keys, frozen._values = keys, values
+        frozen._size, frozen._slots = size, max(1, size)
+        frozen._bucket_count, frozen._displacements, frozen._seed = bucket_count, displacements, seed
+        return frozen
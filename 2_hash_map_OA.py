@@ -1,194 +1,2365 @@
 # Name: Daniel Kim
 # Description: Class definition for HashMap with open addressing implementation
 
-from a6_include import DynamicArray, DynamicArrayException, HashEntry, hash_function_1, hash_function_2
+import math
+import time
+from array import array
+from multiprocessing import shared_memory
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from a6_include import (DynamicArray, DynamicArrayException, HashEntry, hash_function_1, hash_function_2, as_list,
+                        bulk_chunks, bulk_length, hash_many, fnv1a_hash, SlotTable, MappedHashMap, save_slot_table,
+                        BloomFilter, FrozenHashMap, python_hash, MASK_64)
+
+# Probe sequences supported by HashMap
+PROBING_STRATEGIES = ('linear', 'quadratic', 'double')
 
 
 class HashMap:
+    # Subclasses with their own storage have no Bloom filter and never shrink on their own
+    _bloom = None
+    _shrink_threshold = None
+
+    def __init__(self, capacity: int, function, incremental_resize: bool = False, rehash_step: int = 4,
+                 compact_threshold: float = 0.75, probing: str = 'quadratic',
+                 second_function=None, bloom_filter: bool = False,
+                 shrink_threshold: float = None) -> None:
+        """
+        Initialize new HashMap that uses open addressing for collision resolution
+        Probing is 'linear', 'quadratic' or 'double' (double hashing with second_function,
+        or with a step taken from the higher digits of function's hash when it is None)
+
+        With incremental_resize, growing the table keeps the old bucket array live and
+        every put / get / contains_key / remove migrates up to rehash_step old buckets;
+        puts and removes migrate more when needed to finish before the next resize or compaction
+
+        Table is compacted at the same capacity once live entries plus tombstones
+        occupy compact_threshold of the buckets. Growing happens at 0.5, so compact_threshold
+        must be above 0.5 (and at most 1), otherwise every put would compact without removing anything
+
+        With bloom_filter, a BloomFilter of the keys lets get, contains_key
+        and remove return without probing for most missing keys
+
+        With shrink_threshold, removing keys until the load factor falls below it shrinks the
+        table to twice that load factor, never below the initial capacity. Growing happens at
+        0.5, so shrink_threshold must be below 0.25 and half of the keys left have to be removed
+        (or their number doubled) before the capacity changes again.
+        """
+        if shrink_threshold is not None and not 0 < shrink_threshold < 0.25:
+            raise ValueError("shrink_threshold must be between 0 and 0.25")
+
+        if not 0.5 < compact_threshold <= 1:
+            raise ValueError("compact_threshold must be above 0.5 and at most 1")
+
+        self._buckets = DynamicArray()
+
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        for _ in range(self._capacity):
+            self._buckets.append(None)
+
+        self._hash_function = function
+        self._size = 0
+
+        if probing not in PROBING_STRATEGIES:
+            raise ValueError(f"probing must be one of {PROBING_STRATEGIES}")
+        self._probing = probing
+        self._second_function = second_function
+
+        # Tombstones in the current bucket array, tracked separately from size
+        self._tombstones = 0
+        self._compact_threshold = compact_threshold
+
+        # Old bucket array and next old bucket to migrate while an incremental resize is running
+        self._incremental_resize = incremental_resize
+        self._rehash_step = rehash_step
+        self._old_buckets = None
+        self._rehash_index = 0
+
+        # Keys removed since the Bloom filter was last rebuilt still have their bits set
+        self._bloom = BloomFilter(self._capacity) if bloom_filter else None
+        self._bloom_removals = 0
+
+        self._shrink_threshold = shrink_threshold
+        self._min_capacity = self._capacity
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        out = ''
+        for i in range(self._buckets.length()):
+            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
+        return out
+
+    def _next_prime(self, capacity: int) -> int:
+        """
+        Increment from given number to find the closest prime number
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        if capacity % 2 == 0:
+            capacity += 1
+
+        while not self._is_prime(capacity):
+            capacity += 2
+
+        return capacity
+
+    @staticmethod
+    def _is_prime(capacity: int) -> bool:
+        """
+        Determine if given integer is a prime number and return boolean
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        if capacity == 2 or capacity == 3:
+            return True
+
+        if capacity == 1 or capacity % 2 == 0:
+            return False
+
+        factor = 3
+        while factor ** 2 <= capacity:
+            if capacity % factor == 0:
+                return False
+            factor += 2
+
+        return True
+
+    def get_size(self) -> int:
+        """
+        Return size of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._capacity
+
+    def get_tombstone_count(self) -> int:
+        """
+        Return number of tombstones in the bucket array
+        """
+        return self._tombstones
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+         Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+
+         Input: Key (string), Value (object)
+         """
+        if self._old_buckets is not None:
+            self._rehash(self._rehash_pace())
+
+        # Check load factor and resize accordingly
+        load_factor = self.table_load()
+
+        if load_factor >= 0.5:
+            if self._incremental_resize is True:
+                self._start_rehash(self._capacity * 2)
+            else:
+                self.resize_table(self._capacity * 2)
+
+        # Rebuild at the same capacity once tombstones push bucket occupancy over the threshold
+        elif (self._size + self._tombstones) / self._capacity >= self._compact_threshold:
+            self.compact()
+
+        self._put(key, value)
+
+    def _put(self, key: str, value: object) -> None:
+        """
+        Updates or adds key/value pair without checking load factor or tombstone occupancy
+
+        Input: Key (string), Value (object)
+        """
+        hash_value = self._hash_function(key)
+
+        # Key that has not been migrated yet is updated in the old bucket array
+        if self._old_buckets is not None:
+            element = self._probe_old_buckets(key, hash_value)
+            if element is not None:
+                element.value = value
+                return
+
+        tombstone_index = None
+        index, step, increment = self._probe_start(hash_value, key, self._capacity)
+
+        # Follow probe sequence until matching key or empty bucket is found
+        for _ in range(self._capacity):
+            element = self._buckets[index]
+
+            # Empty bucket ends the probe sequence, key does not exist
+            if element is None:
+                break
+
+            # Remember first tombstone so it can be reused, but keep probing for matching key
+            if element.is_tombstone is True:
+                if tombstone_index is None:
+                    tombstone_index = index
+
+            # Found matching key, and it is not a tombstone, update value only
+            elif element.hash == hash_value and element.key == key:
+                element.value = value
+                return
+
+            index = (index + step) % self._capacity
+            step += increment
+
+        # Insert element into first tombstone or empty bucket and increment size
+        if tombstone_index is not None:
+            index = tombstone_index
+            self._tombstones -= 1
+        self._buckets[index] = HashEntry(key, value, hash_value)
+        self._size += 1
+        if self._bloom is not None:
+            self._bloom.add(key)
+
+    @classmethod
+    def from_items(cls, iterable, expected_size: int = None, function=hash_function_1, **options) -> "HashMap":
+        """
+        Returns new hash map holding the key/value pairs of iterable, allocated once at
+        the capacity needed for expected_size pairs (number of pairs when not given,
+        or the length an iterator reports about itself)
+
+        Input: Iterable of (key, value) tuples or DynamicArray, Expected size (int), Hash function
+        Output: Hash map (HashMap)
+        """
+        if expected_size is None:
+            expected_size = bulk_length(iterable)
+
+        hash_map = cls(11, function, **options)
+        hash_map._reserve(expected_size)
+        hash_map.put_many(iterable)
+        return hash_map
+
+    def put_many(self, iterable) -> None:
+        """
+        Updates or adds every key/value pair of iterable, resizing at most once up front
+        instead of checking the load factor for every pair; an iterable without a length
+        is read in chunks, each resizing at most once, so it is never copied whole
+
+        Input: Iterable of (key, value) tuples or DynamicArray
+        """
+        for items in bulk_chunks(iterable):
+            self._reserve(len(items))
+
+            for key, value in items:
+                self._put(key, value)
+
+    def save(self, path: str) -> None:
+        """
+        Writes hash map to a file as a snapshot of buckets, cached hashes and serialized
+        keys/values that open can serve lookups from without loading it
+
+        Input: Path (string)
+        """
+        pairs = as_list(self.get_keys_and_values())
+        save_slot_table(path, self._next_prime(2 * len(pairs) + 1), pairs, self._hash_function)
+
+    @classmethod
+    def open(cls, path: str, function=hash_function_1, mmap: bool = True, allow_pickle: bool = False,
+             **options):
+        """
+        Returns hash map saved to path by save; function must be the one it was saved with
+        With mmap the file is mapped and served by a MappedHashMap, so opening reads only
+        the pages lookups touch. Otherwise every pair is loaded into a new hash map.
+        Values save had to pickle raise ValueError unless allow_pickle is set, which
+        must only be done for trusted files since unpickling can run arbitrary code.
+
+        Input: Path (string), Hash function, Map file (boolean), Read pickled values (boolean)
+        Output: Hash map (MappedHashMap or HashMap)
+        """
+        if mmap:
+            return MappedHashMap(path, function, allow_pickle)
+
+        with open(path, 'rb') as file:
+            table = SlotTable(file.read(), allow_pickle)
+        table.check_function(function)
+        return cls.from_items(table.items(), function=function, **options)
+
+    def freeze(self, function=python_hash) -> FrozenHashMap:
+        """
+        Returns immutable copy of hash map built on a minimal perfect hash, so every
+        lookup is a single call of function(key, seed) and a single key comparison
+
+        Input: Seeded hash function (function)
+        Output: Hash map (FrozenHashMap)
+        """
+        return FrozenHashMap(self.get_keys_and_values(), function)
+
+    def _reserve(self, count: int) -> None:
+        """
+        Makes room for given number of new keys with a single resize so they can be
+        inserted with _put without any load factor checks
+
+        Input: Number of keys (int)
+        """
+        self._finish_rehash()
+
+        # Grow straight to the final capacity, or compact if only tombstones are in the way
+        needed = self._size + count
+        if ((needed - 1) / self._capacity >= 0.5
+                or (needed + self._tombstones) / self._capacity >= self._compact_threshold):
+            self.resize_table(max(self._capacity, 2 * needed + 1))
+
+    def table_load(self) -> float:
+        """
+        Returns hash table's current load factor
+
+        Output: Load factor (float)
+        """
+        number_of_elements = self._size
+        number_of_buckets = self._capacity
+        return number_of_elements / number_of_buckets
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets in hash table
+        Tombstones still end no probe sequence, so they are not counted as empty
+
+        Output: Number of empty buckets (int)
+        """
+        self._finish_rehash()
+        return self._capacity - self._size - self._tombstones
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes hash map table based on new capacity input
+
+        Input: New capacity (int)
+        """
+        # Return if new capacity is less than number of elements in hash map
+        if new_capacity < self._size:
+            return
+
+        self._finish_rehash()
+
+        # Check if input capacity is a prime number and adjust capacity
+        if self._is_prime(new_capacity) is False:
+            new_capacity = self._next_prime(new_capacity)
+
+        # Two buckets leave double hashing no step but 1, so every key would probe the same way
+        if new_capacity == 2 and self._probing == 'double':
+            new_capacity = 3
+
+        # Keep doubling while the load factor would reach 0.5, as re-inserting with put would
+        while self._size > 0 and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._next_prime(new_capacity * 2)
+        self._capacity = new_capacity
+
+        # Initialize copy of previous bucket and set buckets data member to new instance of DynamicArray
+        old_bucket = self._buckets
+        self._buckets = DynamicArray([None] * self._capacity)
+
+        # Tombstones are not carried over
+        self._tombstones = 0
+
+        # Move valid hash entry objects using their cached hashes; keys are unique
+        # so no hashing, duplicate check or new hash entry object is needed
+        for i in range(old_bucket.length()):
+            hash_entry_object = old_bucket[i]
+
+            if hash_entry_object is not None and hash_entry_object.is_tombstone is False:
+                self._insert_entry(hash_entry_object)
+
+        self._rebuild_bloom()
+
+    def compact(self) -> None:
+        """
+        Rebuilds hash table at its current capacity, dropping all tombstones
+        """
+        self.resize_table(self._capacity)
+
+    def shrink_to_fit(self) -> None:
+        """
+        Rebuilds hash table at the smallest prime capacity that keeps the load factor below 0.5,
+        dropping all tombstones
+        """
+        self.resize_table(2 * self._size + 1)
+
+    def _shrink_if_sparse(self) -> None:
+        """
+        Shrinks table to the prime capacity at twice shrink_threshold, but not below the
+        initial capacity, once the load factor has fallen below shrink_threshold
+        """
+        if self._capacity <= self._min_capacity or self._size >= self._shrink_threshold * self._capacity:
+            return
+
+        target = int(self._size / (2 * self._shrink_threshold)) + 1
+        new_capacity = self._next_prime(max(self._min_capacity, target))
+        if new_capacity < self._capacity:
+            if self._incremental_resize is True:
+                self._start_rehash(new_capacity)
+            else:
+                self.resize_table(new_capacity)
+
+    def _probe_start(self, hash_value: int, key: str, capacity: int) -> (int, int, int):
+        """
+        Returns first bucket index, step and step increment of the key's probe sequence
+        in a bucket array of given capacity; each probe moves the index by step
+        and then grows step by the increment
+
+        Input: Hash (int), Key (string), Capacity (int)
+        Output: Tuple (int, int, int)
+        """
+        index = hash_value % capacity
+
+        if self._probing == 'linear':
+            return index, 1, 0
+
+        # Offsets 0, 1, 4, 9, ... are reached by adding 1, 3, 5, ... without exponentiation
+        if self._probing == 'quadratic':
+            return index, 1, 2
+
+        # Step is never 0 and capacity is prime, so every bucket is visited. Without a second
+        # function the step comes from the high bits of the hash times 2^64 / golden ratio,
+        # which every bit of the hash changes, unlike the index
+        if self._second_function is None:
+            return index, 1 + ((hash_value * 0x9E3779B97F4A7C15 & MASK_64) >> 32) % (capacity - 1), 0
+        return index, 1 + self._second_function(key) % (capacity - 1), 0
+
+    def probe_length_stats(self) -> (float, int):
+        """
+        Returns average and maximum number of extra probes needed to reach the entries in hash map
+
+        Output: Tuple (float, int)
+        """
+        self._finish_rehash()
+        total, longest = 0, 0
+
+        for i in range(self._buckets.length()):
+            element = self._buckets[i]
+            if element is None or element.is_tombstone is True:
+                continue
+
+            probes = 0
+            index, step, increment = self._probe_start(element.hash, element.key, self._capacity)
+            while index != i:
+                index = (index + step) % self._capacity
+                step += increment
+                probes += 1
+            total += probes
+            longest = max(longest, probes)
+
+        return (total / self._size if self._size else 0.0), longest
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Starts an incremental resize: keeps current buckets as the old bucket array
+        and allocates an empty bucket array of the new capacity
+
+        Input: New capacity (int)
+        """
+        self._finish_rehash()
+
+        self._old_buckets = self._buckets
+        self._rehash_index = 0
+        self._capacity = self._next_prime(new_capacity)
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._tombstones = 0
+        self._rebuild_bloom()
+
+    def _rehash(self, steps: int) -> None:
+        """
+        Migrates up to given number of old buckets into the new bucket array
+
+        Input: Number of old buckets (int)
+        """
+        old_bucket = self._old_buckets._data
+        end = min(self._rehash_index + steps, len(old_bucket))
+
+        # Move valid hash entry objects; keys are unique so no duplicate check is needed
+        for i in range(self._rehash_index, end):
+            element = old_bucket[i]
+            if element is not None and element.is_tombstone is False:
+                self._insert_entry(element)
+
+        self._rehash_index = end
+        if end == len(old_bucket):
+            self._old_buckets = None
+            self._rehash_index = 0
+
+    def _rehash_pace(self) -> int:
+        """
+        Returns number of old buckets a put should migrate so the incremental resize
+        finishes before the load factor or tombstone occupancy can start the next one
+
+        Output: Number of old buckets (int)
+        """
+        remaining = self._old_buckets.length() - self._rehash_index
+
+        # Puts left until the put that checks the load factor or compaction threshold, that one included
+        puts_left = min(math.ceil(0.5 * self._capacity) - self._size,
+                        math.ceil(self._compact_threshold * self._capacity) - self._size - self._tombstones) + 1
+        return max(self._rehash_step, math.ceil(remaining / max(puts_left, 1)))
+
+    def _finish_rehash(self) -> None:
+        """
+        Migrates all remaining old buckets if an incremental resize is running
+        """
+        if self._old_buckets is not None:
+            self._rehash(self._old_buckets.length())
+
+    def _rebuild_bloom(self) -> None:
+        """
+        Refills the Bloom filter, if there is one, from the keys in both bucket arrays
+        sized for the current capacity, dropping the bits of removed keys
+        """
+        if self._bloom is None:
+            return
+
+        self._bloom.reset(self._capacity)
+        self._bloom_removals = 0
+        buckets = [(self._buckets, 0)]
+        if self._old_buckets is not None:
+            buckets.append((self._old_buckets, self._rehash_index))
+
+        # Old buckets below the rehash index were already migrated into the new bucket array
+        for bucket_array, start in buckets:
+            for i in range(start, bucket_array.length()):
+                element = bucket_array[i]
+                if element is not None and element.is_tombstone is False:
+                    self._bloom.add(element.key)
+
+    def _removed_from_bloom(self, count: int) -> None:
+        """
+        Counts keys removed since the Bloom filter was built and rebuilds it
+        once they outnumber the keys left in the map
+
+        Input: Number of removed keys (int)
+        """
+        if self._bloom is not None and count:
+            self._bloom_removals += count
+            if self._bloom_removals > self._size:
+                self._rebuild_bloom()
+
+    def bloom_filter_stats(self) -> (int, float, float):
+        """
+        Returns memory of the Bloom filter in bytes, its estimated false positive rate and
+        the share of lookups of missing keys it let through, None without a Bloom filter
+
+        Output: Tuple (int, float, float)
+        """
+        if self._bloom is None:
+            return None
+        return self._bloom.stats()
+
+    def _insert_entry(self, entry: HashEntry) -> None:
+        """
+        Places hash entry object in first empty bucket or tombstone of its probe sequence
+        without checking for a matching key
+
+        Input: Entry (HashEntry)
+        """
+        capacity = self._capacity
+        index, step, increment = self._probe_start(entry.hash, entry.key, capacity)
+
+        # Read the underlying list once instead of paying a bounds check per probe
+        buckets = self._buckets._data
+        for _ in range(capacity):
+            element = buckets[index]
+            if element is None or element.is_tombstone is True:
+                if element is not None:
+                    self._tombstones -= 1
+                buckets[index] = entry
+                return
+
+            index = (index + step) % capacity
+            step += increment
+
+    def _find_index(self, key: str, hash_value: int) -> int:
+        """
+        Returns bucket index of the valid hash entry with given key and hash, None otherwise
+
+        Input: Key (string), Hash (int)
+        Output: Index (int)
+        """
+        index, step, increment = self._probe_start(hash_value, key, self._capacity)
+
+        # Follow the same probe sequence as put, stepping past tombstones
+        for _ in range(self._capacity):
+            element = self._buckets[index]
+
+            # Empty bucket ends the probe sequence, key does not exist
+            if element is None:
+                return None
+
+            if element.is_tombstone is False and element.hash == hash_value and element.key == key:
+                return index
+
+            index = (index + step) % self._capacity
+            step += increment
+
+        return None
+
+    def _probe_old_buckets(self, key: str, hash_value: int) -> HashEntry:
+        """
+        Returns valid hash entry with given key and hash that has not been migrated out of
+        the old bucket array yet, None otherwise
+
+        Input: Key (string), Hash (int)
+        Output: Entry (HashEntry)
+        """
+        old_bucket = self._old_buckets
+        old_capacity = old_bucket.length()
+        index, step, increment = self._probe_start(hash_value, key, old_capacity)
+
+        for _ in range(old_capacity):
+            element = old_bucket[index]
+
+            if element is None:
+                return None
+
+            # Buckets below the rehash index were already migrated and act as tombstones
+            if (index >= self._rehash_index and element.is_tombstone is False
+                    and element.hash == hash_value and element.key == key):
+                return element
+
+            index = (index + step) % old_capacity
+            step += increment
+
+        return None
+
+    def _find_entry(self, key: str) -> HashEntry:
+        """
+        Returns valid hash entry with given key, None otherwise
+        Consults both bucket arrays while an incremental resize is running
+
+        Input: Key (string)
+        Output: Entry (HashEntry)
+        """
+        if self._old_buckets is not None:
+            self._rehash(self._rehash_step)
+
+        # Most missing keys are ruled out before the hash function runs
+        if self._bloom is not None and not self._bloom.might_contain(key):
+            return None
+
+        hash_value = self._hash_function(key)
+        index = self._find_index(key, hash_value)
+        if index is not None:
+            return self._buckets[index]
+
+        element = None
+        if self._old_buckets is not None:
+            element = self._probe_old_buckets(key, hash_value)
+
+        if element is None and self._bloom is not None:
+            self._bloom.false_positives += 1
+
+        return element
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (string)
+        """
+        element = self._find_entry(key)
+
+        if element is not None:
+            return element.value
+
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns true if given key is in hash map, False otherwise
+
+        Input: Key (string)
+        Output: Boolean
+        """
+        return self._find_entry(key) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value if it exists within hash map
+
+        Input: Key (string)
+        """
+        # Tombstones left by removes bring the compaction threshold closer, so removes keep pace too
+        if self._old_buckets is not None:
+            self._rehash(self._rehash_pace())
+
+        if self._bloom is not None and not self._bloom.might_contain(key):
+            return
+
+        hash_value = self._hash_function(key)
+        index = self._find_index(key, hash_value)
+        element = None
+
+        # Set hash entry object's tombstone to True, count it and decrement size
+        if index is not None:
+            element = self._buckets[index]
+            element.is_tombstone = True
+            self._tombstones += 1
+            self._size -= 1
+
+        # Key that has not been migrated yet is removed from the old bucket array
+        elif self._old_buckets is not None:
+            element = self._probe_old_buckets(key, hash_value)
+            if element is not None:
+                element.is_tombstone = True
+                self._size -= 1
+
+        if element is not None:
+            self._removed_from_bloom(1)
+            if self._shrink_threshold is not None:
+                self._shrink_if_sparse()
+        elif self._bloom is not None:
+            self._bloom.false_positives += 1
+
+    def _find_entries(self, keys: list) -> list:
+        """
+        Returns list with the valid hash entry of each key in keys, None for missing keys
+        Keys are hashed in one pass, then probed one after another
+
+        Input: Keys (list)
+        Output: Entries (list)
+        """
+        if self._old_buckets is not None:
+            self._rehash(self._rehash_step)
+
+        hashes = hash_many(self._hash_function, keys)
+        capacity, probe_start = self._capacity, self._probe_start
+        entries = [None] * len(keys)
+
+        # Read the underlying list once instead of paying a bounds check per probe
+        buckets = self._buckets._data
+
+        for i in range(len(keys)):
+            key, hash_value = keys[i], hashes[i]
+            index, step, increment = probe_start(hash_value, key, capacity)
+
+            for _ in range(capacity):
+                element = buckets[index]
+                if element is None:
+                    break
+
+                if element.is_tombstone is False and element.hash == hash_value and element.key == key:
+                    entries[i] = element
+                    break
+
+                index = (index + step) % capacity
+                step += increment
+
+            if entries[i] is None and self._old_buckets is not None:
+                entries[i] = self._probe_old_buckets(key, hash_value)
+
+        return entries
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with the value associated with each key, None for missing keys,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        entries = self._find_entries(as_list(keys))
+        return DynamicArray([None if entry is None else entry.value for entry in entries])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with True for each key in hash map and False otherwise,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        entries = self._find_entries(as_list(keys))
+        return DynamicArray([entry is not None for entry in entries])
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every key in keys and its associated value if it exists within hash map
+        A running incremental resize is finished first so every tombstone is in the current table
+
+        Input: Keys (list or DynamicArray)
+        """
+        self._finish_rehash()
+
+        # Repeated keys find the same entry, which is only counted once
+        removed = 0
+        for entry in self._find_entries(as_list(keys)):
+            if entry is not None and entry.is_tombstone is False:
+                entry.is_tombstone = True
+                removed += 1
+
+        self._tombstones += removed
+        self._size -= removed
+        self._removed_from_bloom(removed)
+        if self._shrink_threshold is not None:
+            self._shrink_if_sparse()
+
+    def clear(self) -> None:
+        """
+        Clears contents of hash map without changing table capacity
+        """
+        # Drop old bucket array of a running incremental resize
+        self._old_buckets = None
+        self._rehash_index = 0
+
+        # Set all bucket elements to None and reset size
+        for i in range(self._buckets.length()):
+            self._buckets[i] = None
+
+        self._size = 0
+        self._tombstones = 0
+        self._rebuild_bloom()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+         Returns dynamic array where each index contains a tuple of key/value pair in hash map
+
+         Output: Array (DynamicArray)
+         """
+        self._finish_rehash()
+        output_array = DynamicArray()
+
+        # Append tuple to output array if element is not None and valid
+        for i in range(self._buckets.length()):
+            element = self._buckets[i]
+
+            if element is not None and element.is_tombstone is False:
+                hash_key = element.key
+                hash_value = element.value
+                output_array.append((hash_key, hash_value))
+
+        return output_array
+
+    def __iter__(self):
+        """
+        Iterator implementation for hash map
+        """
+        self._finish_rehash()
+        self._index = 0
+        return self
+
+    def __next__(self):
+        """
+        Returns next valid item in hash map based on iterator's current location
+        """
+        try:
+            # Iterate through bucket and increment index if element is a tombstone or None
+            condition = True
+
+            while condition is True:
+                value = self._buckets[self._index]
+                if value is None or value.is_tombstone is True:
+                    self._index += 1
+                elif value.is_tombstone is False:
+                    condition = False
+        except:
+            raise StopIteration
+
+        self._index += 1
+        return value
+
+
+class RobinHoodHashMap(HashMap):
+    """
+    Open addressing HashMap that uses Robin Hood linear probing: entries far from their
+    home bucket displace entries closer to theirs, removal shifts the following entries
+    back instead of leaving tombstones and lookups stop as soon as they are farther from
+    home than the entry in the bucket they are looking at
+    """
+
+    def __init__(self, capacity: int, function, max_load_factor: float = 0.9) -> None:
+        """
+        Initialize new RobinHoodHashMap
+
+        max_load_factor must be below 1, a full table leaves no empty bucket to end a probe
+        """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("max_load_factor must be between 0 and 1")
+
+        self._buckets = DynamicArray()
+
+        # Probe distance from home bucket of the entry in each bucket, -1 for empty buckets
+        self._distances = DynamicArray()
+
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        for _ in range(self._capacity):
+            self._buckets.append(None)
+            self._distances.append(-1)
+
+        self._hash_function = function
+        self._size = 0
+        self._max_load_factor = max_load_factor
+
+        # Backward shift deletion never leaves tombstones
+        self._tombstones = 0
+
+    def _find_index(self, key: str) -> int:
+        """
+        Returns bucket index of the entry with given key, None otherwise
+
+        Input: Key (string)
+        Output: Index (int)
+        """
+        hash_value = self._hash_function(key)
+        index = hash_value % self._capacity
+        distance = 0
+
+        # An entry closer to its home bucket than we are to ours means the key is absent
+        while distance <= self._distances[index]:
+            element = self._buckets[index]
+            if element.hash == hash_value and element.key == key:
+                return index
+
+            index = (index + 1) % self._capacity
+            distance += 1
+
+        return None
+
+    def _place_entry(self, entry: HashEntry, distance: int, index: int) -> None:
+        """
+        Places hash entry object starting at given bucket and probe distance,
+        swapping it with every entry that is closer to its home bucket
+
+        Input: Entry (HashEntry), Distance (int), Index (int)
+        """
+        while self._distances[index] != -1:
+            if self._distances[index] < distance:
+                displaced_entry, displaced_distance = self._buckets[index], self._distances[index]
+                self._buckets[index], self._distances[index] = entry, distance
+                entry, distance = displaced_entry, displaced_distance
+
+            index = (index + 1) % self._capacity
+            distance += 1
+
+        self._buckets[index] = entry
+        self._distances[index] = distance
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+
+        Input: Key (string), Value (object)
+        """
+        if (self._size + 1) / self._capacity > self._max_load_factor:
+            self.resize_table(self._capacity * 2)
+
+        self._put(key, value)
+
+    def _reserve(self, count: int) -> None:
+        """
+        Makes room for given number of new keys with a single resize
+
+        Input: Number of keys (int)
+        """
+        needed = self._size + count
+        if needed / self._capacity > self._max_load_factor:
+            self.resize_table(int(needed / self._max_load_factor) + 1)
+
+    def _put(self, key: str, value: object) -> None:
+        """
+        Updates or adds key/value pair without checking load factor
+
+        Input: Key (string), Value (object)
+        """
+        hash_value = self._hash_function(key)
+        index = hash_value % self._capacity
+        distance = 0
+
+        # Look for matching key along the part of the probe sequence it could be in
+        while distance <= self._distances[index]:
+            element = self._buckets[index]
+            if element.hash == hash_value and element.key == key:
+                element.value = value
+                return
+
+            index = (index + 1) % self._capacity
+            distance += 1
+
+        # Key is absent, insert from the first bucket whose entry is closer to its home
+        self._place_entry(HashEntry(key, value, hash_value), distance, index)
+        self._size += 1
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets in hash table
+
+        Output: Number of empty buckets (int)
+        """
+        return self._capacity - self._size
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes hash map table based on new capacity input
+
+        Input: New capacity (int)
+        """
+        if new_capacity < self._size:
+            return
+
+        if self._is_prime(new_capacity) is False:
+            new_capacity = self._next_prime(new_capacity)
+
+        old_bucket = self._buckets
+        self._capacity = new_capacity
+        self._buckets = DynamicArray([None] * new_capacity)
+        self._distances = DynamicArray([-1] * new_capacity)
+
+        for i in range(old_bucket.length()):
+            element = old_bucket[i]
+            if element is not None:
+                self._place_entry(element, 0, element.hash % self._capacity)
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (string)
+        """
+        index = self._find_index(key)
+
+        if index is not None:
+            return self._buckets[index].value
+
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns true if given key is in hash map, False otherwise
+
+        Input: Key (string)
+        Output: Boolean
+        """
+        return self._find_index(key) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value if it exists within hash map
+        Following entries are shifted back one bucket until an empty bucket or
+        an entry already in its home bucket is reached
+
+        Input: Key (string)
+        """
+        index = self._find_index(key)
+        if index is None:
+            return
+
+        next_index = (index + 1) % self._capacity
+        while self._distances[next_index] > 0:
+            self._buckets[index] = self._buckets[next_index]
+            self._distances[index] = self._distances[next_index] - 1
+            index, next_index = next_index, (next_index + 1) % self._capacity
+
+        self._buckets[index] = None
+        self._distances[index] = -1
+        self._size -= 1
+
+    def _find_entries(self, keys: list) -> list:
+        """
+        Returns list with the entry of each key in keys, None for missing keys
+        Keys are hashed in one pass, then probed one after another
+
+        Input: Keys (list)
+        Output: Entries (list)
+        """
+        hashes = hash_many(self._hash_function, keys)
+        capacity = self._capacity
+        buckets, distances = self._buckets._data, self._distances._data
+        entries = [None] * len(keys)
+
+        for i in range(len(keys)):
+            key, hash_value = keys[i], hashes[i]
+            index = hash_value % capacity
+            distance = 0
+
+            while distance <= distances[index]:
+                element = buckets[index]
+                if element.hash == hash_value and element.key == key:
+                    entries[i] = element
+                    break
+
+                index = (index + 1) % capacity
+                distance += 1
+
+        return entries
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every key in keys and its associated value if it exists within hash map
+        Keys are removed one at a time since every removal shifts the entries after it
+
+        Input: Keys (list or DynamicArray)
+        """
+        for key in as_list(keys):
+            self.remove(key)
+
+    def clear(self) -> None:
+        """
+        Clears contents of hash map without changing table capacity
+        """
+        self._buckets = DynamicArray([None] * self._capacity)
+        self._distances = DynamicArray([-1] * self._capacity)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map
+
+        Output: Array (DynamicArray)
+        """
+        output_array = DynamicArray()
+
+        for i in range(self._buckets.length()):
+            element = self._buckets[i]
+            if element is not None:
+                output_array.append((element.key, element.value))
+
+        return output_array
+
+    def probe_length_stats(self) -> (float, int):
+        """
+        Returns average and maximum probe distance of the entries in hash map
+
+        Output: Tuple (float, int)
+        """
+        total, longest = 0, 0
+        for i in range(self._capacity):
+            distance = self._distances[i]
+            if distance > 0:
+                total += distance
+                longest = max(longest, distance)
+
+        return (total / self._size if self._size else 0.0), longest
+
+    def __iter__(self):
+        """
+        Iterator implementation for hash map
+        """
+        self._index = 0
+        return self
+
+    def __next__(self):
+        """
+        Returns next item in hash map based on iterator's current location
+        """
+        while self._index < self._capacity:
+            element = self._buckets[self._index]
+            self._index += 1
+            if element is not None:
+                return element
+
+        raise StopIteration
+
+
+# Bucket states used by PackedHashMap
+EMPTY, LIVE, TOMBSTONE = 0, 1, 2
+
+# Cached hashes are stored as unsigned 64-bit integers
+HASH_MASK = (1 << 64) - 1
+
+
+class PackedHashMap(HashMap):
+    """
+    Open addressing HashMap with the same public interface as HashMap that stores
+    keys, values, cached hashes and bucket states in parallel arrays instead of
+    one HashEntry object per bucket
+    """
+
+    def __init__(self, capacity: int, function) -> None:
+        """
+        Initialize new PackedHashMap that uses
+        quadratic probing for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._hash_function = function
+        self._size = 0
+        self._allocate(self._capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Sets every parallel array to a new empty array of given capacity
+
+        Input: Capacity (int)
+        """
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+        self._hashes = array('Q', bytes(8 * capacity))
+        self._states = bytearray(capacity)
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            if self._states[i] == EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                is_tombstone = self._states[i] == TOMBSTONE
+                out += f"{i}: K: {self._keys[i]} V: {self._values[i]} TS: {is_tombstone}\n"
+        return out
+
+    def _find_index(self, key: str, hash_value: int) -> int:
+        """
+        Returns bucket index of the live key, None otherwise
+
+        Input: Key (string), Hash (int)
+        Output: Index (int)
+        """
+        states, hashes, keys, capacity = self._states, self._hashes, self._keys, self._capacity
+        index, step = hash_value % capacity, 1
+
+        # Compare cached hashes before keys and stop at the first empty bucket
+        for _ in range(capacity):
+            state = states[index]
+
+            if state == EMPTY:
+                return None
+
+            if state == LIVE and hashes[index] == hash_value and keys[index] == key:
+                return index
+
+            index = (index + step) % capacity
+            step += 2
+
+        return None
+
+    def _insert(self, hash_value: int, key: str, value: object) -> None:
+        """
+        Places key/value pair in first empty or tombstone bucket of its probe sequence
+        without checking for a matching key
+
+        Input: Hash (int), Key (string), Value (object)
+        """
+        states, capacity = self._states, self._capacity
+        index, step = hash_value % capacity, 1
+
+        # Quadratic probing reaches only about half the buckets, so stop after capacity probes
+        for _ in range(capacity):
+            if states[index] != LIVE:
+                states[index] = LIVE
+                self._hashes[index] = hash_value
+                self._keys[index] = key
+                self._values[index] = value
+                return
+
+            index = (index + step) % capacity
+            step += 2
+
+        # No free bucket on the probe sequence, grow the table and place the pair there
+        self.resize_table(self._capacity * 2)
+        self._insert(hash_value, key, value)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+
+        Input: Key (string), Value (object)
+        """
+        if self.table_load() >= 0.5:
+            self.resize_table(self._capacity * 2)
+
+        self._put(key, value)
+
+    def _reserve(self, count: int) -> None:
+        """
+        Makes room for given number of new keys with a single resize
+
+        Input: Number of keys (int)
+        """
+        needed = self._size + count
+        if (needed - 1) / self._capacity >= 0.5:
+            self.resize_table(2 * needed + 1)
+
+    def _put(self, key: str, value: object) -> None:
+        """
+        Updates or adds key/value pair without checking load factor
+
+        Input: Key (string), Value (object)
+        """
+        hash_value = self._hash_function(key) & HASH_MASK
+        index = self._find_index(key, hash_value)
+
+        if index is not None:
+            self._values[index] = value
+        else:
+            self._insert(hash_value, key, value)
+            self._size += 1
+
+    def get_tombstone_count(self) -> int:
+        """
+        Return number of tombstones in the bucket states
+        """
+        return self._states.count(TOMBSTONE)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets in hash table, tombstones are not counted as empty
+
+        Output: Number of empty buckets (int)
+        """
+        return self._states.count(EMPTY)
+
+    def probe_length_stats(self) -> (float, int):
+        """
+        Returns average and maximum number of extra probes needed to reach the keys in hash map
+
+        Output: Tuple (float, int)
+        """
+        states, hashes, capacity = self._states, self._hashes, self._capacity
+        total, longest = 0, 0
+
+        index = states.find(LIVE)
+        while index != -1:
+            probes = 0
+            probe, step = hashes[index] % capacity, 1
+            while probe != index:
+                probe = (probe + step) % capacity
+                step += 2
+                probes += 1
+            total += probes
+            longest = max(longest, probes)
+            index = states.find(LIVE, index + 1)
+
+        return (total / self._size if self._size else 0.0), longest
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes hash map table based on new capacity input
+        Keys are placed using their cached hashes, the hash function is not called again
+
+        Input: New capacity (int)
+        """
+        if new_capacity < self._size:
+            return
+
+        if self._is_prime(new_capacity) is False:
+            new_capacity = self._next_prime(new_capacity)
+
+        # Keep doubling while the load factor would reach 0.5, as in HashMap.resize_table
+        while self._size > 0 and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._next_prime(new_capacity * 2)
+
+        old_keys, old_values, old_hashes, old_states = self._keys, self._values, self._hashes, self._states
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+
+        # Carry over live buckets only
+        index = old_states.find(LIVE)
+        while index != -1:
+            self._insert(old_hashes[index], old_keys[index], old_values[index])
+            index = old_states.find(LIVE, index + 1)
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (string)
+        """
+        index = self._find_index(key, self._hash_function(key) & HASH_MASK)
+
+        if index is not None:
+            return self._values[index]
+
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns true if given key is in hash map, False otherwise
+
+        Input: Key (string)
+        Output: Boolean
+        """
+        return self._find_index(key, self._hash_function(key) & HASH_MASK) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value if it exists within hash map
+
+        Input: Key (string)
+        """
+        index = self._find_index(key, self._hash_function(key) & HASH_MASK)
+
+        # Mark bucket as tombstone and release key/value references
+        if index is not None:
+            self._states[index] = TOMBSTONE
+            self._keys[index] = None
+            self._values[index] = None
+            self._size -= 1
+
+    def _find_indexes(self, keys: list) -> list:
+        """
+        Returns list with the bucket index of each live key in keys, None for missing keys
+        Keys are hashed in one pass, then probed one after another
+
+        Input: Keys (list)
+        Output: Indexes (list)
+        """
+        hashes = [hash_value & HASH_MASK for hash_value in hash_many(self._hash_function, keys)]
+        capacity, states, cached_hashes, stored_keys = self._capacity, self._states, self._hashes, self._keys
+        indexes = [None] * len(keys)
+
+        for i in range(len(keys)):
+            key, hash_value = keys[i], hashes[i]
+            index, step = hash_value % capacity, 1
+
+            for _ in range(capacity):
+                state = states[index]
+
+                if state == EMPTY:
+                    break
+
+                if state == LIVE and cached_hashes[index] == hash_value and stored_keys[index] == key:
+                    indexes[i] = index
+                    break
+
+                index = (index + step) % capacity
+                step += 2
+
+        return indexes
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with the value associated with each key, None for missing keys,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        values = self._values
+        return DynamicArray([None if index is None else values[index]
+                             for index in self._find_indexes(as_list(keys))])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with True for each key in hash map and False otherwise,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        return DynamicArray([index is not None for index in self._find_indexes(as_list(keys))])
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every key in keys and its associated value if it exists within hash map
+
+        Input: Keys (list or DynamicArray)
+        """
+        # Repeated keys find a bucket that is already a tombstone
+        for index in self._find_indexes(as_list(keys)):
+            if index is not None and self._states[index] == LIVE:
+                self._states[index] = TOMBSTONE
+                self._keys[index] = None
+                self._values[index] = None
+                self._size -= 1
+
+    def clear(self) -> None:
+        """
+        Clears contents of hash map without changing table capacity
+        """
+        self._allocate(self._capacity)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map
+
+        Output: Array (DynamicArray)
+        """
+        output_array = DynamicArray()
+
+        index = self._states.find(LIVE)
+        while index != -1:
+            output_array.append((self._keys[index], self._values[index]))
+            index = self._states.find(LIVE, index + 1)
+
+        return output_array
+
+    def __iter__(self):
+        """
+        Iterator implementation for hash map
+        """
+        self._index = 0
+        return self
+
+    def __next__(self):
+        """
+        Returns next valid item in hash map as a HashEntry based on iterator's current location
+        """
+        index = self._states.find(LIVE, self._index)
+        if index == -1:
+            raise StopIteration
+
+        self._index = index + 1
+        return HashEntry(self._keys[index], self._values[index])
+
+
+# Control bytes used by SwissHashMap, full buckets hold the low 7 bits of the hash
+CTRL_EMPTY, CTRL_DELETED = 0x80, 0xFE
+EMPTY_GROUP_BYTE = bytes([CTRL_EMPTY])
+GROUP_WIDTH = 16
+
+
+class SwissHashMap(HashMap):
+    """
+    Open addressing HashMap modeled on Swiss tables: a NumPy uint8 control array holds
+    7 bits of every key's hash, and probing compares a whole group of 16 control bytes
+    against the key's hash tag at once so only likely matches are compared by key
+    Capacity is a power of two number of groups instead of a prime number
+    """
+
+    def __init__(self, capacity: int, function, max_load_factor: float = 0.875) -> None:
+        """
+        Initialize new SwissHashMap, requires NumPy
+
+        max_load_factor must be below 1, a full table leaves no empty group to end a probe
+        """
+        if np is None:
+            raise ImportError("SwissHashMap requires NumPy")
+
+        if not 0 < max_load_factor < 1:
+            raise ValueError("max_load_factor must be between 0 and 1")
+
+        self._hash_function = function
+        self._max_load_factor = max_load_factor
+        self._size = 0
+        self._allocate(self._group_count(capacity))
+
+    @staticmethod
+    def _group_count(capacity: int) -> int:
+        """
+        Returns smallest power of two number of groups holding given capacity
+
+        Input: Capacity (int)
+        Output: Number of groups (int)
+        """
+        groups = 1
+        while groups * GROUP_WIDTH < capacity:
+            groups *= 2
+        return groups
+
+    def _allocate(self, groups: int) -> None:
+        """
+        Sets control bytes, keys, values and cached hashes to empty arrays of given number of groups
+
+        Input: Number of groups (int)
+        """
+        self._group_mask = groups - 1
+        self._capacity = groups * GROUP_WIDTH
+        self._ctrl = np.full(self._capacity, CTRL_EMPTY, dtype=np.uint8)
+        self._keys = [None] * self._capacity
+        self._values = [None] * self._capacity
+        self._hashes = array('Q', bytes(8 * self._capacity))
+        self._tombstones = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            ctrl = self._ctrl[i]
+            if ctrl == CTRL_EMPTY:
+                out += str(i) + ': None\n'
+            else:
+                out += f"{i}: K: {self._keys[i]} V: {self._values[i]} TS: {ctrl == CTRL_DELETED}\n"
+        return out
+
+    def _find_index(self, key: str, hash_value: int) -> int:
+        """
+        Returns bucket index of the key, None otherwise
+
+        Input: Key (string), Hash (int)
+        Output: Index (int)
+        """
+        tag = hash_value & 0x7F
+        group = (hash_value >> 7) & self._group_mask
+        step = 0
+
+        while True:
+            start = group * GROUP_WIDTH
+            ctrl = self._ctrl[start:start + GROUP_WIDTH]
+
+            # Only buckets whose control byte matches the hash tag are compared by key
+            for offset in (ctrl == tag).nonzero()[0].tolist():
+                if self._keys[start + offset] == key:
+                    return start + offset
+
+            # An empty bucket in the group ends the probe sequence
+            if EMPTY_GROUP_BYTE in ctrl.tobytes():
+                return None
+
+            # Triangular probing over a power of two number of groups visits every group
+            step += 1
+            group = (group + step) & self._group_mask
+
+    def _insert(self, hash_value: int, key: str, value: object) -> None:
+        """
+        Places key/value pair in first empty or deleted bucket of its probe sequence
+        without checking for a matching key
+
+        Input: Hash (int), Key (string), Value (object)
+        """
+        group = (hash_value >> 7) & self._group_mask
+        step = 0
+
+        while True:
+            start = group * GROUP_WIDTH
+            free = (self._ctrl[start:start + GROUP_WIDTH] & 0x80).nonzero()[0]
+            if free.size > 0:
+                break
+            step += 1
+            group = (group + step) & self._group_mask
+
+        index = start + int(free[0])
+        if self._ctrl[index] == CTRL_DELETED:
+            self._tombstones -= 1
+
+        self._ctrl[index] = hash_value & 0x7F
+        self._hashes[index] = hash_value
+        self._keys[index] = key
+        self._values[index] = value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+
+        Input: Key (string), Value (object)
+        """
+        self._put(key, value, check_load=True)
+
+    def _reserve(self, count: int) -> None:
+        """
+        Makes room for given number of new keys with a single resize
+
+        Input: Number of keys (int)
+        """
+        needed = self._size + count
+        if (needed + self._tombstones) / self._capacity > self._max_load_factor:
+            self.resize_table(int(needed / self._max_load_factor) + 1)
+
+    def _put(self, key: str, value: object, check_load: bool = False) -> None:
+        """
+        Updates or adds key/value pair, checking the load factor only when asked to
+
+        Input: Key (string), Value (object), Check load (bool)
+        """
+        hash_value = self._hash_function(key) & HASH_MASK
+        index = self._find_index(key, hash_value)
+
+        if index is not None:
+            self._values[index] = value
+            return
+
+        # Deleted buckets also end no probe sequence, so they count towards the load limit
+        if check_load and (self._size + self._tombstones + 1) / self._capacity > self._max_load_factor:
+            if (self._size + 1) / self._capacity > self._max_load_factor / 2:
+                self.resize_table(self._capacity * 2)
+            else:
+                self.resize_table(self._capacity)
+
+        self._insert(hash_value, key, value)
+        self._size += 1
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets in hash table, deleted buckets are not counted as empty
+
+        Output: Number of empty buckets (int)
+        """
+        return int(np.count_nonzero(self._ctrl == CTRL_EMPTY))
+
+    def probe_length_stats(self) -> (float, int):
+        """
+        Returns average and maximum number of extra groups probed to reach the keys in hash map
+
+        Output: Tuple (float, int)
+        """
+        total, longest = 0, 0
+
+        for index in np.flatnonzero(self._ctrl < 0x80).tolist():
+            probes, step = 0, 0
+            group = (self._hashes[index] >> 7) & self._group_mask
+            while group != index // GROUP_WIDTH:
+                step += 1
+                group = (group + step) & self._group_mask
+                probes += 1
+            total += probes
+            longest = max(longest, probes)
+
+        return (total / self._size if self._size else 0.0), longest
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes hash map table to the smallest power of two number of groups holding new capacity
+        Keys are placed using their cached hashes, the hash function is not called again
+
+        Input: New capacity (int)
+        """
+        if new_capacity < self._size:
+            return
+
+        groups = self._group_count(new_capacity)
+        while self._size > groups * GROUP_WIDTH * self._max_load_factor:
+            groups *= 2
+
+        old_keys, old_values, old_hashes, old_ctrl = self._keys, self._values, self._hashes, self._ctrl
+        self._allocate(groups)
+
+        for index in np.flatnonzero(old_ctrl < 0x80).tolist():
+            self._insert(old_hashes[index], old_keys[index], old_values[index])
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (string)
+        """
+        index = self._find_index(key, self._hash_function(key) & HASH_MASK)
+
+        if index is not None:
+            return self._values[index]
+
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns true if given key is in hash map, False otherwise
+
+        Input: Key (string)
+        Output: Boolean
+        """
+        return self._find_index(key, self._hash_function(key) & HASH_MASK) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value if it exists within hash map
+
+        Input: Key (string)
+        """
+        index = self._find_index(key, self._hash_function(key) & HASH_MASK)
+        if index is not None:
+            self._remove_index(index)
+
+    def _remove_index(self, index: int) -> None:
+        """
+        Removes key/value pair stored in given bucket
+
+        Input: Index (int)
+        """
+        # A group that still has an empty bucket was never full, so no probe sequence
+        # continues past it and the bucket can be marked empty instead of deleted
+        start = index - index % GROUP_WIDTH
+        if EMPTY_GROUP_BYTE in self._ctrl[start:start + GROUP_WIDTH].tobytes():
+            self._ctrl[index] = CTRL_EMPTY
+        else:
+            self._ctrl[index] = CTRL_DELETED
+            self._tombstones += 1
+
+        self._keys[index] = None
+        self._values[index] = None
+        self._size -= 1
+
+    def _find_indexes(self, keys: list) -> list:
+        """
+        Returns list with the bucket index of each key in keys, None for missing keys
+        Keys are hashed in one pass, then probed one after another
+
+        Input: Keys (list)
+        Output: Indexes (list)
+        """
+        hashes = hash_many(self._hash_function, keys)
+        find_index = self._find_index
+        return [find_index(key, hash_value & HASH_MASK) for key, hash_value in zip(keys, hashes)]
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with the value associated with each key, None for missing keys,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        values = self._values
+        return DynamicArray([None if index is None else values[index]
+                             for index in self._find_indexes(as_list(keys))])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with True for each key in hash map and False otherwise,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        return DynamicArray([index is not None for index in self._find_indexes(as_list(keys))])
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every key in keys and its associated value if it exists within hash map
+
+        Input: Keys (list or DynamicArray)
+        """
+        # Repeated keys find a bucket whose key was already released
+        for index in self._find_indexes(as_list(keys)):
+            if index is not None and self._keys[index] is not None:
+                self._remove_index(index)
+
+    def clear(self) -> None:
+        """
+        Clears contents of hash map without changing table capacity
+        """
+        self._allocate(self._group_mask + 1)
+        self._size = 0
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map
+
+        Output: Array (DynamicArray)
+        """
+        output_array = DynamicArray()
+
+        for index in np.flatnonzero(self._ctrl < 0x80).tolist():
+            output_array.append((self._keys[index], self._values[index]))
+
+        return output_array
+
+    def __iter__(self):
+        """
+        Iterator implementation for hash map
+        """
+        self._index = 0
+        self._live = np.flatnonzero(self._ctrl < 0x80).tolist()
+        return self
+
+    def __next__(self):
+        """
+        Returns next item in hash map as a HashEntry based on iterator's current location
+        """
+        if self._index >= len(self._live):
+            raise StopIteration
+
+        index = self._live[self._index]
+        self._index += 1
+        return HashEntry(self._keys[index], self._values[index])
+
+
+# Index buckets of OrderedHashMap that hold no entry number
+INDEX_EMPTY, INDEX_DUMMY = -1, -2
+
+# Signed array types for the index, the smallest one whose maximum reaches the capacity is used
+INDEX_TYPECODES = (('b', (1 << 7) - 1), ('h', (1 << 15) - 1), ('i', (1 << 31) - 1), ('q', (1 << 63) - 1))
+
+
+class OrderedHashMap(HashMap):
+    """
+    Open addressing HashMap with the same public interface as HashMap laid out like the
+    CPython compact dict: a sparse index of entry numbers, probed quadratically, in front
+    of dense arrays of cached hashes, keys and values kept in insertion order
+
+    The index stores a 1, 2, 4 or 8 byte integer per bucket, whichever fits the capacity,
+    instead of a reference to a HashEntry. Iteration, get_keys_and_values and save walk
+    the dense arrays and never visit an empty bucket.
+
+    Removing a key leaves a dummy in its index bucket and a hole (key None) in the entries.
+    The entries are compacted once holes outnumber keys, so walking them costs O(size).
+    """
+
     def __init__(self, capacity: int, function) -> None:
         """
-        Initialize new HashMap that uses
-        quadratic probing for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Initialize new OrderedHashMap that uses
+        quadratic probing for collision resolution
+        """
+        # capacity must be a prime number
+        self._capacity = self._next_prime(capacity)
+        self._hash_function = function
+        self._size = 0
+        self._allocate(self._capacity)
+
+    def _allocate(self, capacity: int) -> None:
+        """
+        Sets index to a new empty index of given capacity and empties the entries
+
+        Input: Capacity (int)
+        """
+        typecode = next(code for code, maximum in INDEX_TYPECODES if capacity <= maximum)
+        self._index = array(typecode, [INDEX_EMPTY]) * capacity
+        self._hashes = array('Q')
+        self._keys = []
+        self._values = []
+        self._dummies = 0
+        self._holes = 0
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide the same output as HashMap
+        """
+        out = ''
+        for i in range(self._capacity):
+            entry = self._index[i]
+            if entry == INDEX_EMPTY:
+                out += str(i) + ': None\n'
+            elif entry == INDEX_DUMMY:
+                out += f"{i}: K: None V: None TS: True\n"
+            else:
+                out += f"{i}: K: {self._keys[entry]} V: {self._values[entry]} TS: False\n"
+        return out
+
+    def _find_bucket(self, key: str, hash_value: int) -> (int, int):
+        """
+        Returns index bucket and entry number of given key, or the bucket a new key would
+        be placed in (first dummy or empty bucket of its probe sequence) and None
+
+        Input: Key (string), Hash (int)
+        Output: Tuple (int, int)
+        """
+        index, hashes, keys, capacity = self._index, self._hashes, self._keys, self._capacity
+        bucket, step = hash_value % capacity, 1
+        free = None
+
+        for _ in range(capacity):
+            entry = index[bucket]
+
+            if entry == INDEX_EMPTY:
+                return (bucket if free is None else free), None
+
+            if entry == INDEX_DUMMY:
+                if free is None:
+                    free = bucket
+            elif hashes[entry] == hash_value and keys[entry] == key:
+                return bucket, entry
+
+            bucket = (bucket + step) % capacity
+            step += 2
+
+        return free, None
+
+    def _append(self, bucket: int, hash_value: int, key: str, value: object) -> None:
+        """
+        Adds key/value pair as the newest entry and points given index bucket at it
+
+        Input: Bucket (int), Hash (int), Key (string), Value (object)
+        """
+        if self._index[bucket] == INDEX_DUMMY:
+            self._dummies -= 1
+
+        self._index[bucket] = len(self._keys)
+        self._hashes.append(hash_value)
+        self._keys.append(key)
+        self._values.append(value)
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+
+        Input: Key (string), Value (object)
+        """
+        if self.table_load() >= 0.5:
+            self.resize_table(self._capacity * 2)
+
+        # Rebuild at the same capacity once dummies push bucket occupancy over 0.75
+        elif (self._size + self._dummies) / self._capacity >= 0.75:
+            self.resize_table(self._capacity)
+
+        self._put(key, value)
+
+    def _reserve(self, count: int) -> None:
+        """
+        Makes room for given number of new keys with a single resize
+
+        Input: Number of keys (int)
+        """
+        needed = self._size + count
+        if (needed - 1) / self._capacity >= 0.5 or (needed + self._dummies) / self._capacity >= 0.75:
+            self.resize_table(max(self._capacity, 2 * needed + 1))
+
+    def _put(self, key: str, value: object) -> None:
+        """
+        Updates or adds key/value pair without checking load factor
+        Updating a key keeps its place in insertion order
+
+        Input: Key (string), Value (object)
+        """
+        hash_value = self._hash_function(key) & HASH_MASK
+        bucket, entry = self._find_bucket(key, hash_value)
+
+        if entry is not None:
+            self._values[entry] = value
+        else:
+            self._append(bucket, hash_value, key, value)
+            self._size += 1
+
+    def get_tombstone_count(self) -> int:
+        """
+        Return number of dummies in the index
+        """
+        return self._dummies
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty index buckets, dummies are not counted as empty
+
+        Output: Number of empty buckets (int)
+        """
+        return self._capacity - self._size - self._dummies
+
+    def probe_length_stats(self) -> (float, int):
+        """
+        Returns average and maximum number of extra index probes needed to reach the keys in hash map
+
+        Output: Tuple (float, int)
+        """
+        index, hashes, capacity = self._index, self._hashes, self._capacity
+        total, longest = 0, 0
+
+        for bucket in range(capacity):
+            entry = index[bucket]
+            if entry < 0:
+                continue
+
+            probes = 0
+            probe, step = hashes[entry] % capacity, 1
+            while probe != bucket:
+                probe = (probe + step) % capacity
+                step += 2
+                probes += 1
+            total += probes
+            longest = max(longest, probes)
+
+        return (total / self._size if self._size else 0.0), longest
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes index based on new capacity input and closes the holes in the entries
+        Keys are placed using their cached hashes, the hash function is not called again
+
+        Input: New capacity (int)
+        """
+        if new_capacity < self._size:
+            return
+
+        if self._is_prime(new_capacity) is False:
+            new_capacity = self._next_prime(new_capacity)
+
+        # Keep doubling while the load factor would reach 0.5, probing relies on it to find an empty bucket
+        while self._size > 0 and (self._size - 1) / new_capacity >= 0.5:
+            new_capacity = self._next_prime(new_capacity * 2)
+
+        old_hashes, old_keys, old_values = self._hashes, self._keys, self._values
+        self._capacity = new_capacity
+        self._allocate(new_capacity)
+
+        # Live entries keep their order, so their new entry number is their position among them
+        index, hashes, keys, values = self._index, self._hashes, self._keys, self._values
+        for hash_value, key, value in zip(old_hashes, old_keys, old_values):
+            if key is None:
+                continue
+
+            bucket, step = hash_value % new_capacity, 1
+            while index[bucket] != INDEX_EMPTY:
+                bucket = (bucket + step) % new_capacity
+                step += 2
+
+            index[bucket] = len(keys)
+            hashes.append(hash_value)
+            keys.append(key)
+            values.append(value)
+
+    def get(self, key: str) -> object:
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (string)
         """
-        self._buckets = DynamicArray()
+        entry = self._find_bucket(key, self._hash_function(key) & HASH_MASK)[1]
 
-        # capacity must be a prime number
-        self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        if entry is not None:
+            return self._values[entry]
 
-        self._hash_function = function
-        self._size = 0
+        return None
 
-    def __str__(self) -> str:
+    def contains_key(self, key: str) -> bool:
         """
-        Override string method to provide more readable output
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Returns true if given key is in hash map, False otherwise
+
+        Input: Key (string)
+        Output: Boolean
         """
-        out = ''
-        for i in range(self._buckets.length()):
-            out += str(i) + ': ' + str(self._buckets[i]) + '\n'
-        return out
+        return self._find_bucket(key, self._hash_function(key) & HASH_MASK)[1] is not None
 
-    def _next_prime(self, capacity: int) -> int:
+    def _remove_entry(self, bucket: int, entry: int) -> None:
         """
-        Increment from given number to find the closest prime number
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Turns index bucket into a dummy and the entry into a hole, releasing key/value references
+
+        Input: Bucket (int), Entry number (int)
         """
-        if capacity % 2 == 0:
-            capacity += 1
+        self._index[bucket] = INDEX_DUMMY
+        self._keys[entry] = None
+        self._values[entry] = None
+        self._dummies += 1
+        self._holes += 1
+        self._size -= 1
 
-        while not self._is_prime(capacity):
-            capacity += 2
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value if it exists within hash map
 
-        return capacity
+        Input: Key (string)
+        """
+        bucket, entry = self._find_bucket(key, self._hash_function(key) & HASH_MASK)
 
-    @staticmethod
-    def _is_prime(capacity: int) -> bool:
+        if entry is not None:
+            self._remove_entry(bucket, entry)
+            if self._holes > self._size:
+                self.resize_table(self._capacity)
+
+    def get_many(self, keys) -> DynamicArray:
         """
-        Determine if given integer is a prime number and return boolean
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Returns dynamic array with the value associated with each key, None for missing keys,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
         """
-        if capacity == 2 or capacity == 3:
-            return True
+        keys = as_list(keys)
+        values, find_bucket = self._values, self._find_bucket
+        entries = [find_bucket(key, hash_value & HASH_MASK)[1]
+                   for key, hash_value in zip(keys, hash_many(self._hash_function, keys))]
+        return DynamicArray([None if entry is None else values[entry] for entry in entries])
 
-        if capacity == 1 or capacity % 2 == 0:
-            return False
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with True for each key in hash map and False otherwise,
+        in the same order as keys
 
-        factor = 3
-        while factor ** 2 <= capacity:
-            if capacity % factor == 0:
-                return False
-            factor += 2
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        keys = as_list(keys)
+        find_bucket = self._find_bucket
+        return DynamicArray([find_bucket(key, hash_value & HASH_MASK)[1] is not None
+                             for key, hash_value in zip(keys, hash_many(self._hash_function, keys))])
 
-        return True
+    def remove_many(self, keys) -> None:
+        """
+        Removes every key in keys and its associated value if it exists within hash map
+        Holes are closed once after all keys are removed
 
-    def get_size(self) -> int:
+        Input: Keys (list or DynamicArray)
         """
-        Return size of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        keys = as_list(keys)
+
+        # A repeated key is not found again once its bucket is a dummy
+        for key, hash_value in zip(keys, hash_many(self._hash_function, keys)):
+            bucket, entry = self._find_bucket(key, hash_value & HASH_MASK)
+            if entry is not None:
+                self._remove_entry(bucket, entry)
+
+        if self._holes > self._size:
+            self.resize_table(self._capacity)
+
+    def clear(self) -> None:
         """
-        return self._size
+        Clears contents of hash map without changing table capacity
+        """
+        self._allocate(self._capacity)
+        self._size = 0
 
-    def get_capacity(self) -> int:
+    def get_keys_and_values(self) -> DynamicArray:
         """
-        Return capacity of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map,
+        in insertion order
+
+        Output: Array (DynamicArray)
         """
-        return self._capacity
+        return DynamicArray([(key, value) for key, value in zip(self._keys, self._values) if key is not None])
 
-    # ------------------------------------------------------------------ #
+    def __iter__(self):
+        """
+        Iterator implementation for hash map, yields entries in insertion order
+        """
+        self._iter_entry = 0
+        return self
 
-    def put(self, key: str, value: object) -> None:
+    def __next__(self):
         """
-         Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+        Returns next valid item in hash map as a HashEntry based on iterator's current location
+        """
+        keys, entry = self._keys, self._iter_entry
 
-         Input: Key (string), Value (object)
-         """
-        # Check load factor and resize accordingly
-        load_factor = self.table_load()
+        while entry < len(keys) and keys[entry] is None:
+            entry += 1
 
-        if load_factor >= 0.5:
-            self.resize_table(self._capacity * 2)
+        if entry >= len(keys):
+            raise StopIteration
 
-        j = 0
-        i = self._hash_function(key)
-        condition = True
+        self._iter_entry = entry + 1
+        return HashEntry(keys[entry], self._values[entry], self._hashes[entry])
 
-        # Iterate array and insert element with quadratic probing to find empty bucket
-        while condition is True:
-            index = (i + (j ** 2)) % self._capacity
-            element = self._buckets[index]
 
-            # Empty bucket or tombstone is found, insert element and increment size
-            if element is None or element.is_tombstone is True:
-                self._buckets[index] = HashEntry(key, value)
-                self._size += 1
-                condition = False
+class SharedHashMap:
+    """
+    Open addressing HashMap of fixed capacity whose buckets and keys/values live in a
+    multiprocessing.shared_memory block laid out as a SlotTable, so any number of processes
+    can attach to it and look keys up without copying or deserializing the table
 
-            # Found matching key, and it is not a tombstone, update value only
-            elif element.key == key and element.is_tombstone is False:
-                element.value = value
-                condition = False
+    Keys are strings; values of other types than bytes, strings, 64-bit integers, floats and None
+    are pickled and only read back by a map created or attached with allow_pickle, which must
+    only be set when every process writing to the block is trusted.
+    Only one process may write at a time. Writes bump the table's sequence number to an
+    odd value before touching a bucket and back to even afterwards; readers retry a lookup
+    that overlapped a write, backing off while the write is in progress. Key and value
+    records are appended to the heap before the sequence is bumped, so updates and removals
+    leave the old records behind, and removals leave tombstones. A put that finds the
+    buckets or the heap full compacts the table in place first to reclaim both.
+    """
 
-            # Bucket is occupied, increment to next bucket
-            else:
-                j += 1
+    # Probing needs the same prime capacity helpers as HashMap
+    _next_prime = HashMap._next_prime
+    _is_prime = staticmethod(HashMap._is_prime)
 
-    def table_load(self) -> float:
+    def __init__(self, memory, function, allow_pickle: bool = False) -> None:
         """
-        Returns hash table's current load factor
+        Wrap an attached shared memory block, use create or attach instead
 
-        Output: Load factor (float)
+        Input: Shared memory (SharedMemory), Hash function (function), Read pickled values (boolean)
         """
-        number_of_elements = self._size
-        number_of_buckets = self._capacity
-        return number_of_elements / number_of_buckets
+        self._memory = memory
+        self._table = SlotTable(memory.buf, allow_pickle)
+        self._capacity = self._table.capacity
+        self._hash_function = function
 
-    def empty_buckets(self) -> int:
+    @classmethod
+    def create(cls, capacity: int, heap_size: int = 1 << 20, function=fnv1a_hash,
+               name: str = None, allow_pickle: bool = False) -> "SharedHashMap":
         """
-        Returns number of empty buckets in hash table
-
-        Output: Number of empty buckets (int)
+        Creates a new empty map in a new shared memory block
+        At most half of the buckets can be in use, so capacity should be twice the number
+        of keys the map has to hold. The hash function must give the same result in every
+        process, which rules out the built-in hash of strings.
+
+        Input: Capacity (int), Heap size in bytes (int), Hash function (function),
+               Name of shared memory block (string), Read pickled values (boolean)
+        Output: Map (SharedHashMap)
         """
-        empty_bucket_count = 0
-
-        # Incremenet count if it's a tombstone or None
-        for i in range(self._buckets.length()):
-            if self._buckets[i] is None or self._buckets[i].is_tombstone is True:
-                empty_bucket_count += 1
-
-        return empty_bucket_count
+        capacity = cls._next_prime(cls, capacity)
+        memory = shared_memory.SharedMemory(name=name, create=True,
+                                            size=SlotTable.required_size(capacity, heap_size))
+        SlotTable.initialize(memory.buf, capacity, heap_size, function).release()
+        return cls(memory, function, allow_pickle)
+
+    @classmethod
+    def attach(cls, name: str, function=fnv1a_hash, allow_pickle: bool = False) -> "SharedHashMap":
+        """
+        Attaches to a map another process created, function must be the one it was created with
 
-    def resize_table(self, new_capacity: int) -> None:
+        Input: Name of shared memory block (string), Hash function (function), Read pickled values (boolean)
+        Output: Map (SharedHashMap)
         """
-        Resizes hash map table based on new capacity input
+        try:
+            # Python 3.13+ can leave unlinking the block to the process that created it
+            memory = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            memory = shared_memory.SharedMemory(name=name)
 
-        Input: New capacity (int)
+        hash_map = cls(memory, function, allow_pickle)
+        try:
+            hash_map._table.check_function(function)
+        except ValueError:
+            hash_map.close()
+            raise
+        return hash_map
+
+    @property
+    def name(self) -> str:
+        """Name other processes attach with."""
+        return self._memory.name
+
+    def close(self) -> None:
         """
-        # Return if new capacity is less than number of elements in hash map
-        if new_capacity < self._size:
-            return
+        Detaches this process from the map, the map stays available to other processes
+        """
+        self._table.release()
+        self._memory.close()
 
-        # Check if input capacity is a prime number and adjust capacity
-        if self._is_prime(new_capacity) is False:
-            self._capacity = self._next_prime(new_capacity)
-        else:
-            self._capacity = new_capacity
+    def unlink(self) -> None:
+        """
+        Destroys the shared memory block once every process has closed it
+        """
+        self._memory.unlink()
 
-        # Initialize copy of previous bucket and set buckets data member to new instance of DynamicArray
-        old_bucket = self._buckets
-        self._buckets = DynamicArray()
+    def _read(self, operation, *args):
+        """
+        Runs a read-only operation until it completes without a write overlapping it
+        A read that overlapped a write can see a half-written bucket and fail or return
+        nonsense, so its result or exception only counts if the sequence did not change.
 
-        # Reset size since the put method increments counter
-        self._size = 0
+        Input: Operation (function), Arguments
+        Output: Result of operation
+        """
+        table = self._table
+        attempt = 0
+
+        while True:
+            # Yield to the writer, then sleep longer on every retry up to a millisecond
+            if attempt:
+                time.sleep(min(0.001, 1e-6 * (1 << attempt)) if attempt > 3 else 0)
+            attempt += 1
+
+            sequence = table.sequence()
+            if sequence & 1:
+                continue
+
+            try:
+                result = operation(*args)
+            except Exception:
+                if table.sequence() == sequence:
+                    raise
+                continue
+
+            if table.sequence() == sequence:
+                return result
+
+    def _find_slot(self, key: str) -> (int, tuple):
+        """
+        Returns bucket index and slot of the live key, None otherwise
 
-        # Populate new buckets with None
-        for _ in range(self._capacity):
-            self._buckets.append(None)
+        Input: Key (string)
+        Output: Index (int), Slot (tuple)
+        """
+        return self._table.find(self._hash_function(key) & HASH_MASK, key.encode('utf-8'))
 
-        # Iterate through old bucket and populate new bucket with hash entry objects
-        for i in range(old_bucket.length()):
-            hash_entry_object = old_bucket[i]
+    def _get(self, key: str) -> object:
+        """
+        Returns value associated with given key, None otherwise, without the sequence check
 
-            # Carry over valid hash entry objects
-            if hash_entry_object is not None and hash_entry_object.is_tombstone is False:
-                self.put(hash_entry_object.key, hash_entry_object.value)
+        Input: Key (string)
+        Output: Value (object)
+        """
+        index, slot = self._find_slot(key)
+        if index is None:
+            return None
+        return self._table.read_value(slot[2])
 
     def get(self, key: str) -> object:
         """
         Returns value associated with given key, None otherwise
 
         Input: Key (string)
+        Output: Value (object)
         """
-        # Iterate until matching valid key is found
-        for i in range(self._buckets.length()):
-            element = self._buckets[i]
-            if element is not None and element.key == key and element.is_tombstone is False:
-                return element.value
-
-        return None
+        return self._read(self._get, key)
 
     def contains_key(self, key: str) -> bool:
         """
@@ -197,13 +2368,86 @@ class HashMap:
         Input: Key (string)
         Output: Boolean
         """
-        # Check if there's a matching valid key
-        for i in range(self._buckets.length()):
-            element = self._buckets[i]
-            if element is not None and element.key == key and element.is_tombstone is False:
-                return True
+        return self._read(self._find_slot, key)[0] is not None
+
+    def _begin_write(self) -> None:
+        """Marks the table as being written so readers retry."""
+        self._table.set_sequence(self._table.sequence() + 1)
+
+    def _end_write(self) -> None:
+        """Marks the write as finished."""
+        self._table.set_sequence(self._table.sequence() + 1)
+
+    def compact(self) -> None:
+        """
+        Drops all tombstones and reclaims the heap space of replaced and removed records, in place
+        """
+        self._begin_write()
+        self._table.compact()
+        self._end_write()
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+        Raises ValueError when every usable bucket or the heap is still full after compacting,
+        the map does not resize
+
+        Input: Key (string), Value (object)
+        """
+        try:
+            self._put(key, value)
+        except ValueError:
+            # Nothing to reclaim means the map really is full
+            counts = self._table.counts()
+            self.compact()
+            if self._table.counts() == counts:
+                raise
+            self._put(key, value)
+
+    def _put(self, key: str, value: object) -> None:
+        """
+        Updates or adds key/value pair without compacting
+
+        Input: Key (string), Value (object)
+        """
+        table, capacity = self._table, self._capacity
+        size, tombstones, heap_used = table.counts()
+        index, slot = self._find_slot(key)
+
+        if index is not None:
+            # Write the new value where readers cannot see it yet, then switch the bucket to it
+            value_offset = heap_used
+            heap_used = table.append_value(heap_used, value)
+            self._begin_write()
+            table.write_slot(index, slot[0], slot[1], value_offset, LIVE)
+            table.set_counts(size, tombstones, heap_used)
+            self._end_write()
+            return
 
-        return False
+        # First empty or tombstone bucket of the probe sequence
+        hash_value = self._hash_function(key) & HASH_MASK
+        j = 0
+        while True:
+            index = (hash_value + j * j) % capacity
+            state = table.read_slot(index)[3]
+            if state != LIVE:
+                break
+            j += 1
+
+        if state == TOMBSTONE:
+            tombstones -= 1
+        elif (size + tombstones + 1) * 2 > capacity:
+            raise ValueError("shared hash map is full")
+
+        key_offset = heap_used
+        heap_used = table.append_key(heap_used, key.encode('utf-8'))
+        value_offset = heap_used
+        heap_used = table.append_value(heap_used, value)
+
+        self._begin_write()
+        table.write_slot(index, hash_value, key_offset, value_offset, LIVE)
+        table.set_counts(size + 1, tombstones, heap_used)
+        self._end_write()
 
     def remove(self, key: str) -> None:
         """
@@ -211,69 +2455,73 @@ class HashMap:
 
         Input: Key (string)
         """
-        # Iterate and set hash entry object's tombstone to True and decrement size
-        for i in range(self._buckets.length()):
-            element = self._buckets[i]
+        index, slot = self._find_slot(key)
 
-            if element is not None and element.key == key and element.is_tombstone is False:
-                element.is_tombstone = True
-                self._size -= 1
+        if index is not None:
+            size, tombstones, heap_used = self._table.counts()
+            self._begin_write()
+            self._table.write_slot(index, slot[0], slot[1], slot[2], TOMBSTONE)
+            self._table.set_counts(size - 1, tombstones + 1, heap_used)
+            self._end_write()
 
-    def clear(self) -> None:
+    def get_size(self) -> int:
         """
-        Clears contents of hash map without changing table capacity
+        Returns number of key/value pairs stored in hash map
         """
-        # Set all bucket elements to None and reset size
-        for i in range(self._buckets.length()):
-            self._buckets[i] = None
+        return self._table.counts()[0]
 
-        self._size = 0
+    def get_capacity(self) -> int:
+        """
+        Returns number of buckets in hash table
+        """
+        return self._capacity
 
-    def get_keys_and_values(self) -> DynamicArray:
+    def table_load(self) -> float:
         """
-         Returns dynamic array where each index contains a tuple of key/value pair in hash map
+        Returns hash table load factor
 
-         Output: Array (DynamicArray)
-         """
-        output_array = DynamicArray()
+        Output: Load factor (float)
+        """
+        return self.get_size() / self._capacity
 
-        # Append tuple to output array if element is not None and valid
-        for i in range(self._buckets.length()):
-            element = self._buckets[i]
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets in hash table, tombstones are not counted as empty
 
-            if element is not None and element.is_tombstone is False:
-                hash_key = element.key
-                hash_value = element.value
-                output_array.append((hash_key, hash_value))
+        Output: Number of empty buckets (int)
+        """
+        size, tombstones, _ = self._read(self._table.counts)
+        return self._capacity - size - tombstones
 
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map
+
+        Output: Array (DynamicArray)
+        """
+        output_array = DynamicArray()
+        for pair in self._read(self._table.items):
+            output_array.append(pair)
         return output_array
 
     def __iter__(self):
         """
-        Iterator implementation for hash map
+        Iterator implementation for hash map over a consistent snapshot of its pairs
         """
         self._index = 0
+        self._live = self._read(self._table.items)
         return self
 
     def __next__(self):
         """
-        Returns next valid item in hash map based on iterator's current location
+        Returns next item in hash map as a HashEntry based on iterator's current location
         """
-        try:
-            # Iterate through bucket and increment index if element is a tombstone or None
-            condition = True
-
-            while condition is True:
-                value = self._buckets[self._index]
-                if value is None or value.is_tombstone is True:
-                    self._index += 1
-                elif value.is_tombstone is False:
-                    condition = False
-        except:
+        if self._index >= len(self._live):
             raise StopIteration
 
+        key, value = self._live[self._index]
         self._index += 1
-        return value
+        return HashEntry(key, value)
 
 
 # ------------------- BASIC TESTING ---------------------------------------- #
@@ -495,3 +2743,171 @@ if __name__ == "__main__":
     print(m)
     for item in m:
         print('K:', item.key, 'V:', item.value)
+
+    print("\nincremental resize example 1")
+    print("-----------------------------")
+    m = HashMap(11, hash_function_1, incremental_resize=True, rehash_step=2)
+    for i in range(50):
+        m.put('key' + str(i), i * 10)
+        if i % 10 == 9:
+            result = all(m.get('key' + str(j)) == j * 10 for j in range(i + 1))
+            print(result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\ncompact example 1")
+    print("-----------------")
+    m = HashMap(23, hash_function_2)
+    for i in range(10):
+        m.put('key' + str(i), i)
+    for i in range(8):
+        m.remove('key' + str(i))
+    print(m.empty_buckets(), m.get_tombstone_count(), m.get_size(), m.get_capacity())
+    m.compact()
+    print(m.empty_buckets(), m.get_tombstone_count(), m.get_size(), m.get_capacity())
+
+    print("\nprobing example 1")
+    print("-----------------")
+    for probing in PROBING_STRATEGIES:
+        m = HashMap(53, hash_function_1, probing=probing)
+        for i in range(150):
+            m.put('key' + str(i), i * 100)
+        m.remove('key10')
+        result = all(m.get('key' + str(i)) == i * 100 for i in range(150) if i != 10)
+        print(probing, result, m.contains_key('key10'), m.get_size(), m.get_capacity(), m.probe_length_stats())
+
+    print("\nfrom_items / put_many example 1")
+    print("--------------------------------")
+    m = HashMap.from_items((('key' + str(i), i) for i in range(30)), function=hash_function_1)
+    print(m.get_size(), m.get_capacity(), m.get('key7'))
+    m.put_many(DynamicArray([('key' + str(i), -i) for i in range(20, 60)]))
+    print(m.get_size(), m.get_capacity(), m.get('key7'), m.get('key25'), m.get('key59'))
+
+    print("\nget_many / contains_many / remove_many example 1")
+    print("-------------------------------------------------")
+    m = HashMap(53, hash_function_2)
+    for i in range(20):
+        m.put('key' + str(i), i * 10)
+    keys = DynamicArray(['key3', 'missing', 'key19', 'key3'])
+    print(m.get_many(keys), m.contains_many(keys))
+    m.remove_many(['key3', 'key4', 'missing', 'key3'])
+    print(m.get_many(keys), m.get_size())
+
+    print("\nPackedHashMap example 1")
+    print("-----------------------")
+    m = PackedHashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
+    print(m.get_keys_and_values(), m.empty_buckets(), m.get_size(), m.get_capacity())
+
+    print("\nRobinHoodHashMap example 1")
+    print("--------------------------")
+    m = RobinHoodHashMap(11, hash_function_2, max_load_factor=0.9)
+    for i in range(9):
+        m.put('key' + str(i), i * 10)
+    m.remove('key3')
+    print(m)
+    print(m.get_size(), m.get_capacity(), round(m.table_load(), 2), m.get('key4'), m.contains_key('key3'))
+    print(m.probe_length_stats())
+
+    print("\nSwissHashMap example 1")
+    print("----------------------")
+    if np is not None:
+        m = SwissHashMap(16, hash_function_2)
+        for i in range(12):
+            m.put('key' + str(i), i * 10)
+        m.remove('key3')
+        print(m.get_size(), m.get_capacity(), round(m.table_load(), 2), m.empty_buckets())
+        print(m.get('key4'), m.contains_key('key3'), m.get_keys_and_values().length())
+        for i in range(12, 40):
+            m.put('key' + str(i), i * 10)
+        print(m.get_size(), m.get_capacity(), all(m.get('key' + str(i)) == i * 10 for i in range(4, 40)))
+
+    print("\nSharedHashMap example 1")
+    print("-----------------------")
+    m = SharedHashMap.create(50, 4096)
+    for i in range(10):
+        m.put('key' + str(i), i * 10)
+    m.put('key1', 'ten')
+    m.remove('key3')
+    # Normally attached from another process by name
+    reader = SharedHashMap.attach(m.name)
+    print(reader.get_size(), reader.get_capacity(), reader.empty_buckets(), reader.get('key1'), reader.get('key4'))
+    print(reader.contains_key('key3'), sorted(item.key for item in reader))
+    reader.close()
+    m.close()
+    m.unlink()
+
+    print("\nBloom filter example 1")
+    print("----------------------")
+    m = HashMap(53, hash_function_1, bloom_filter=True)
+    for i in range(20):
+        m.put('key' + str(i), i)
+    print(m.get('key7'), m.get('yek7'), m.contains_key('missing'), m.get_size())
+    for i in range(15):
+        m.remove('key' + str(i))
+    print(m.contains_key('key3'), m.get('key17'), m.get_size(), m.bloom_filter_stats()[0])
+
+    print("\nsave / open example 1")
+    print("---------------------")
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        path = directory + '/map.hmap'
+        m = HashMap.from_items((('key' + str(i), i * 10) for i in range(20)), function=hash_function_2)
+        m.put('key3', [3, 'three'])
+        m.save(path)
+        # The list was pickled, reading it back needs allow_pickle since this file is trusted
+        mapped = HashMap.open(path, hash_function_2, allow_pickle=True)
+        print(mapped.get_size(), mapped.get_capacity(), mapped.get('key3'), mapped.get('key7'))
+        mapped.remove('key0')
+        mapped.put('key20', 200)
+        print(mapped.get_size(), mapped.get('key0'), mapped.get('key20'))
+        mapped.close()
+        # Changes stay in memory, the file still holds the saved map
+        mapped = HashMap.open(path, hash_function_2)
+        print(mapped.get_size(), mapped.get('key0'), mapped.get('key20'))
+        mapped.close()
+        m = HashMap.open(path, hash_function_2, mmap=False, allow_pickle=True)
+        print(type(m).__name__, m.get_size(), m.get('key19'))
+
+    print("\nfreeze example 1")
+    print("----------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(25):
+        m.put('str' + str(i), i * 100)
+    frozen = m.freeze()
+    print(frozen.get_size(), frozen.get_capacity(), frozen.table_load())
+    print(frozen.get('str7'), frozen.get('str24'), frozen.get('str25'), frozen.contains_key('str0'))
+    with tempfile.TemporaryDirectory() as directory:
+        frozen.save(directory + '/map.frozen')
+        frozen = FrozenHashMap.open(directory + '/map.frozen')
+    print(frozen.get_size(), frozen.get('str7'), sum(entry.value for entry in frozen))
+
+    print("\nshrink example 1")
+    print("----------------")
+    m = HashMap(11, hash_function_1, shrink_threshold=0.1)
+    for i in range(200):
+        m.put('str' + str(i), i)
+    print(m.get_size(), m.get_capacity(), m.get_tombstone_count())
+    for i in range(190):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.get_tombstone_count(), m.get('str195'))
+    m.shrink_to_fit()
+    print(m.get_size(), m.get_capacity(), m.get_tombstone_count(), m.get('str195'))
+
+    print("\nOrderedHashMap example 1")
+    print("------------------------")
+    m = OrderedHashMap(10, hash_function_2)
+    for i in range(5):
+        m.put(str(4 - i), str(i * 24))
+    m.remove('0')
+    m.remove('4')
+    m.put('4', 'again')
+    m.put('2', 'updated')
+    print(m)
+    for item in m:
+        print('K:', item.key, 'V:', item.value)
+    print(m.get_keys_and_values(), m.empty_buckets(), m.get_size(), m.get_capacity(), m.get_tombstone_count())
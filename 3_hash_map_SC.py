@@ -1,26 +1,86 @@
 # Name: Daniel Kim
 # Description: Class definition for HashMap with single chain implementation and function definition for find_mode
 
-from a6_include import DynamicArray, LinkedList, hash_function_1, hash_function_2, SLNode
+import heapq
+import math
+import mmap
+import multiprocessing
+import operator
+import os
+import pickle
+import random
+import sys
+import threading
+import time
+from array import array
+
+from a6_include import (DynamicArray, LinkedList, hash_function_1, hash_function_2, SLNode, murmur_hash,
+                        seeded_hash_function, as_list, bulk_chunks, bulk_length, hash_many, SlotTable, MappedHashMap,
+                        save_slot_table, CacheNode, DoublyLinkedList, TreeBucket, BloomFilter,
+                        FrozenHashMap, python_hash)
+
+
+# Placeholder value of a key merge has just added
+_MISSING = object()
+
+# Empty chain shared by every bucket no key has been inserted into, never inserted into itself;
+# it prints like the empty linked list each bucket used to hold
+_NO_CHAIN = LinkedList()
+
+# Chains longer than TREEIFY_THRESHOLD become TreeBuckets, which turn back into linked lists
+# below UNTREEIFY_THRESHOLD so a chain at the limit does not convert back and forth
+TREEIFY_THRESHOLD = 8
+UNTREEIFY_THRESHOLD = 6
 
 
 class HashMap:
-    def __init__(self, capacity: int = 11, function: callable = hash_function_1) -> None:
+    # Node class new keys are stored in
+    _node_type = SLNode
+
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1,
+                 incremental_resize: bool = False, rehash_step: int = 4, bloom_filter: bool = False,
+                 shrink_threshold: float = None) -> None:
         """
         Initialize new HashMap that uses
         separate chaining for collision resolution
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+
+        With incremental_resize, growing the table keeps the old bucket array live and
+        every put / get / contains_key / remove migrates up to rehash_step old buckets;
+        puts migrate more when needed to finish before the next resize
+
+        With bloom_filter, a BloomFilter of the keys lets get, contains_key
+        and remove return without walking a chain for most missing keys
+
+        With shrink_threshold, removing keys until the load factor falls below it shrinks the
+        table to twice that load factor, never below the initial capacity. Growing happens at
+        1, so shrink_threshold must be below 0.5 and half of the keys left have to be removed
+        (or their number doubled) before the capacity changes again.
         """
-        self._buckets = DynamicArray()
+        if shrink_threshold is not None and not 0 < shrink_threshold < 0.5:
+            raise ValueError("shrink_threshold must be between 0 and 0.5")
 
         # capacity must be a prime number
         self._capacity = self._next_prime(capacity)
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+
+        # A bucket holds the shared _NO_CHAIN until a key is inserted into it
+        self._buckets = DynamicArray([_NO_CHAIN] * self._capacity)
 
         self._hash_function = function
         self._size = 0
 
+        # Old bucket array and next old bucket to migrate while an incremental resize is running
+        self._incremental_resize = incremental_resize
+        self._rehash_step = rehash_step
+        self._old_buckets = None
+        self._rehash_index = 0
+
+        # Keys removed since the Bloom filter was last rebuilt still have their bits set
+        self._bloom = BloomFilter(self._capacity) if bloom_filter else None
+        self._bloom_removals = 0
+
+        self._shrink_threshold = shrink_threshold
+        self._min_capacity = self._capacity
+
     def __str__(self) -> str:
         """
         Override string method to provide more readable output
@@ -64,199 +124,1334 @@ class HashMap:
 
         return True
 
-    def get_size(self) -> int:
+    def get_size(self) -> int:
+        """
+        Return size of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._size
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        DO NOT CHANGE THIS METHOD IN ANY WAY
+        """
+        return self._capacity
+
+    # ------------------------------------------------------------------ #
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+
+        Input: Key (string), Value (object)
+        """
+        self._make_room()
+        self._put(key, value)
+
+    def _make_room(self) -> None:
+        """
+        Runs a step of a running incremental resize and doubles capacity
+        if load factor is greater or equal to 1, before a key may be added
+        """
+        if self._old_buckets is not None:
+            self._rehash(self._rehash_pace())
+
+        load_factor = self.table_load()
+
+        # Double capacity if load factor is greater or equal to 1
+        if load_factor >= 1:
+            if self._incremental_resize is True:
+                self._start_rehash(self._capacity * 2)
+            else:
+                self.resize_table(self._capacity * 2)
+
+    def _put(self, key: str, value: object) -> None:
+        """
+        Updates or adds key/value pair without checking load factor
+
+        Input: Key (string), Value (object)
+        """
+        node = self._setdefault_node(key, value)
+        node.value = value
+
+    def _setdefault_node(self, key: str, default: object) -> SLNode:
+        """
+        Returns node with given key, inserting a node with default value first if key does not exist
+        Hashes the key once and walks its chain once, without checking load factor
+
+        Input: Key (string), Default value (object)
+        Output: Node (SLNode)
+        """
+        hash_value = self._hash_function(key)
+
+        # Key that has not been migrated yet is found in the old bucket array
+        if self._old_buckets is not None:
+            node = self._old_linked_list(hash_value).contains(key, hash_value)
+            if node is not None:
+                return node
+
+        # Calculate array index for input storage location
+        index = hash_value % self._capacity
+
+        # Get the linked list at specified index in array
+        linked_list = self._buckets.get_at_index(index)
+
+        # Traverse through linked list and get the node with specified key, comparing stored hashes first
+        node = linked_list.contains(key, hash_value)
+
+        # If node is none, key/value doesn't exist, insert new node with its hash into list and increment size
+        if node is None:
+            node = self._node_type(key, default, None, hash_value)
+            self._insert_node(self._buckets, index, node)
+            self._size += 1
+            if self._bloom is not None:
+                self._bloom.add(key)
+
+        return node
+
+    def increment(self, key: str, delta=1):
+        """
+        Adds delta to value associated with given key, a key that does not exist starts at 0
+        Returns the new value
+
+        Input: Key (string), Delta (number)
+        """
+        self._make_room()
+        node = self._setdefault_node(key, 0)
+        node.value += delta
+        return node.value
+
+    def setdefault(self, key: str, default: object = None):
+        """
+        Returns value associated with given key, adding key with default value first if it does not exist
+
+        Input: Key (string), Default value (object)
+        """
+        self._make_room()
+        return self._setdefault_node(key, default).value
+
+    def update_with(self, key: str, function, default: object = None):
+        """
+        Replaces value associated with given key by function(value) and returns the new value
+        A key that does not exist is added with default value before function is applied
+
+        Input: Key (string), Function (callable), Default value (object)
+        """
+        self._make_room()
+        node = self._setdefault_node(key, default)
+        node.value = function(node.value)
+        return node.value
+
+    def merge(self, other, function=None) -> None:
+        """
+        Adds every key/value pair of other, a HashMap or an iterable of (key, value) tuples
+        A key that already exists gets function(current value, other value), or simply
+        the other value without function; every pair is hashed once and its chain walked once
+
+        Input: Pairs (HashMap, iterable or DynamicArray), Function (callable)
+        """
+        if isinstance(other, HashMap):
+            other = other.get_keys_and_values()
+
+        self._finish_rehash()
+        for key, value in as_list(other):
+
+            # Double capacity if load factor is greater or equal to 1
+            if self._size >= self._capacity:
+                self.resize_table(self._capacity * 2)
+
+            node = self._setdefault_node(key, _MISSING)
+            if node.value is _MISSING or function is None:
+                node.value = value
+            else:
+                node.value = function(node.value, value)
+
+    @classmethod
+    def from_items(cls, iterable, expected_size: int = None, function=hash_function_1, **options) -> "HashMap":
+        """
+        Returns new hash map holding the key/value pairs of iterable, allocated once at
+        the capacity needed for expected_size pairs (number of pairs when not given,
+        or the length an iterator reports about itself)
+
+        Input: Iterable of (key, value) tuples or DynamicArray, Expected size (int), Hash function
+        Output: Hash map (HashMap)
+        """
+        if expected_size is None:
+            expected_size = bulk_length(iterable)
+
+        hash_map = cls(max(expected_size, 1), function, **options)
+        hash_map.put_many(iterable)
+        return hash_map
+
+    def put_many(self, iterable) -> None:
+        """
+        Updates or adds every key/value pair of iterable, resizing at most once up front
+        instead of checking the load factor for every pair; an iterable without a length
+        is read in chunks, each resizing at most once, so it is never copied whole
+
+        Input: Iterable of (key, value) tuples or DynamicArray
+        """
+        for items in bulk_chunks(iterable):
+            self._reserve(len(items))
+
+            for key, value in items:
+                self._put(key, value)
+
+    def save(self, path: str) -> None:
+        """
+        Writes hash map to a file as a snapshot of buckets, cached hashes and serialized
+        keys/values that open can serve lookups from without loading it
+
+        Input: Path (string)
+        """
+        pairs = as_list(self.get_keys_and_values())
+        save_slot_table(path, self._next_prime(2 * len(pairs) + 1), pairs, self._hash_function)
+
+    @classmethod
+    def open(cls, path: str, function=hash_function_1, mmap: bool = True, allow_pickle: bool = False,
+             **options):
+        """
+        Returns hash map saved to path by save; function must be the one it was saved with
+        With mmap the file is mapped and served by a MappedHashMap, so opening reads only
+        the pages lookups touch. Otherwise every pair is loaded into a new hash map.
+        Values save had to pickle raise ValueError unless allow_pickle is set, which
+        must only be done for trusted files since unpickling can run arbitrary code.
+
+        Input: Path (string), Hash function, Map file (boolean), Read pickled values (boolean)
+        Output: Hash map (MappedHashMap or HashMap)
+        """
+        if mmap:
+            return MappedHashMap(path, function, allow_pickle)
+
+        with open(path, 'rb') as file:
+            table = SlotTable(file.read(), allow_pickle)
+        table.check_function(function)
+        return cls.from_items(table.items(), function=function, **options)
+
+    def freeze(self, function=python_hash) -> FrozenHashMap:
+        """
+        Returns immutable copy of hash map built on a minimal perfect hash, so every
+        lookup is a single call of function(key, seed) and a single key comparison
+
+        Input: Seeded hash function (function)
+        Output: Hash map (FrozenHashMap)
+        """
+        return FrozenHashMap(self.get_keys_and_values(), function)
+
+    def _reserve(self, count: int) -> None:
+        """
+        Makes room for given number of new keys with a single resize so they can be
+        inserted with _put without any load factor checks
+
+        Input: Number of keys (int)
+        """
+        self._finish_rehash()
+
+        needed = self._size + count
+        if (needed - 1) / self._capacity >= 1:
+            self.resize_table(needed)
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets in hash table
+
+        Output: Number of empty buckets (int)
+        """
+        self._finish_rehash()
+        empty_bucket_count = 0
+
+        # Iterate array and increment counter for every bucket without a linked list
+        for i in range(self._buckets.length()):
+            if self._buckets[i] is _NO_CHAIN:
+                empty_bucket_count += 1
+
+        return empty_bucket_count
+
+    def table_load(self) -> float:
+        """
+        Returns hash table's current load factor
+
+        Output: Load factor (float)
+        """
+        number_of_elements = self._size
+        number_of_buckets = self._capacity
+        return number_of_elements / number_of_buckets
+
+    def clear(self) -> None:
+        """
+        Clears contents of hash map without changing table capacity
+        """
+        # Drop old bucket array of a running incremental resize
+        self._old_buckets = None
+        self._rehash_index = 0
+
+        # Drop every linked list, buckets get new ones as keys are inserted
+        self._buckets = DynamicArray([_NO_CHAIN] * self._capacity)
+
+        # Reset size to 0
+        self._size = 0
+        self._rebuild_bloom()
+
+    def resize_table(self, new_capacity: int) -> None:
+        """
+        Resizes hash map table based on new capacity input (must be greater than 1)
+
+        Input: New capacity (int)
+        """
+        # Return if input is less than 1
+        if new_capacity < 1:
+            return
+
+        self._finish_rehash()
+
+        # Check if input capacity is a prime number and adjust capacity
+        if self._is_prime(new_capacity) is False:
+            self._capacity = self._next_prime(new_capacity)
+        else:
+            self._capacity = new_capacity
+
+        # Initialize copy of previous bucket and set buckets data member to new array of empty buckets
+        old_bucket = self._buckets
+        self._buckets = DynamicArray([_NO_CHAIN] * self._capacity)
+
+        # Move existing nodes into the new bucket's linked lists using their stored hashes; keys are
+        # already unique so there is no need to hash, check for duplicates, allocate new nodes or update size
+        for i in range(old_bucket.length()):
+            linked_list = old_bucket[i]
+            if linked_list is _NO_CHAIN:
+                continue
+            for node in linked_list:
+                index = node.hash % self._capacity
+                self._insert_node(self._buckets, index, node)
+
+        self._rebuild_bloom()
+
+    def shrink_to_fit(self) -> None:
+        """
+        Rebuilds hash table at the smallest prime capacity that keeps the load factor at most 1
+        """
+        self.resize_table(max(1, self._size))
+
+    def _shrink_if_sparse(self) -> None:
+        """
+        Shrinks table to the prime capacity at twice shrink_threshold, but not below the
+        initial capacity, once the load factor has fallen below shrink_threshold
+        """
+        if self._capacity <= self._min_capacity or self._size >= self._shrink_threshold * self._capacity:
+            return
+
+        target = int(self._size / (2 * self._shrink_threshold)) + 1
+        new_capacity = self._next_prime(max(self._min_capacity, target))
+        if new_capacity < self._capacity:
+            if self._incremental_resize is True:
+                self._start_rehash(new_capacity)
+            else:
+                self.resize_table(new_capacity)
+
+    @staticmethod
+    def _insert_node(buckets: DynamicArray, index: int, node: SLNode) -> None:
+        """
+        Inserts node of a new key into the bucket at index, replacing a linked list
+        that grows past TREEIFY_THRESHOLD nodes by a TreeBucket
+
+        Input: Buckets (DynamicArray or its underlying list), Index (int), Node (SLNode)
+        """
+        bucket = buckets[index]
+        if bucket is _NO_CHAIN:
+            bucket = buckets[index] = LinkedList()
+        bucket.insert_node(node)
+
+        if bucket.length() > TREEIFY_THRESHOLD and type(bucket) is LinkedList:
+            buckets[index] = TreeBucket(bucket)
+
+    def _start_rehash(self, new_capacity: int) -> None:
+        """
+        Starts an incremental resize: keeps current buckets as the old bucket array
+        and allocates an empty bucket array of the new capacity
+
+        Input: New capacity (int)
+        """
+        self._finish_rehash()
+
+        self._old_buckets = self._buckets
+        self._rehash_index = 0
+        self._capacity = self._next_prime(new_capacity)
+        self._buckets = DynamicArray([_NO_CHAIN] * self._capacity)
+        self._rebuild_bloom()
+
+    def _rehash(self, steps: int) -> None:
+        """
+        Moves the nodes of up to given number of old buckets into the new bucket array
+
+        Input: Number of old buckets (int)
+        """
+        old_bucket = self._old_buckets._data
+        end = min(self._rehash_index + steps, len(old_bucket))
+
+        # Read the underlying lists once instead of paying a bounds check per bucket
+        buckets, capacity = self._buckets._data, self._capacity
+        for i in range(self._rehash_index, end):
+            if old_bucket[i] is _NO_CHAIN:
+                continue
+            for node in old_bucket[i]:
+                self._insert_node(buckets, node.hash % capacity, node)
+
+        self._rehash_index = end
+        if end == len(old_bucket):
+            self._old_buckets = None
+            self._rehash_index = 0
+
+    def _rehash_pace(self) -> int:
+        """
+        Returns number of old buckets a put should migrate so the incremental resize
+        finishes before the load factor can start the next one
+
+        Output: Number of old buckets (int)
+        """
+        remaining = self._old_buckets.length() - self._rehash_index
+
+        # Puts left until the put that checks a load factor of 1, that one included
+        puts_left = self._capacity - self._size + 1
+        return max(self._rehash_step, math.ceil(remaining / max(puts_left, 1)))
+
+    def _finish_rehash(self) -> None:
+        """
+        Migrates all remaining old buckets if an incremental resize is running
+        """
+        if self._old_buckets is not None:
+            self._rehash(self._old_buckets.length())
+
+    def _rebuild_bloom(self) -> None:
+        """
+        Refills the Bloom filter, if there is one, from the keys in both bucket arrays
+        sized for the current capacity, dropping the bits of removed keys
+        """
+        if self._bloom is None:
+            return
+
+        self._bloom.reset(self._capacity)
+        self._bloom_removals = 0
+        buckets = [(self._buckets, 0)]
+        if self._old_buckets is not None:
+            buckets.append((self._old_buckets, self._rehash_index))
+
+        # Old buckets below the rehash index were already moved into the new bucket array
+        for bucket_array, start in buckets:
+            for i in range(start, bucket_array.length()):
+                if bucket_array[i] is not _NO_CHAIN:
+                    for node in bucket_array[i]:
+                        self._bloom.add(node.key)
+
+    def _removed_from_bloom(self, count: int) -> None:
+        """
+        Counts keys removed since the Bloom filter was built and rebuilds it
+        once they outnumber the keys left in the map
+
+        Input: Number of removed keys (int)
+        """
+        if self._bloom is not None and count:
+            self._bloom_removals += count
+            if self._bloom_removals > self._size:
+                self._rebuild_bloom()
+
+    def bloom_filter_stats(self) -> (int, float, float):
+        """
+        Returns memory of the Bloom filter in bytes, its estimated false positive rate and
+        the share of lookups of missing keys it let through, None without a Bloom filter
+
+        Output: Tuple (int, float, float)
+        """
+        if self._bloom is None:
+            return None
+        return self._bloom.stats()
+
+    def _old_linked_list(self, hash_value: int) -> LinkedList:
+        """
+        Returns linked list of the old bucket array holding keys with given hash if that
+        bucket has not been migrated yet, otherwise an empty linked list
+
+        Input: Hash (int)
+        Output: Linked list (LinkedList)
+        """
+        index = hash_value % self._old_buckets.length()
+
+        # Buckets below the rehash index were already moved into the new bucket array
+        if index < self._rehash_index:
+            return _NO_CHAIN
+
+        return self._old_buckets[index]
+
+    def _find_node(self, key: str) -> SLNode:
+        """
+        Returns node with given key, None otherwise
+        Consults both bucket arrays while an incremental resize is running
+
+        Input: Key (string)
+        Output: Node (SLNode)
+        """
+        if self._old_buckets is not None:
+            self._rehash(self._rehash_step)
+
+        # Most missing keys are ruled out before the key is even hashed
+        if self._bloom is not None and not self._bloom.might_contain(key):
+            return None
+
+        hash_value = self._hash_function(key)
+        linked_list = self._buckets[hash_value % self._capacity]
+        node = linked_list.contains(key, hash_value)
+
+        if node is None and self._old_buckets is not None:
+            node = self._old_linked_list(hash_value).contains(key, hash_value)
+
+        if node is None and self._bloom is not None:
+            self._bloom.false_positives += 1
+
+        return node
+
+    def get(self, key: str):
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (string)
+        """
+        # Get node based on input key and return node value if it exists
+        node = self._find_node(key)
+
+        if node is not None:
+            return node.value
+
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns true if given key is in hash map, False otherwise
+
+        Input: Key (string)
+        Output: Boolean
+        """
+        # Get node based on input key and return True if it exists
+        node = self._find_node(key)
+
+        if node is not None:
+            return True
+
+        return False
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value if it exists within hash map
+
+        Input: Key (string)
+        """
+        self._pop_node(key)
+
+    def pop(self, key: str, default: object = None):
+        """
+        Removes given key and returns its associated value, default if key does not exist
+
+        Input: Key (string), Default value (object)
+        """
+        node = self._pop_node(key)
+
+        if node is not None:
+            return node.value
+
+        return default
+
+    def _pop_node(self, key: str) -> SLNode:
+        """
+        Unlinks node with given key and returns it, None otherwise
+        Hashes the key once and walks its chain once
+
+        Input: Key (string)
+        Output: Node (SLNode)
+        """
+        if self._old_buckets is not None:
+            self._rehash(self._rehash_step)
+
+        if self._bloom is not None and not self._bloom.might_contain(key):
+            return None
+
+        hash_value = self._hash_function(key)
+        node = self._pop_from_bucket(self._buckets._data, hash_value % self._capacity, key, hash_value)
+
+        # Key that has not been migrated yet is removed from the old bucket array
+        if node is None and self._old_buckets is not None:
+            node = self._old_linked_list(hash_value).pop(key, hash_value)
+
+        # If node is not None, decrement size
+        if node is not None:
+            self._size -= 1
+            self._removed_from_bloom(1)
+            if self._shrink_threshold is not None:
+                self._shrink_if_sparse()
+        elif self._bloom is not None:
+            self._bloom.false_positives += 1
+
+        return node
+
+    @staticmethod
+    def _pop_from_bucket(buckets: list, index: int, key: str, hash_value: int) -> SLNode:
+        """
+        Unlinks node with given key from the bucket at index and returns it, None otherwise
+        A tree that shrinks below UNTREEIFY_THRESHOLD nodes goes back to being a linked list
+        and a bucket left without nodes goes back to _NO_CHAIN
+
+        Input: Buckets (list), Index (int), Key (string), Hash (int)
+        Output: Node (SLNode)
+        """
+        bucket = buckets[index]
+        if bucket is _NO_CHAIN:
+            return None
+
+        node = bucket.pop(key, hash_value)
+
+        if type(bucket) is TreeBucket and bucket.length() < UNTREEIFY_THRESHOLD:
+            linked_list = LinkedList()
+            for tree_node in bucket:
+                linked_list.insert_node(tree_node)
+            buckets[index] = linked_list
+        elif bucket.length() == 0:
+            buckets[index] = _NO_CHAIN
+
+        return node
+
+    def _find_nodes(self, keys: list) -> list:
+        """
+        Returns list with the node of each key in keys, None for missing keys
+        Keys are hashed in one pass, then looked up one after another
+
+        Input: Keys (list)
+        Output: Nodes (list)
+        """
+        if self._old_buckets is not None:
+            self._rehash(self._rehash_step)
+
+        hashes = hash_many(self._hash_function, keys)
+        capacity = self._capacity
+        nodes = [None] * len(keys)
+
+        # Read the underlying list once instead of paying a bounds check per key
+        buckets = self._buckets._data
+
+        for i in range(len(keys)):
+            node = buckets[hashes[i] % capacity].contains(keys[i], hashes[i])
+
+            if node is None and self._old_buckets is not None:
+                node = self._old_linked_list(hashes[i]).contains(keys[i], hashes[i])
+
+            nodes[i] = node
+
+        return nodes
+
+    def get_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with the value associated with each key, None for missing keys,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        nodes = self._find_nodes(as_list(keys))
+        return DynamicArray([None if node is None else node.value for node in nodes])
+
+    def contains_many(self, keys) -> DynamicArray:
+        """
+        Returns dynamic array with True for each key in hash map and False otherwise,
+        in the same order as keys
+
+        Input: Keys (list or DynamicArray)
+        Output: Array (DynamicArray)
+        """
+        nodes = self._find_nodes(as_list(keys))
+        return DynamicArray([node is not None for node in nodes])
+
+    def remove_many(self, keys) -> None:
+        """
+        Removes every key in keys and its associated value if it exists within hash map
+        A running incremental resize is finished first so every key is in the current table
+
+        Input: Keys (list or DynamicArray)
+        """
+        self._finish_rehash()
+
+        keys = as_list(keys)
+        capacity, buckets = self._capacity, self._buckets._data
+
+        removed = 0
+        for key, hash_value in zip(keys, hash_many(self._hash_function, keys)):
+            if self._pop_from_bucket(buckets, hash_value % capacity, key, hash_value) is not None:
+                removed += 1
+
+        self._size -= removed
+        self._removed_from_bloom(removed)
+        if self._shrink_threshold is not None:
+            self._shrink_if_sparse()
+
+    def get_keys_and_values(self) -> DynamicArray:
+        """
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map
+
+        Output: Array (DynamicArray)
+        """
+        self._finish_rehash()
+        return_array = DynamicArray()
+
+        # Iterate bucket and for each linked list, if node is not None, append it's key/value to output array
+        for index in range(self._capacity):
+            linked_list = self._buckets[index]
+            if linked_list is _NO_CHAIN:
+                continue
+            for node in linked_list:
+                if node is not None:
+                    return_array.append((node.key, node.value))
+
+        return return_array
+
+    def chain_length_stats(self) -> (float, int):
+        """
+        Returns average length of the non-empty chains and length of the longest chain
+
+        Output: Tuple (float, int)
+        """
+        self._finish_rehash()
+        used, longest = 0, 0
+
+        for i in range(self._capacity):
+            if self._buckets[i] is _NO_CHAIN:
+                continue
+            length = self._buckets[i].length()
+            if length > 0:
+                used += 1
+                longest = max(longest, length)
+
+        return (self._size / used if used else 0.0), longest
+
+    def get_node(self, key: str) -> SLNode:
+        """
+        Returns linked list node associated with specified key, None otherwise
+
+        Input: Key (string)
+        Output: Node (SLNode)
+        """
+        return self._find_node(key)
+
+
+class ConcurrentHashMap:
+    """
+    Separate chaining HashMap that can be shared between threads
+
+    Buckets hold the head node of immutable chains: writers never modify a node once it is in
+    a chain, they copy the nodes in front of the change and store the new head in the bucket.
+    get and contains_key therefore walk whatever chain they find without taking a lock.
+    Writers lock the stripe covering their bucket's range of the table, so writers to different
+    stripes never wait on each other, and a resize takes every stripe before it swaps in the
+    new (buckets, capacity) table
+    """
+
+    # Same prime capacities as HashMap
+    _next_prime = HashMap._next_prime
+    _is_prime = staticmethod(HashMap._is_prime)
+
+    def __init__(self, capacity: int = 11, function: callable = hash_function_1, stripes: int = 16) -> None:
+        """
+        Initialize new ConcurrentHashMap with given number of lock stripes
+        """
+        capacity = self._next_prime(capacity)
+        self._table = ([None] * capacity, capacity)
+        self._hash_function = function
+        self._locks = [threading.Lock() for _ in range(stripes)]
+
+        # Number of keys in the buckets of every stripe, only changed while holding that stripe
+        self._sizes = [0] * stripes
+
+    def __str__(self) -> str:
+        """
+        Override string method to provide more readable output
+        """
+        buckets, capacity = self._table
+        out = ''
+        for i in range(capacity):
+            out += str(i) + ': ' + ' -> '.join(str(node) for node in self._chain(buckets[i])) + '\n'
+        return out
+
+    def get_size(self) -> int:
+        """
+        Return size of map; may miss writes that are still in progress
+        """
+        return sum(self._sizes)
+
+    def get_capacity(self) -> int:
+        """
+        Return capacity of map
+        """
+        return self._table[1]
+
+    @staticmethod
+    def _chain(node: SLNode):
+        """
+        Yields the nodes of the chain starting at given node
+
+        Input: Head (SLNode)
+        """
+        while node is not None:
+            yield node
+            node = node.next
+
+    def _find_node(self, key: str) -> SLNode:
+        """
+        Returns node with given key in the current table without locking, None otherwise
+
+        Input: Key (string)
+        Output: Node (SLNode)
+        """
+        hash_value = self._hash_function(key)
+        buckets, capacity = self._table
+
+        node = buckets[hash_value % capacity]
+        while node is not None:
+            if node.hash == hash_value and node.key == key:
+                return node
+            node = node.next
+
+        return None
+
+    def _lock_bucket(self, hash_value: int) -> (list, int, int):
+        """
+        Acquires the stripe lock of the bucket for given hash and returns the buckets, bucket index
+        and stripe; tries again if a resize swapped the table before the lock was acquired
+
+        Input: Hash (int)
+        Output: Tuple (list, int, int)
+        """
+        while True:
+            buckets, capacity = self._table
+            index = hash_value % capacity
+            stripe = index * len(self._locks) // capacity
+
+            self._locks[stripe].acquire()
+            if self._table[0] is buckets:
+                return buckets, index, stripe
+            self._locks[stripe].release()
+
+    @staticmethod
+    def _copy_chain(head: SLNode, stop: SLNode, tail: SLNode) -> SLNode:
+        """
+        Returns head of a copy of the nodes from head up to but not including stop,
+        linked in front of tail
+
+        Input: Head (SLNode), Stop (SLNode), Tail (SLNode)
+        Output: Head (SLNode)
+        """
+        prefix = []
+        while head is not stop:
+            prefix.append(head)
+            head = head.next
+
+        for node in reversed(prefix):
+            tail = SLNode(node.key, node.value, tail, node.hash)
+        return tail
+
+    def _update(self, key: str, update) -> (SLNode, object):
+        """
+        Replaces the value of key by update(node), where node holds the current value or is None
+        if key does not exist; update returning _MISSING removes key. Runs under the lock of the
+        key's stripe and returns the old node and the new value
+
+        Input: Key (string), Update (callable)
+        Output: Tuple (SLNode, object)
+        """
+        hash_value = self._hash_function(key)
+        buckets, index, stripe = self._lock_bucket(hash_value)
+
+        try:
+            head = node = buckets[index]
+            while node is not None and not (node.hash == hash_value and node.key == key):
+                node = node.next
+
+            value = update(node)
+
+            if node is None:
+                if value is not _MISSING:
+                    buckets[index] = SLNode(key, value, head, hash_value)
+                    self._sizes[stripe] += 1
+            elif value is _MISSING:
+                buckets[index] = self._copy_chain(head, node, node.next)
+                self._sizes[stripe] -= 1
+            elif value is not node.value:
+                buckets[index] = self._copy_chain(head, node, SLNode(key, value, node.next, hash_value))
+        finally:
+            self._locks[stripe].release()
+
+        # Double capacity once load factor reaches 1, unless another thread already did
+        if node is None and value is not _MISSING and self.get_size() >= len(buckets):
+            self._resize(len(buckets) * 2, buckets)
+
+        return node, value
+
+    def put(self, key: str, value: object) -> None:
+        """
+        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+
+        Input: Key (string), Value (object)
+        """
+        self._update(key, lambda node: value)
+
+    def setdefault(self, key: str, default: object = None):
+        """
+        Returns value associated with given key, atomically adding key with default value first
+        if it does not exist
+
+        Input: Key (string), Default value (object)
+        """
+        return self._update(key, lambda node: default if node is None else node.value)[1]
+
+    def increment(self, key: str, delta=1):
+        """
+        Atomically adds delta to value associated with given key, a key that does not exist starts at 0
+        Returns the new value
+
+        Input: Key (string), Delta (number)
+        """
+        return self._update(key, lambda node: (0 if node is None else node.value) + delta)[1]
+
+    def get(self, key: str):
+        """
+        Returns value associated with given key, None otherwise
+
+        Input: Key (string)
+        """
+        node = self._find_node(key)
+
+        if node is not None:
+            return node.value
+
+        return None
+
+    def contains_key(self, key: str) -> bool:
+        """
+        Returns true if given key is in hash map, False otherwise
+
+        Input: Key (string)
+        Output: Boolean
+        """
+        return self._find_node(key) is not None
+
+    def remove(self, key: str) -> None:
+        """
+        Removes given key and its associated value if it exists within hash map
+
+        Input: Key (string)
+        """
+        self._update(key, lambda node: _MISSING)
+
+    def pop(self, key: str, default: object = None):
+        """
+        Removes given key and returns its associated value, default if key does not exist
+
+        Input: Key (string), Default value (object)
+        """
+        node = self._update(key, lambda node: _MISSING)[0]
+
+        if node is not None:
+            return node.value
+
+        return default
+
+    def table_load(self) -> float:
+        """
+        Returns hash table's current load factor
+
+        Output: Load factor (float)
+        """
+        return self.get_size() / self.get_capacity()
+
+    def empty_buckets(self) -> int:
+        """
+        Returns number of empty buckets in hash table
+
+        Output: Number of empty buckets (int)
+        """
+        return self._table[0].count(None)
+
+    def _resize(self, new_capacity: int, expected: list = None) -> None:
         """
-        Return size of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Holds every stripe lock while rebuilding the chains into a table of the new capacity;
+        does nothing if expected buckets are given and the table has been replaced meanwhile
+
+        Input: New capacity (int), Expected buckets (list)
         """
-        return self._size
+        for lock in self._locks:
+            lock.acquire()
+
+        try:
+            buckets, capacity = self._table
+            if expected is not None and buckets is not expected:
+                return
+
+            new_capacity = self._next_prime(new_capacity)
+            new_buckets = [None] * new_capacity
+            sizes = [0] * len(self._locks)
+
+            # Old chains stay intact for readers still walking them, so every node is copied
+            for head in buckets:
+                for node in self._chain(head):
+                    index = node.hash % new_capacity
+                    new_buckets[index] = SLNode(node.key, node.value, new_buckets[index], node.hash)
+                    sizes[index * len(self._locks) // new_capacity] += 1
+
+            self._sizes = sizes
+            self._table = (new_buckets, new_capacity)
+        finally:
+            for lock in self._locks:
+                lock.release()
 
-    def get_capacity(self) -> int:
+    def resize_table(self, new_capacity: int) -> None:
         """
-        Return capacity of map
-        DO NOT CHANGE THIS METHOD IN ANY WAY
+        Resizes hash map table based on new capacity input (must be greater than 1)
+
+        Input: New capacity (int)
         """
-        return self._capacity
+        if new_capacity < 1:
+            return
 
-    # ------------------------------------------------------------------ #
+        self._resize(new_capacity)
 
-    def put(self, key: str, value: object) -> None:
+    def clear(self) -> None:
         """
-        Updates key/value pair in hash map or adds new key/value pair if pair does not exist in hash map
+        Clears contents of hash map without changing table capacity
+        """
+        for lock in self._locks:
+            lock.acquire()
+
+        try:
+            capacity = self._table[1]
+            self._sizes = [0] * len(self._locks)
+            self._table = ([None] * capacity, capacity)
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def __iter__(self):
+        """
+        Returns a new iterator over the nodes of the hash map; every iterator is independent
+        and weakly consistent: it never fails because of concurrent writes, sees every key that
+        existed throughout the iteration and may or may not see keys written meanwhile
+        """
+        buckets, capacity = self._table
+        for i in range(capacity):
+            yield from self._chain(buckets[i])
 
-        Input: Key (string), Value (object)
+    def get_keys_and_values(self) -> DynamicArray:
         """
-        load_factor = self.table_load()
+        Returns dynamic array where each index contains a tuple of key/value pair in hash map
 
-        # Double capacity if load factor is greater or equal to 1
-        if load_factor >= 1:
-            self.resize_table(self._capacity * 2)
+        Output: Array (DynamicArray)
+        """
+        return DynamicArray([(node.key, node.value) for node in self])
 
-        # Calculate array index for input storage location
-        index = self._hash_function(key) % self._capacity
 
-        # Get the linked list at specified index in array
-        linked_list = self._buckets.get_at_index(index)
+class _CacheTable(HashMap):
+    """
+    SC HashMap whose nodes are CacheNodes, the key index of LRUCache and LFUCache
+    """
+    _node_type = CacheNode
 
-        # Traverse through linked list and get the node with specified key
-        node = linked_list.contains(key)
 
-        # If node is none, key/value doesn't exist, insert new pair into list and increment size
-        if node is None:
-            linked_list.insert(key, value)
-            self._size += 1
+class LRUCache:
+    """
+    Bounded cache that evicts the least recently used entry
 
-        # Key/value pair does exist, update value
-        else:
-            node.value = value
+    Entries live in a separate chaining HashMap whose nodes are also linked into a doubly
+    linked list from least to most recently used, so get, put and eviction are O(1).
+    Entries can expire after a time to live; an expired entry is dropped when it is next
+    looked up or when it comes up for eviction, so get_size can count it until then
+    """
 
-    def empty_buckets(self) -> int:
+    def __init__(self, max_entries: int = None, max_bytes: int = None, ttl: float = None,
+                 function: callable = hash_function_1, sizeof: callable = None, clock: callable = time.monotonic) -> None:
         """
-        Returns number of empty buckets in hash table
+        Initialize new cache holding at most max_entries entries and / or max_bytes bytes,
+        as measured by sizeof(key, value) (sys.getsizeof of key and value by default)
+        Entries expire ttl seconds after they were put, as measured by clock, unless put sets a ttl
 
-        Output: Number of empty buckets (int)
+        Input: Maximum entries (int), Maximum bytes (int), Time to live (float), Hash function,
+               Size function (callable), Clock (callable)
         """
-        empty_bucket_count = 0
+        # A table sized for max_entries never grows, otherwise put grows it with the entry count
+        self._table = _CacheTable(max_entries or 11, function)
+        self._order = DoublyLinkedList()
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._ttl = ttl
+        self._sizeof = sizeof or self._getsizeof
+        self._clock = clock
+        self._bytes = 0
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
 
-        # Iterate array and check length of linked list, increment counter if linked list length is zero
-        for i in range(self._buckets.length()):
-            linked_list = self._buckets[i]
-            if linked_list.length() == 0:
-                empty_bucket_count += 1
+    @staticmethod
+    def _getsizeof(key: str, value: object) -> int:
+        """Default size of an entry: shallow size of its key and value."""
+        return sys.getsizeof(key) + sys.getsizeof(value)
 
-        return empty_bucket_count
+    def _link(self, node: CacheNode) -> None:
+        """Adds a new node to the eviction order."""
+        self._order.append(node)
 
-    def table_load(self) -> float:
-        """
-        Returns hash table's current load factor
+    def _touch(self, node: CacheNode) -> None:
+        """Moves a used node to the end of the eviction order."""
+        self._order.unlink(node)
+        self._order.append(node)
 
-        Output: Load factor (float)
-        """
-        number_of_elements = self._size
-        number_of_buckets = self._capacity
-        return number_of_elements / number_of_buckets
+    def _unlink(self, node: CacheNode) -> None:
+        """Removes a node from the eviction order."""
+        self._order.unlink(node)
 
-    def clear(self) -> None:
-        """
-        Clears contents of hash map without changing table capacity
+    def _victim(self) -> CacheNode:
+        """Returns the node to evict next, None if the cache is empty."""
+        return self._order.first()
+
+    def _nodes(self):
+        """Returns a generator over the nodes in eviction order."""
+        return iter(self._order)
+
+    def _discard(self, node: CacheNode) -> None:
         """
-        # Set each bucket to empty linked list
-        for i in range(self._capacity):
-            self._buckets[i] = LinkedList()
+        Removes node from the table and the eviction order
 
-        # Reset size to 0
-        self._size = 0
+        Input: Node (CacheNode)
+        """
+        self._table._pop_node(node.key)
+        self._unlink(node)
+        self._bytes -= node.size
 
-    def resize_table(self, new_capacity: int) -> None:
+    def _live_node(self, key: str) -> CacheNode:
         """
-        Resizes hash map table based on new capacity input (must be greater than 1)
+        Returns node with given key, None otherwise; an expired node is discarded first
 
-        Input: New capacity (int)
+        Input: Key (string)
+        Output: Node (CacheNode)
         """
-        # Return if input is less than 1
-        if new_capacity < 1:
-            return
+        node = self._table._find_node(key)
 
-        # Check if input capacity is a prime number and adjust capacity
-        if self._is_prime(new_capacity) is False:
-            self._capacity = self._next_prime(new_capacity)
-        else:
-            self._capacity = new_capacity
+        if node is not None and node.expires is not None and node.expires <= self._clock():
+            self._discard(node)
+            self.expirations += 1
+            return None
 
-        # Initialize copy of previous bucket and set buckets data member to new instance of DynamicArray
-        old_bucket = self._buckets
-        self._buckets = DynamicArray()
+        return node
 
-        # Reset size since the put method increments counter
-        self._size = 0
+    def _evict(self, entries: int, size: int) -> None:
+        """
+        Evicts nodes until the given number of new entries of given total size fit in the bounds
 
-        # Populate new bucket list with empty linked list
-        for _ in range(self._capacity):
-            self._buckets.append(LinkedList())
+        Input: Number of entries (int), Size (int)
+        """
+        max_entries, max_bytes = self._max_entries, self._max_bytes
 
-        # Iterate through old bucket and populate new bucket's linked list nodes
-        for i in range(old_bucket.length()):
-            linked_list = old_bucket[i]
-            for node in linked_list:
-                self.put(node.key, node.value)
+        while ((max_entries is not None and self._table.get_size() + entries > max_entries)
+               or (max_bytes is not None and self._bytes + size > max_bytes)):
+            node = self._victim()
+            if node is None:
+                return
+            self._discard(node)
+            self.evictions += 1
 
-    def get(self, key: str):
+    def get(self, key: str, default: object = None):
         """
-        Returns value associated with given key, None otherwise
+        Returns value associated with given key and marks the entry as used, default otherwise
 
-        Input: Key (string)
+        Input: Key (string), Default value (object)
         """
-        # Get linked list at index based on input key and return node value if it exists
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
-        node = linked_list.contains(key)
+        node = self._live_node(key)
 
-        if node is not None:
-            return node.value
+        if node is None:
+            self.misses += 1
+            return default
 
-        return None
+        self.hits += 1
+        self._touch(node)
+        return node.value
 
     def contains_key(self, key: str) -> bool:
         """
-        Returns true if given key is in hash map, False otherwise
+        Returns true if given key is cached and has not expired, False otherwise
+        Does not count as a use of the entry
 
         Input: Key (string)
         Output: Boolean
         """
-        # Get linked list at index based on input key and return True if it exists
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
-        node = linked_list.contains(key)
+        return self._live_node(key) is not None
+
+    def put(self, key: str, value: object, ttl: float = None) -> None:
+        """
+        Caches value for given key, evicting entries first if the cache is full
+        The entry expires after ttl seconds, or after the cache's ttl when not given
+
+        Input: Key (string), Value (object), Time to live (float)
+        """
+        size = self._sizeof(key, value) if self._max_bytes is not None else 0
+        node = self._live_node(key)
 
         if node is not None:
-            return True
+            self._touch(node)
+            self._bytes += size - node.size
+        else:
+            # Make room before linking the new entry so it is never its own victim
+            self._evict(1, size)
+            self._table._make_room()
+            node = self._table._setdefault_node(key, value)
+            self._link(node)
+            self._bytes += size
 
-        return False
+        node.value = value
+        node.size = size
+
+        if ttl is None:
+            ttl = self._ttl
+        node.expires = None if ttl is None else self._clock() + ttl
+
+        # An updated entry can have grown past max_bytes
+        self._evict(0, 0)
 
     def remove(self, key: str) -> None:
         """
-        Removes given key and its associated value if it exists within hash map
+        Removes given key and its associated value if it is cached
 
         Input: Key (string)
         """
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
-        node = linked_list.contains(key)
+        self.pop(key)
 
-        # If node is not None, remove node and decrement size
-        if node is not None:
-            linked_list.remove(key)
-            self._size -= 1
+    def pop(self, key: str, default: object = None):
+        """
+        Removes given key and returns its associated value, default if key is not cached
+
+        Input: Key (string), Default value (object)
+        """
+        node = self._live_node(key)
+
+        if node is None:
+            return default
+
+        self._discard(node)
+        return node.value
+
+    def clear(self) -> None:
+        """
+        Removes every entry, counters are kept
+        """
+        self._table.clear()
+        self._order = DoublyLinkedList()
+        self._bytes = 0
+
+    def get_size(self) -> int:
+        """
+        Returns number of cached entries, including expired entries not dropped yet
+        """
+        return self._table.get_size()
+
+    def get_bytes(self) -> int:
+        """
+        Returns total size of the cached entries, 0 without max_bytes
+        """
+        return self._bytes
+
+    def hit_rate(self) -> float:
+        """
+        Returns fraction of get calls that found their key
+
+        Output: Hit rate (float)
+        """
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
 
     def get_keys_and_values(self) -> DynamicArray:
         """
-        Returns dynamic array where each index contains a tuple of key/value pair in hash map
+        Returns dynamic array where each index contains a tuple of key/value pair of an entry
+        that has not expired, in eviction order
 
         Output: Array (DynamicArray)
         """
-        return_array = DynamicArray()
+        now = self._clock()
+        return DynamicArray([(node.key, node.value) for node in self._nodes()
+                             if node.expires is None or node.expires > now])
 
-        # Iterate bucket and for each linked list, if node is not None, append it's key/value to output array
-        for index in range(self._capacity):
-            linked_list = self._buckets[index]
-            for node in linked_list:
-                if node is not None:
-                    return_array.append((node.key, node.value))
 
-        return return_array
+class _FrequencyGroup:
+    """
+    Entries of an LFUCache that have been used the same number of times, least recently used first
+    """
 
-    def get_node(self, key: str) -> SLNode:
+    def __init__(self, frequency: int) -> None:
+        self.frequency = frequency
+        self.entries = DoublyLinkedList()
+        self.older = None
+        self.newer = None
+
+
+class LFUCache(LRUCache):
+    """
+    Bounded cache that evicts the least frequently used entry, the least recently used
+    one among entries used equally often
+
+    The eviction order is a doubly linked list of frequency groups in increasing order of
+    use count, each holding a doubly linked list of its entries; a use moves an entry to
+    the next group, so get, put and eviction stay O(1)
+    """
+
+    def _link(self, node: CacheNode) -> None:
+        """Adds a new node to the group of entries used once."""
+        group = self._order.first()
+        if group is None or group.frequency != 1:
+            group = _FrequencyGroup(1)
+            self._order.insert_after(group)
+
+        group.entries.append(node)
+        node.group = group
+
+    def _touch(self, node: CacheNode) -> None:
+        """Moves a used node to the group of the next frequency."""
+        group = node.group
+        following = self._order.next_of(group)
+        if following is None or following.frequency != group.frequency + 1:
+            following = _FrequencyGroup(group.frequency + 1)
+            self._order.insert_after(following, group)
+
+        self._unlink(node)
+        following.entries.append(node)
+        node.group = following
+
+    def _unlink(self, node: CacheNode) -> None:
+        """Removes a node from its group and drops the group once it is empty."""
+        group = node.group
+        group.entries.unlink(node)
+        node.group = None
+        if group.entries.is_empty():
+            self._order.unlink(group)
+
+    def _victim(self) -> CacheNode:
+        """Returns the least recently used node of the least frequency, None if the cache is empty."""
+        group = self._order.first()
+        return None if group is None else group.entries.first()
+
+    def _nodes(self):
+        """Returns a generator over the nodes in eviction order."""
+        return (node for group in self._order for node in group.entries)
+
+    def frequency(self, key: str) -> int:
         """
-        Returns linked list node associated with specified key, None otherwise
+        Returns number of times given key was put or got since it was cached, 0 if it is not cached
 
         Input: Key (string)
-        Output: Node (SLNode)
+        Output: Use count (int)
         """
-        index = self._hash_function(key) % self._capacity
-        linked_list = self._buckets[index]
-        node = linked_list.contains(key)
-
-        return node
+        node = self._live_node(key)
+        return 0 if node is None else node.group.frequency
 
 
 def find_mode(da: DynamicArray) -> (DynamicArray, int):
@@ -270,20 +1465,13 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     mode_array = DynamicArray()
     max_count = 1
 
-    # Populate hash map with key and count of key
+    # Populate hash map with key and count of key, hashing each element once
     for i in range(da.length()):
-        element = da[i]
+        count = hash_map.increment(da[i])
 
-        # Hash map doesn't contain element, insert into hash map
-        if hash_map.contains_key(element) is False:
-            hash_map.put(element, 1)
-        # Hash map contains element, update count
-        else:
-            node = hash_map.get_node(element)
-            node.value += 1
-            # Update max count variable to track highest occuring frequency
-            if node.value > max_count:
-                max_count = node.value
+        # Update max count variable to track highest occuring frequency
+        if count > max_count:
+            max_count = count
 
     # Get array of tuples with key and key count
     key_and_count_array = hash_map.get_keys_and_values()
@@ -304,6 +1492,287 @@ def find_mode(da: DynamicArray) -> (DynamicArray, int):
     return mode_array, max_count
 
 
+def _modes_of(counts: HashMap) -> (DynamicArray, int):
+    """
+    Returns a tuple of a dynamic array with the key(s) of highest count and that count
+
+    Input: Counts (HashMap)
+    Output: Tuple (DynamicArray, int)
+    """
+    pairs = as_list(counts.get_keys_and_values())
+    max_count = max((count for _, count in pairs), default=1)
+    return DynamicArray([key for key, count in pairs if count == max_count]), max_count
+
+
+def _count_items(counts: HashMap, items) -> HashMap:
+    """
+    Adds one to the count of every item in counts and returns counts
+
+    Input: Counts (HashMap), Items (iterable)
+    Output: Counts (HashMap)
+    """
+    for item in items:
+        counts.increment(item)
+    return counts
+
+
+def _read_lines(path, start: int, end: int) -> list:
+    """
+    Returns the lines between two byte offsets of a memory-mapped text file
+
+    Input: Path (string), Start offset (int), End offset (int)
+    Output: Lines (list)
+    """
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        lines = data[start:end].decode('utf-8').split('\n')
+
+    # Every range ends just after a newline or at the end of the file
+    if lines[-1] == '':
+        lines.pop()
+    return lines
+
+
+def _count_chunk(task) -> DynamicArray:
+    """
+    Counts a chunk of items, or the lines of a byte range of a file, in a HashMap and
+    returns its key/count pairs; runs in a worker process
+
+    Input: Task (tuple of items and hash function, or of path, start offset, end offset and hash function)
+    Output: Array (DynamicArray)
+    """
+    if len(task) == 4:
+        path, start, end, function = task
+        items = _read_lines(path, start, end)
+    else:
+        items, function = task
+
+    return _count_items(HashMap(11, function), items).get_keys_and_values()
+
+
+def _line_ranges(path, chunks: int) -> list:
+    """
+    Returns up to given number of (start, end) byte ranges that split a file at line boundaries
+
+    Input: Path (string), Number of chunks (int)
+    Output: Ranges (list)
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+
+    bounds = [0]
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        for i in range(1, chunks):
+            newline = data.find(b'\n', max(bounds[-1], size * i // chunks))
+            if newline == -1 or newline + 1 >= size:
+                break
+            bounds.append(newline + 1)
+
+    bounds.append(size)
+    return list(zip(bounds, bounds[1:]))
+
+
+def _can_pickle(function) -> bool:
+    """
+    Returns True if function can be sent to a worker process, which closures
+    such as the hash functions seeded_hash_function returns cannot
+
+    Input: Function
+    Output: Boolean
+    """
+    try:
+        pickle.dumps(function)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+    return True
+
+
+def find_mode_parallel(source=None, workers: int = None, chunk_size: int = None, function=hash_function_1,
+                       serial_threshold: int = 200_000, path=None) -> (DynamicArray, int):
+    """
+    Returns a tuple of a dynamic array with the mode value(s) and highest count, like find_mode,
+    counting chunks of the input in worker processes
+
+    Source is a DynamicArray or any sequence; alternatively path names a text file with one item
+    per line that workers memory-map and read by byte range. Each worker counts its chunk in its own
+    HashMap and the partial counts are merged into one HashMap as they arrive. There is at most one
+    worker per CPU and by default two chunks per worker, but at least serial_threshold items
+    (or bytes of a file) per chunk; inputs that do not fill two chunks, and inputs whose hash
+    function cannot be pickled to a worker, are counted in this process
+
+    Input: Source (DynamicArray or sequence), Number of workers (int), Chunk size (int),
+           Hash function, Serial threshold (int), Path (string)
+    Output: Tuple (DynamicArray, int)
+    """
+    if (source is None) == (path is None):
+        raise ValueError("pass exactly one of source and path")
+
+    # Workers beyond the CPU count only add start up and merging costs
+    cpus = os.cpu_count() or 1
+    workers = cpus if workers is None else min(workers, cpus)
+
+    is_file = path is not None
+    items = None if is_file else as_list(source)
+    size = os.path.getsize(path) if is_file else len(items)
+    counts = HashMap(11, function)
+
+    # No modes, return the input like find_mode does
+    if size == 0:
+        return (source if isinstance(source, DynamicArray) else DynamicArray(items)), 1
+
+    # Process start up and merging only pay off when at least two workers get a full chunk
+    if workers < 2 or size < 2 * serial_threshold or not _can_pickle(function):
+        if not is_file:
+            return _modes_of(_count_items(counts, items))
+
+        # Large files are still read one range at a time
+        for start, end in _line_ranges(path, math.ceil(size / serial_threshold)):
+            _count_items(counts, _read_lines(path, start, end))
+        return _modes_of(counts)
+
+    if chunk_size is None:
+        chunk_size = max(serial_threshold, math.ceil(size / (2 * workers)))
+
+    if is_file:
+        tasks = [(path, start, end, function) for start, end in _line_ranges(path, math.ceil(size / chunk_size))]
+    else:
+        tasks = [(items[start:start + chunk_size], function) for start in range(0, size, chunk_size)]
+
+    with multiprocessing.Pool(min(workers, len(tasks))) as pool:
+        for partial_counts in pool.imap_unordered(_count_chunk, tasks):
+            counts.merge(partial_counts, operator.add)
+
+    return _modes_of(counts)
+
+
+class CountMinSketch:
+    """
+    Count-Min sketch: depth rows of width counters. Every item adds to one counter per row and its
+    estimate is the smallest of them, which never undercounts and, with probability 1 - e ** -depth,
+    overcounts by at most e / width times the total count
+    """
+
+    def __init__(self, width: int, depth: int = 4, function=None) -> None:
+        """
+        Initialize new sketch; unless a hash function is given, rows are indexed by
+        Python's hash of the item paired with a random seed
+        """
+        if function is None:
+            seed = random.getrandbits(64)
+            function = lambda item: hash((seed, item))
+
+        self._width = width
+        self._depth = depth
+        self._function = function
+        self._counts = array('Q', [0]) * (width * depth)
+        self._total = 0
+
+    def _indexes(self, item) -> list:
+        """
+        Returns the counter index of item in every row, derived from a single hash
+
+        Input: Item (object)
+        Output: Indexes (list)
+        """
+        hash_value = self._function(item)
+        first, step = hash_value & 0xFFFFFFFF, (hash_value >> 32) | 1
+        width = self._width
+        return [row * width + (first + row * step) % width for row in range(self._depth)]
+
+    def add(self, item, count: int = 1) -> None:
+        """
+        Adds count occurrences of item
+        Only counters that hold the current estimate are raised (conservative update)
+
+        Input: Item (object), Count (int)
+        """
+        counts = self._counts
+        indexes = self._indexes(item)
+        estimate = min(counts[index] for index in indexes) + count
+
+        for index in indexes:
+            if counts[index] < estimate:
+                counts[index] = estimate
+
+        self._total += count
+
+    def estimate(self, item) -> int:
+        """
+        Returns an upper bound of the number of occurrences of item
+
+        Input: Item (object)
+        Output: Count (int)
+        """
+        counts = self._counts
+        return min(counts[index] for index in self._indexes(item))
+
+    def error_bound(self) -> int:
+        """
+        Returns the overcount that an estimate exceeds with probability at most e ** -depth
+
+        Output: Count (int)
+        """
+        return math.ceil(math.e / self._width * self._total)
+
+
+def find_mode_stream(iterable, k: int = 1, max_counters: int = None, depth: int = 4,
+                     function=hash_function_1) -> DynamicArray:
+    """
+    Returns dynamic array of up to k (item, count, error) tuples for the most frequent items
+    of iterable, highest count first; the true count of each item is between count - error and count
+
+    Items are consumed one at a time. Without max_counters every distinct item is counted exactly
+    and error is 0. With max_counters the memory used stays fixed whatever the number of distinct
+    items: half of the counters are Misra-Gries candidates in a HashMap, which are guaranteed to
+    include every item occurring more than n / (candidates + 1) times, and the other half form
+    a Count-Min sketch that tightens the upper bound of every candidate
+
+    Input: Items (iterable), Number of items (int), Counter budget (int), Sketch depth (int),
+           Hash function
+    Output: Array (DynamicArray)
+    """
+    if max_counters is None:
+        counts = HashMap(11, function)
+        for item in iterable:
+            counts.increment(item)
+
+        top = heapq.nlargest(k, as_list(counts.get_keys_and_values()), key=lambda pair: pair[1])
+        return DynamicArray([(item, count, 0) for item, count in top])
+
+    candidates = max(1, max_counters // 2)
+    sketch = CountMinSketch(max(1, (max_counters - candidates) // depth), depth)
+    counters = HashMap(candidates + 1, function)
+    decrements = 0
+
+    for item in iterable:
+        sketch.add(item)
+
+        if counters.get_size() < candidates:
+            counters.increment(item)
+            continue
+
+        node = counters.get_node(item)
+        if node is not None:
+            node.value += 1
+
+        # No free counter: the new item and one occurrence of every candidate cancel out
+        else:
+            decrements += 1
+            for key, count in as_list(counters.get_keys_and_values()):
+                if count == 1:
+                    counters.remove(key)
+                else:
+                    counters.increment(key, -1)
+
+    # A candidate lost at most one occurrence per decrement, and the sketch never undercounts
+    result = []
+    for item, lower in as_list(counters.get_keys_and_values()):
+        upper = min(lower + decrements, sketch.estimate(item))
+        result.append((item, upper, upper - lower))
+
+    return DynamicArray(heapq.nlargest(k, result, key=lambda entry: entry[1]))
+
+
 # ------------------- BASIC TESTING ---------------------------------------- #
 
 if __name__ == "__main__":
@@ -504,3 +1973,161 @@ if __name__ == "__main__":
         da = DynamicArray(case)
         mode, frequency = find_mode(da)
         print(f"Input: {da}\nMode : {mode}, Frequency: {frequency}\n")
+
+    print("\nfind_mode_parallel example 1")
+    print("----------------------------")
+    for case in test_cases:
+        mode, frequency = find_mode_parallel(DynamicArray(case), workers=2)
+        print(f"Mode : {mode}, Frequency: {frequency}")
+
+    print("\nfind_mode_stream example 1")
+    print("--------------------------")
+    stream = (str(i % 7) if i % 3 else 'hot' for i in range(3000))
+    print(find_mode_stream(stream, 3))
+    stream = (str(i % 7) if i % 3 else 'hot' for i in range(3000))
+    item, count, error = find_mode_stream(stream, 1, max_counters=8)[0]
+    print(item, count - error <= 1000 <= count)
+
+    print("\nincremental resize example 1")
+    print("-----------------------------")
+    m = HashMap(11, hash_function_1, incremental_resize=True, rehash_step=2)
+    for i in range(50):
+        m.put('key' + str(i), i * 10)
+        if i % 10 == 9:
+            result = all(m.get('key' + str(j)) == j * 10 for j in range(i + 1))
+            print(result, m.get_size(), m.get_capacity(), round(m.table_load(), 2))
+
+    print("\nfrom_items / put_many example 1")
+    print("--------------------------------")
+    m = HashMap.from_items((('key' + str(i), i) for i in range(30)), function=hash_function_1)
+    print(m.get_size(), m.get_capacity(), m.get('key7'))
+    m.put_many(DynamicArray([('key' + str(i), -i) for i in range(20, 60)]))
+    print(m.get_size(), m.get_capacity(), m.get('key7'), m.get('key25'), m.get('key59'))
+
+    print("\nget_many / contains_many / remove_many example 1")
+    print("-------------------------------------------------")
+    m = HashMap(53, hash_function_2)
+    for i in range(20):
+        m.put('key' + str(i), i * 10)
+    keys = DynamicArray(['key3', 'missing', 'key19', 'key3'])
+    print(m.get_many(keys), m.contains_many(keys))
+    m.remove_many(['key3', 'key4', 'missing', 'key3'])
+    print(m.get_many(keys), m.get_size())
+
+    print("\nincrement / setdefault / update_with / pop example 1")
+    print("----------------------------------------------------")
+    m = HashMap(11, hash_function_2)
+    for word in ['apple', 'grape', 'apple', 'melon', 'apple']:
+        m.increment(word)
+    print(m.get('apple'), m.increment('grape', 10), m.setdefault('peach', 0), m.setdefault('apple', 0))
+    print(m.update_with('melon', lambda count: count * 100), m.update_with('plum', len, 'abc'))
+    print(m.pop('apple'), m.pop('apple', 'gone'), m.get_size())
+
+    print("\nConcurrentHashMap example 1")
+    print("---------------------------")
+    m = ConcurrentHashMap(11, hash_function_1, stripes=4)
+
+    def count_words(thread: int) -> None:
+        for i in range(500):
+            m.increment('total')
+            m.put('t' + str(thread) + '-' + str(i), i)
+
+    threads = [threading.Thread(target=count_words, args=(thread,)) for thread in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    print(m.get('total'), m.get_size(), m.get_capacity(), m.get('t3-499'), m.contains_key('t4-0'))
+    m.remove('total')
+    print(m.pop('t0-0'), m.pop('t0-0', 'gone'), m.get_size(), sum(1 for _ in m))
+
+    print("\nseeded hash function example 1")
+    print("-------------------------------")
+    for function in (hash_function_1, seeded_hash_function(murmur_hash, seed=42)):
+        m = HashMap(53, function)
+        for i in range(150):
+            m.put('key' + str(i), i * 100)
+        print(function.__name__, m.empty_buckets(), m.get_size(), m.get_capacity(), m.chain_length_stats())
+
+    print("\ntreeified chain example 1")
+    print("--------------------------")
+    m = HashMap(5, hash_function_1)
+    for key in ('abc', 'acb', 'bac', 'bca', 'cab', 'cba', 'aad', 'ada', 'daa', 'dd'):
+        m.put(key, key.upper())
+    print(m)
+    for key in ('abc', 'acb', 'bac', 'bca', 'aad'):
+        m.remove(key)
+    print(m)
+    print(m.get('cba'), m.get('ada'), m.contains_key('abc'), m.get_size(), m.chain_length_stats())
+
+    print("\nLRUCache / LFUCache example 1")
+    print("------------------------------")
+    now = [0.0]
+    for cache in (LRUCache(3, ttl=10, clock=lambda: now[0]), LFUCache(3, clock=lambda: now[0])):
+        for key in ('a', 'b', 'c'):
+            cache.put(key, key.upper())
+        cache.get('a')
+        cache.get('a')
+        cache.get('b')
+        cache.put('d', 'D')
+        cache.put('e', 'E', ttl=1)
+        now[0] += 5
+        print(type(cache).__name__, cache.get_keys_and_values(), cache.get('e'), cache.get('c'))
+        print(cache.hits, cache.misses, cache.evictions, cache.expirations, round(cache.hit_rate(), 2))
+
+    print("\nBloom filter example 1")
+    print("----------------------")
+    m = HashMap(53, hash_function_1, bloom_filter=True)
+    for i in range(20):
+        m.put('key' + str(i), i)
+    print(m.get('key7'), m.get('yek7'), m.contains_key('missing'), m.get_size())
+    for i in range(15):
+        m.remove('key' + str(i))
+    print(m.contains_key('key3'), m.get('key17'), m.get_size(), m.bloom_filter_stats()[0])
+
+    print("\nsave / open example 1")
+    print("---------------------")
+    import tempfile
+    with tempfile.TemporaryDirectory() as directory:
+        path = directory + '/map.hmap'
+        m = HashMap.from_items((('key' + str(i), i * 10) for i in range(20)), function=hash_function_2)
+        m.put('key3', [3, 'three'])
+        m.save(path)
+        # The list was pickled, reading it back needs allow_pickle since this file is trusted
+        mapped = HashMap.open(path, hash_function_2, allow_pickle=True)
+        print(mapped.get_size(), mapped.get_capacity(), mapped.get('key3'), mapped.get('key7'))
+        mapped.remove('key0')
+        mapped.put('key20', 200)
+        print(mapped.get_size(), mapped.get('key0'), mapped.get('key20'))
+        mapped.close()
+        # Changes stay in memory, the file still holds the saved map
+        mapped = HashMap.open(path, hash_function_2)
+        print(mapped.get_size(), mapped.get('key0'), mapped.get('key20'))
+        mapped.close()
+        m = HashMap.open(path, hash_function_2, mmap=False, allow_pickle=True)
+        print(type(m).__name__, m.get_size(), m.get('key19'))
+
+    print("\nfreeze example 1")
+    print("----------------")
+    m = HashMap(11, hash_function_1)
+    for i in range(25):
+        m.put('str' + str(i), i * 100)
+    frozen = m.freeze()
+    print(frozen.get_size(), frozen.get_capacity(), frozen.table_load())
+    print(frozen.get('str7'), frozen.get('str24'), frozen.get('str25'), frozen.contains_key('str0'))
+    with tempfile.TemporaryDirectory() as directory:
+        frozen.save(directory + '/map.frozen')
+        frozen = FrozenHashMap.open(directory + '/map.frozen')
+    print(frozen.get_size(), frozen.get('str7'), sum(entry.value for entry in frozen))
+
+    print("\nshrink example 1")
+    print("----------------")
+    m = HashMap(11, hash_function_1, shrink_threshold=0.2)
+    for i in range(200):
+        m.put('str' + str(i), i)
+    print(m.get_size(), m.get_capacity(), m.empty_buckets())
+    for i in range(190):
+        m.remove('str' + str(i))
+    print(m.get_size(), m.get_capacity(), m.empty_buckets(), m.get('str195'))
+    m.shrink_to_fit()
+    print(m.get_size(), m.get_capacity(), m.empty_buckets(), m.get('str195'))
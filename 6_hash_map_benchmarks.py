@@ -0,0 +1,925 @@
+# Name: Daniel Kim
+# Description: Benchmarks for the open addressing and separate chaining HashMap implementations
+#
+# Usage: python hash_map_benchmarks.py [benchmark name ...]
+# Runs every benchmark when no name is given
+
+import functools
+import gc
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import sys
+import time
+import tracemalloc
+
+from a6_include import (DynamicArray, hash_function_1, hash_function_2, fnv1a_hash, murmur_hash, siphash,
+                        seeded_hash_function)
+from hash_map_OA import (HashMap as OAHashMap, PackedHashMap, RobinHoodHashMap, SwissHashMap, SharedHashMap,
+                         OrderedHashMap, PROBING_STRATEGIES)
+import hash_map_SC
+from hash_map_SC import (HashMap as SCHashMap, ConcurrentHashMap, LRUCache, LFUCache, find_mode, find_mode_parallel,
+                         find_mode_stream)
+
+
+def time_per_call(function, keys: list) -> float:
+    """
+    Returns average time in microseconds of calling function once for every key
+
+    Input: Function (callable), Keys (list)
+    Output: Time per call (float)
+    """
+    start = time.perf_counter()
+    for key in keys:
+        function(key)
+    return (time.perf_counter() - start) / len(keys) * 1e6
+
+
+def bench_oa_lookup(sizes=(1_000, 10_000, 100_000, 1_000_000), lookups: int = 10_000) -> None:
+    """
+    Prints cost of OA get / contains_key hits and misses as the map grows
+
+    Uses Python's built-in hash so the keys spread over the whole table and
+    the numbers reflect the probe sequence rather than a poor hash function
+    """
+    print("\nOA lookup cost (us per call)")
+    print(f"{'size':>10} {'capacity':>10} {'get hit':>10} {'get miss':>10} {'contains':>10}")
+
+    for size in sizes:
+        m = OAHashMap(11, hash)
+        for i in range(size):
+            m.put('key' + str(i), i)
+
+        step = max(1, size // lookups)
+        hits = ['key' + str(i) for i in range(0, size, step)]
+        misses = ['miss' + str(i) for i in range(0, size, step)]
+
+        get_hit = time_per_call(m.get, hits)
+        get_miss = time_per_call(m.get, misses)
+        contains = time_per_call(m.contains_key, hits)
+        print(f"{size:>10} {m.get_capacity():>10} {get_hit:>10.2f} {get_miss:>10.2f} {contains:>10.2f}")
+
+
+def bench_sc_resize(sizes=(10_000, 100_000, 1_000_000)) -> None:
+    """
+    Prints time taken by a single SC resize_table call that doubles the capacity
+    """
+    print("\nSC resize_table cost")
+    print(f"{'size':>10} {'capacity':>10} {'ms':>10} {'us / node':>10}")
+
+    for size in sizes:
+        m = SCHashMap(11, hash)
+        for i in range(size):
+            m.put('key' + str(i), i)
+
+        capacity = m.get_capacity()
+        start = time.perf_counter()
+        m.resize_table(capacity * 2)
+        elapsed = time.perf_counter() - start
+        print(f"{size:>10} {capacity:>10} {elapsed * 1e3:>10.1f} {elapsed / size * 1e6:>10.2f}")
+
+
+def put_latencies(m, keys: list) -> list:
+    """
+    Returns sorted list of nanoseconds taken by each put call
+    The garbage collector is paused so its pauses are not attributed to put
+
+    Input: Map (HashMap), Keys (list)
+    Output: Latencies (list)
+    """
+    clock = time.perf_counter_ns
+    latencies = []
+    gc.disable()
+    try:
+        for key in keys:
+            start = clock()
+            m.put(key, key)
+            latencies.append(clock() - start)
+    finally:
+        gc.enable()
+    latencies.sort()
+    return latencies
+
+
+def bench_put_latency(size: int = 500_000) -> None:
+    """
+    Prints put latency percentiles with synchronous and incremental resizing for both maps
+    """
+    print(f"\nput latency over {size} inserts (us)")
+    print(f"{'map':>18} {'p50':>8} {'p99':>8} {'p99.9':>8} {'p99.99':>8} {'max':>10}")
+
+    keys = ['key' + str(i) for i in range(size)]
+    for name, map_class in (('OA', OAHashMap), ('SC', SCHashMap)):
+        for incremental in (False, True):
+            m = map_class(11, hash, incremental_resize=incremental)
+            latencies = put_latencies(m, keys)
+            row = [latencies[int(len(latencies) * q)] / 1e3 for q in (0.5, 0.99, 0.999, 0.9999)]
+            label = name + (' incremental' if incremental else ' synchronous')
+            print(f"{label:>18} {row[0]:>8.2f} {row[1]:>8.2f} {row[2]:>8.2f} {row[3]:>8.2f} "
+                  f"{latencies[-1] / 1e3:>10.1f}")
+
+
+def traced_bytes(build) -> int:
+    """
+    Returns number of bytes still allocated after calling build, whose result is kept alive
+
+    Input: Build function (callable)
+    Output: Bytes (int)
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del result
+    return allocated
+
+
+def bench_oa_memory(sizes=(10_000, 100_000, 1_000_000)) -> None:
+    """
+    Prints memory per entry of the HashEntry and parallel array OA backends
+    Keys and values are created up front so only the map's own structures are counted
+    """
+    print("\nOA memory per entry (bytes)")
+    print(f"{'size':>10} {'capacity':>10} {'HashMap':>10} {'Packed':>10} {'ratio':>8}")
+
+    for size in sizes:
+        keys = ['key' + str(i) for i in range(size)]
+        values = list(range(size))
+
+        def build(map_class):
+            m = map_class(11, hash)
+            for i in range(size):
+                m.put(keys[i], values[i])
+            return m
+
+        entry_bytes = traced_bytes(lambda: build(OAHashMap)) / size
+        packed_bytes = traced_bytes(lambda: build(PackedHashMap)) / size
+        capacity = build(PackedHashMap).get_capacity()
+        print(f"{size:>10} {capacity:>10} {entry_bytes:>10.1f} {packed_bytes:>10.1f} "
+              f"{entry_bytes / packed_bytes:>8.2f}")
+
+
+def bench_robin_hood(size: int = 200_000, lookups: int = 20_000) -> None:
+    """
+    Prints hit / miss cost and probe distances of RobinHoodHashMap at increasing
+    load factors next to the quadratic probing HashMap, which stays below 0.5
+    """
+    print(f"\nRobin Hood vs quadratic probing, {size} keys (us per call)")
+    print(f"{'map':>18} {'load':>6} {'hit':>8} {'miss':>8} {'avg dist':>9} {'max dist':>9}")
+
+    keys = ['key' + str(i) for i in range(size)]
+    hits = keys[::max(1, size // lookups)]
+    misses = ['miss' + str(i) for i in range(len(hits))]
+
+    m = OAHashMap(11, hash)
+    for key in keys:
+        m.put(key, key)
+    print(f"{'quadratic':>18} {m.table_load():>6.2f} {time_per_call(m.get, hits):>8.2f} "
+          f"{time_per_call(m.get, misses):>8.2f} {'-':>9} {'-':>9}")
+
+    for load_factor in (0.5, 0.7, 0.8, 0.9):
+        m = RobinHoodHashMap(11, hash, max_load_factor=0.95)
+        for key in keys:
+            m.put(key, key)
+        m.resize_table(int(size / load_factor))
+
+        average, longest = m.probe_length_stats()
+        print(f"{'robin hood':>18} {m.table_load():>6.2f} {time_per_call(m.get, hits):>8.2f} "
+              f"{time_per_call(m.get, misses):>8.2f} {average:>9.2f} {longest:>9}")
+
+
+class CountedKey(str):
+    """
+    String key that counts how many times it is compared for equality
+    """
+    comparisons = 0
+
+    def __eq__(self, other) -> bool:
+        CountedKey.comparisons += 1
+        return str.__eq__(self, other)
+
+    __hash__ = str.__hash__
+
+
+def bench_swiss(size: int = 200_000, swiss_capacity: int = 2 ** 18, lookups: int = 20_000) -> None:
+    """
+    Prints lookup cost and key comparisons per lookup of SwissHashMap at increasing
+    load factors of a fixed capacity next to the quadratic probing OA map and the SC map
+    """
+    print(f"\nSwiss table vs OA and SC")
+    print(f"{'map':>12} {'size':>8} {'load':>6} {'hit us':>8} {'miss us':>8} {'hit cmp':>8} {'miss cmp':>9}")
+
+    keys = [CountedKey('key' + str(i)) for i in range(max(size, swiss_capacity))]
+    misses = [CountedKey('miss' + str(i)) for i in range(lookups)]
+
+    def report(name, m, count):
+        hits = [CountedKey(key) for key in keys[:count:max(1, count // lookups)]]
+        row = []
+        for queries in (hits, misses):
+            CountedKey.comparisons = 0
+            row.append(time_per_call(m.get, queries))
+            row.append(CountedKey.comparisons / len(queries))
+        print(f"{name:>12} {count:>8} {m.table_load():>6.2f} {row[0]:>8.2f} {row[2]:>8.2f} "
+              f"{row[1]:>8.2f} {row[3]:>9.2f}")
+
+    for name, map_class in (('OA', OAHashMap), ('SC', SCHashMap)):
+        m = map_class(11, hash)
+        for key in keys[:size]:
+            m.put(key, key)
+        report(name, m, size)
+
+    for load_factor in (0.5, 0.75, 0.875):
+        count = int(swiss_capacity * load_factor)
+        m = SwissHashMap(swiss_capacity, hash, max_load_factor=load_factor)
+        for key in keys[:count]:
+            m.put(key, key)
+        report('swiss', m, count)
+
+def bench_probing(workloads=(('hash', hash, 100_000), ('hash_function_2', hash_function_2, 5_000)),
+                  lookups: int = 10_000) -> None:
+    """
+    Prints put / get cost and probe lengths of every OA probing strategy for each
+    workload of hash function and number of keys
+    """
+    print("\nOA probing strategies (us per call)")
+    print(f"{'hash':>16} {'probing':>10} {'size':>8} {'put':>8} {'hit':>8} {'miss':>8} "
+          f"{'avg probes':>11} {'max probes':>11}")
+
+    for name, function, size in workloads:
+        keys = ['key' + str(i) for i in range(size)]
+        hits = keys[::max(1, size // lookups)]
+        misses = ['miss' + str(i) for i in range(len(hits))]
+
+        for probing in PROBING_STRATEGIES:
+            m = OAHashMap(11, function, probing=probing)
+            put = time_per_call(lambda key: m.put(key, key), keys)
+            average, longest = m.probe_length_stats()
+            print(f"{name:>16} {probing:>10} {size:>8} {put:>8.2f} {time_per_call(m.get, hits):>8.2f} "
+                  f"{time_per_call(m.get, misses):>8.2f} {average:>11.2f} {longest:>11}")
+
+
+def bench_long_key_resize(size: int = 50_000, key_length: int = 100) -> None:
+    """
+    Prints time taken by a single resize_table call of both maps with long keys
+    hashed by hash_function_2, where hashing dominates the cost of a rehash
+    """
+    print(f"\nresize_table with {key_length} character keys, hash_function_2")
+    print(f"{'map':>6} {'size':>8} {'ms':>10} {'us / key':>10}")
+
+    prefix = 'https://example.com/' + 'x' * (key_length - 30)
+    keys = [prefix + str(i).zfill(10) for i in range(size)]
+
+    for name, map_class in (('OA', OAHashMap), ('SC', SCHashMap)):
+        m = map_class(11, hash_function_2)
+        for key in keys:
+            m.put(key, key)
+
+        start = time.perf_counter()
+        m.resize_table(m.get_capacity() * 2)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>6} {size:>8} {elapsed * 1e3:>10.1f} {elapsed / size * 1e6:>10.2f}")
+
+
+def hash_distribution_report(keys: list, functions: dict) -> None:
+    """
+    Runs a key corpus through every hash function and both maps, printing for each function:
+    distinct full hash values, time per hash, OA average / maximum extra probes and
+    SC average non-empty chain / longest chain
+
+    Input: Keys (list), Functions (dict of name to one-argument hash function)
+    """
+    print(f"{'function':>16} {'distinct':>9} {'us/hash':>8} {'OA avg':>8} {'OA max':>7} "
+          f"{'SC avg':>8} {'SC max':>7}")
+
+    for name, function in functions.items():
+        distinct = len(set(function(key) for key in keys))
+        hash_time = time_per_call(function, keys)
+
+        oa_map, sc_map = OAHashMap(11, function), SCHashMap(11, function)
+        for key in keys:
+            oa_map.put(key, key)
+            sc_map.put(key, key)
+
+        oa_average, oa_longest = oa_map.probe_length_stats()
+        sc_average, sc_longest = sc_map.chain_length_stats()
+        print(f"{name:>16} {distinct:>9} {hash_time:>8.2f} {oa_average:>8.2f} {oa_longest:>7} "
+              f"{sc_average:>8.2f} {sc_longest:>7}")
+
+
+def bench_hash_distribution(size: int = 20_000) -> None:
+    """
+    Prints hash_distribution_report for sequential keys, anagrams and URL-like keys
+    """
+    functions = {
+        'hash_function_1': hash_function_1,
+        'hash_function_2': hash_function_2,
+        'fnv1a_hash': seeded_hash_function(fnv1a_hash),
+        'murmur_hash': seeded_hash_function(murmur_hash),
+        'siphash': seeded_hash_function(siphash),
+    }
+
+    letters = 'abcdefgh'
+    corpora = {
+        'sequential': ['key' + str(i) for i in range(size)],
+        'anagrams': [''.join(letters[(i >> (3 * j)) % 8] for j in range(8)) for i in range(size)],
+        'urls': ['https://example.com/users/' + str(i * 7919) + '/items?id=' + str(i) for i in range(size)],
+    }
+
+    for corpus, keys in corpora.items():
+        print(f"\nhash distribution, {len(keys)} {corpus} keys")
+        hash_distribution_report(keys, functions)
+
+
+def bench_bulk_build(size: int = 200_000) -> None:
+    """
+    Prints time taken to build every map from size pairs with a put loop and with from_items
+    """
+    print(f"\nbuilding a map from {size} pairs (ms)")
+    print(f"{'map':>18} {'put loop':>10} {'from_items':>11} {'capacity':>10}")
+
+    items = [('key' + str(i), i) for i in range(size)]
+    for name, map_class in (('OA', OAHashMap), ('OA packed', PackedHashMap),
+                            ('OA robin hood', RobinHoodHashMap), ('SC', SCHashMap)):
+        start = time.perf_counter()
+        m = map_class(11, hash)
+        for key, value in items:
+            m.put(key, value)
+        loop = time.perf_counter() - start
+
+        start = time.perf_counter()
+        m = map_class.from_items(items, function=hash)
+        bulk = time.perf_counter() - start
+        print(f"{name:>18} {loop * 1e3:>10.1f} {bulk * 1e3:>11.1f} {m.get_capacity():>10}")
+
+
+def bench_get_many(workloads=(('hash_function_2', hash_function_2, 5_000), ('hash', hash, 100_000)),
+                   batch_sizes=(10, 100, 1_000), lookups: int = 20_000) -> None:
+    """
+    Prints cost per key of get_many compared to a loop of single get calls; half of the
+    looked up keys are missing. hash_function_2 is vectorised with NumPy when available,
+    so it runs on a smaller map where its clustering does not dominate the lookups
+    """
+    print("\nget_many vs get loop (us per key)")
+    print(f"{'map':>16} {'function':>16} {'size':>8} {'batch':>6} {'get loop':>9} {'get_many':>9}")
+
+    maps = (('OA', OAHashMap), ('OA packed', PackedHashMap), ('OA robin hood', RobinHoodHashMap),
+            ('OA swiss', SwissHashMap), ('SC', SCHashMap))
+    for function_name, function, size in workloads:
+        items = [('key' + str(i), i) for i in range(size)]
+        for name, map_class in maps:
+            m = map_class.from_items(items, function=function)
+
+            for batch_size in batch_sizes:
+                batches = [['key' + str((i * 7919 + j) % (2 * size)) for j in range(batch_size)]
+                           for i in range(max(1, lookups // batch_size))]
+                count = len(batches) * batch_size
+
+                start = time.perf_counter()
+                for batch in batches:
+                    [m.get(key) for key in batch]
+                loop = (time.perf_counter() - start) / count * 1e6
+
+                start = time.perf_counter()
+                for batch in batches:
+                    m.get_many(batch)
+                bulk = (time.perf_counter() - start) / count * 1e6
+                print(f"{name:>16} {function_name:>16} {size:>8} {batch_size:>6} {loop:>9.2f} {bulk:>9.2f}")
+
+
+def count_with_lookups(words: list) -> SCHashMap:
+    """
+    Counts words the way find_mode used to: contains_key, then get_node or put
+
+    Input: Words (list)
+    Output: Counts (HashMap)
+    """
+    m = SCHashMap(11, hash_function_1)
+    for word in words:
+        if m.contains_key(word) is False:
+            m.put(word, 1)
+        else:
+            m.get_node(word).value += 1
+    return m
+
+
+def count_with_increment(words: list) -> SCHashMap:
+    """
+    Counts words with a single increment call per word
+
+    Input: Words (list)
+    Output: Counts (HashMap)
+    """
+    m = SCHashMap(11, hash_function_1)
+    for word in words:
+        m.increment(word)
+    return m
+
+
+def bench_counting(size: int = 200_000, distinct: int = 5_000) -> None:
+    """
+    Prints time taken to count words in the SC map with lookups and with increment,
+    to run find_mode, and to remove every key with remove and with pop
+    """
+    print(f"\ncounting {size} words, {distinct} distinct, hash_function_1 (ms)")
+    words = ['word' + str(i * 7919 % distinct) for i in range(size)]
+
+    for name, count in (('contains_key / get_node / put', count_with_lookups), ('increment', count_with_increment)):
+        start = time.perf_counter()
+        count(words)
+        print(f"{name:>30} {(time.perf_counter() - start) * 1e3:>10.1f}")
+
+    da = DynamicArray(words)
+    start = time.perf_counter()
+    find_mode(da)
+    print(f"{'find_mode':>30} {(time.perf_counter() - start) * 1e3:>10.1f}")
+
+    for name in ('remove', 'pop'):
+        m = count_with_increment(words)
+        delete = getattr(m, name)
+        start = time.perf_counter()
+        for i in range(distinct):
+            delete('word' + str(i))
+        print(f"{name + ' every key':>30} {(time.perf_counter() - start) * 1e3:>10.1f}")
+
+
+def bench_find_mode_stream(size: int = 500_000, distinct: int = 200_000, k: int = 10,
+                           budgets=(1_024, 4_096)) -> None:
+    """
+    Prints time, peak traced memory and top-k accuracy of find_mode_stream, exact and with
+    counter budgets, on a Zipf-like stream with many distinct items; items are hashed by Python's
+    built-in hash since hash_function_1 maps 'item' + digits keys to a few dozen buckets
+    """
+    print(f"\nfind_mode_stream over {size} items drawn from {distinct}, top {k}")
+    print(f"{'counters':>10} {'s':>8} {'peak MB':>9} {'top-k hits':>11} {'max error':>10}")
+
+    rng = random.Random(14)
+    items = ['item' + str(int(distinct ** rng.random())) for _ in range(size)]
+
+    exact = None
+    for budget in (None,) + tuple(budgets):
+        gc.collect()
+        tracemalloc.start()
+        start = time.perf_counter()
+        top = find_mode_stream(iter(items), k, max_counters=budget, function=hash)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        top = [top[i] for i in range(top.length())]
+        if exact is None:
+            exact = {item for item, _, _ in top}
+        hits = sum(1 for item, _, _ in top if item in exact)
+        print(f"{budget or 'exact':>10} {elapsed:>8.2f} {peak / 2 ** 20:>9.1f} {hits:>11} "
+              f"{max(error for _, _, error in top):>10}")
+
+
+def bench_find_mode_parallel(size: int = 2_000_000, distinct: int = 50_000, worker_counts=(1, 2, 4)) -> None:
+    """
+    Prints time taken by find_mode_parallel over a list and over a file with one item per line
+    for every worker count, one worker being the serial path; the CPU count bounds any speed up.
+    Items are hashed by Python's built-in hash since hash_function_1 maps 'item' + digits keys
+    to a few dozen buckets
+    """
+    print(f"\nfind_mode_parallel over {size} items, {distinct} distinct, {os.cpu_count()} CPUs (s)")
+    print(f"{'workers':>8} {'list':>8} {'file':>8}")
+
+    items = ['item' + str(i * 7919 % distinct) for i in range(size)]
+    with tempfile.NamedTemporaryFile('w', suffix='.txt', delete=False) as file:
+        file.write('\n'.join(items))
+
+    try:
+        for workers in worker_counts:
+            start = time.perf_counter()
+            find_mode_parallel(items, workers, function=hash)
+            in_list = time.perf_counter() - start
+
+            start = time.perf_counter()
+            find_mode_parallel(path=file.name, workers=workers, function=hash)
+            print(f"{workers:>8} {in_list:>8.2f} {time.perf_counter() - start:>8.2f}")
+    finally:
+        os.remove(file.name)
+
+
+class LockedMap:
+    """
+    SC HashMap behind one global lock, the usual way of sharing a map between threads
+    """
+
+    def __init__(self, size: int) -> None:
+        self._map = SCHashMap(size, hash)
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> object:
+        with self._lock:
+            return self._map.get(key)
+
+    def put(self, key: str, value: object) -> None:
+        with self._lock:
+            self._map.put(key, value)
+
+
+def bench_concurrent(size: int = 100_000, operations: int = 400_000, thread_counts=(1, 4, 8)) -> None:
+    """
+    Prints throughput of threads sharing one map, 90% get and 10% put, with a global lock
+    around the SC HashMap and with ConcurrentHashMap
+    """
+    print(f"\nshared map, {operations} operations split over the threads, 90% get / 10% put (k ops / s)")
+    print(f"{'threads':>8} {'global lock':>12} {'concurrent':>11}")
+
+    keys = ['key' + str(i) for i in range(size)]
+    for threads in thread_counts:
+        row = []
+        for m in (LockedMap(size), ConcurrentHashMap(size, hash)):
+            for key in keys:
+                m.put(key, 0)
+
+            def work(seed: int) -> None:
+                rng = random.Random(seed)
+                for _ in range(operations // threads):
+                    key = keys[rng.randrange(size)]
+                    if rng.random() < 0.1:
+                        m.put(key, seed)
+                    else:
+                        m.get(key)
+
+            workers = [threading.Thread(target=work, args=(seed,)) for seed in range(threads)]
+            start = time.perf_counter()
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            row.append(operations / (time.perf_counter() - start) / 1e3)
+
+        print(f"{threads:>8} {row[0]:>12.0f} {row[1]:>11.0f}")
+
+
+def _lookup_worker(name: str, pairs: list, keys: list, results) -> None:
+    """
+    Gets a table ready in a worker process, attaching to the shared map called name
+    or building a PackedHashMap from pairs when name is None, then looks up every key
+    and reports setup time, lookup time and memory allocated in the worker
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    if name is None:
+        m = PackedHashMap.from_items(pairs, len(pairs), fnv1a_hash)
+    else:
+        m = SharedHashMap.attach(name)
+    setup = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for key in keys:
+        m.get(key)
+    lookup = time.perf_counter() - start
+    results.put((setup, lookup, tracemalloc.get_traced_memory()[1]))
+
+    if name is not None:
+        m.close()
+
+
+def bench_shared_map(size: int = 100_000, workers: int = 4, lookups: int = 50_000) -> None:
+    """
+    Prints what it costs each of several worker processes to get a lookup table ready,
+    by rebuilding a PackedHashMap from the pairs or by attaching to one SharedHashMap
+    """
+    print(f"\n{workers} workers each looking up {lookups} keys in a {size} key table")
+    print(f"{'table':>14} {'setup (ms)':>11} {'lookup (us)':>12} {'memory (MB)':>12}")
+
+    pairs = [('key' + str(i), 'value' + str(i)) for i in range(size)]
+    keys = [pairs[i * 7919 % size][0] for i in range(lookups)]
+
+    shared = SharedHashMap.create(4 * size, 40 * size)
+    for key, value in pairs:
+        shared.put(key, value)
+
+    context = multiprocessing.get_context('fork' if 'fork' in multiprocessing.get_all_start_methods() else None)
+    try:
+        for label, name in (('rebuild', None), ('SharedHashMap', shared.name)):
+            results = context.Queue()
+            processes = [context.Process(target=_lookup_worker, args=(name, pairs, keys, results))
+                         for _ in range(workers)]
+            for process in processes:
+                process.start()
+            rows = [results.get() for _ in processes]
+            for process in processes:
+                process.join()
+
+            setup, lookup, memory = (sum(column) / workers for column in zip(*rows))
+            print(f"{label:>14} {setup * 1e3:>11.0f} {lookup / lookups * 1e6:>12.2f} {memory / 2 ** 20:>12.1f}")
+    finally:
+        shared.close()
+        shared.unlink()
+
+
+def bench_snapshot(sizes=(10_000, 100_000, 500_000), lookups: int = 1_000) -> None:
+    """
+    Prints time taken to get a saved map back and serve a few lookups from it:
+    re-putting every pair, loading the snapshot fully and mapping it with open
+    """
+    print(f"\nrestoring a map and looking up {lookups} keys (ms)")
+    print(f"{'size':>8} {'file (MB)':>10} {'save':>8} {'re-put':>8} {'load':>8} {'mmap':>8} {'mmap get':>9}")
+
+    for size in sizes:
+        pairs = [('key' + str(i), 'value' + str(i)) for i in range(size)]
+        keys = [pairs[i * 7919 % size][0] for i in range(lookups)]
+        m = PackedHashMap.from_items(pairs, function=hash)
+
+        with tempfile.NamedTemporaryFile(suffix='.hmap', delete=False) as file:
+            path = file.name
+        try:
+            start = time.perf_counter()
+            m.save(path)
+            save = time.perf_counter() - start
+
+            start = time.perf_counter()
+            PackedHashMap.from_items(pairs, function=hash)
+            reput = time.perf_counter() - start
+
+            start = time.perf_counter()
+            PackedHashMap.open(path, hash, mmap=False)
+            load = time.perf_counter() - start
+
+            start = time.perf_counter()
+            mapped = PackedHashMap.open(path, hash)
+            opened = time.perf_counter() - start
+            start = time.perf_counter()
+            for key in keys:
+                mapped.get(key)
+            lookup = time.perf_counter() - start
+            mapped.close()
+
+            print(f"{size:>8} {os.path.getsize(path) / 2 ** 20:>10.1f} {save * 1e3:>8.0f} {reput * 1e3:>8.0f} "
+                  f"{load * 1e3:>8.0f} {opened * 1e3:>8.2f} {lookup * 1e3:>9.1f}")
+        finally:
+            os.remove(path)
+
+
+def bench_cache(calls: int = 200_000, distinct: int = 20_000, max_entries: int = 1_000) -> None:
+    """
+    Prints time per call and hit rate of a function memoized by functools.lru_cache, LRUCache
+    and LFUCache, for arguments drawn from a skewed (Zipf-like) and a uniform distribution
+    """
+    print(f"\nmemoized function, {calls} calls over {distinct} arguments, {max_entries} entries (us / call, hit rate)")
+    print(f"{'pattern':>8} {'lru_cache':>16} {'LRUCache':>16} {'LFUCache':>16}")
+
+    def slow(n: int) -> int:
+        return n * n
+
+    def memoized(cache):
+        def wrapper(n: int) -> int:
+            value = cache.get(n)
+            if value is None:
+                value = slow(n)
+                cache.put(n, value)
+            return value
+        return wrapper
+
+    rng = random.Random(0)
+    patterns = (('skewed', [int(distinct ** rng.random()) for _ in range(calls)]),
+                ('uniform', [rng.randrange(distinct) for _ in range(calls)]))
+
+    for pattern, arguments in patterns:
+        row = []
+
+        function = functools.lru_cache(max_entries)(slow)
+        elapsed = time_per_call(function, arguments)
+        info = function.cache_info()
+        row.append((elapsed, info.hits / (info.hits + info.misses)))
+
+        for cache_class in (LRUCache, LFUCache):
+            cache = cache_class(max_entries, function=hash)
+            elapsed = time_per_call(memoized(cache), arguments)
+            row.append((elapsed, cache.hit_rate()))
+
+        print(f"{pattern:>8}" + ''.join(f" {elapsed:>9.2f} {rate:>6.1%}" for elapsed, rate in row))
+
+
+def bench_treeify(sizes=(2_000, 10_000, 40_000), lookups: int = 20_000) -> None:
+    """
+    Prints time per get and put of hash_function_1 maps holding sequential keys, whose chains
+    grow long, with long chains turned into TreeBuckets and with plain linked lists only
+    """
+    print("\nSC HashMap with hash_function_1, sequential keys (us / call)")
+    print(f"{'size':>8} {'longest':>8} {'list get':>9} {'tree get':>9} {'list put':>9} {'tree put':>9}")
+
+    for size in sizes:
+        keys = ['key' + str(i) for i in range(size)]
+        probes = [keys[i * 7919 % size] for i in range(lookups)]
+        row = []
+
+        for threshold in (sys.maxsize, hash_map_SC.TREEIFY_THRESHOLD):
+            default, hash_map_SC.TREEIFY_THRESHOLD = hash_map_SC.TREEIFY_THRESHOLD, threshold
+            try:
+                m = SCHashMap(11, hash_function_1)
+                row.append(time_per_call(lambda key: m.put(key, key), keys))
+                row.append(time_per_call(m.get, probes))
+            finally:
+                hash_map_SC.TREEIFY_THRESHOLD = default
+
+        print(f"{size:>8} {m.chain_length_stats()[1]:>8} {row[1]:>9.2f} {row[3]:>9.2f} {row[0]:>9.2f} {row[2]:>9.2f}")
+
+
+def bench_small_maps(maps: int = 10_000, size: int = 100) -> None:
+    """
+    Prints memory held by many small SC maps, the share of their buckets that are empty,
+    and time and memory of clearing them all
+    """
+    print(f"\n{maps} SC maps of {size} keys")
+
+    keys = ['key' + str(i) for i in range(size)]
+    gc.collect()
+    tracemalloc.start()
+    hash_maps = []
+    for _ in range(maps):
+        m = SCHashMap(11, hash)
+        for key in keys:
+            m.put(key, 0)
+        hash_maps.append(m)
+    built = tracemalloc.get_traced_memory()[0]
+    empty = hash_maps[0].empty_buckets() / hash_maps[0].get_capacity()
+
+    start = time.perf_counter()
+    for m in hash_maps:
+        m.clear()
+    cleared = time.perf_counter() - start
+    after_clear = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"memory {built / 2 ** 20:.1f} MB ({built / maps:.0f} bytes per map), "
+          f"{hash_maps[0].get_capacity()} buckets per map, {empty:.0%} of them empty")
+    print(f"clear all {cleared * 1e3:.0f} ms, memory after clear {after_clear / 2 ** 20:.1f} MB")
+
+
+def bench_bloom(size: int = 50_000, lookups: int = 50_000, miss_share: float = 0.9) -> None:
+    """
+    Prints time per get with and without a Bloom filter when most looked up keys are missing,
+    and the filter's memory and false positive rates
+    """
+    print(f"\nget with {miss_share:.0%} missing keys, {size} keys (us / call)")
+    print(f"{'map':>6} {'function':>16} {'plain':>7} {'bloom':>7} {'memory (KB)':>12} {'est. FP':>8} {'FP':>7}")
+
+    keys = ['key' + str(i) for i in range(size)]
+    probes = ['missing' + str(i) if i % 100 < miss_share * 100 else keys[i * 7919 % size] for i in range(lookups)]
+
+    for label, map_class in (('OA', OAHashMap), ('SC', SCHashMap)):
+        for name, function in (('hash_function_2', hash_function_2), ('hash', hash)):
+            row = []
+            for bloom_filter in (False, True):
+                m = map_class.from_items(((key, key) for key in keys), function=function, bloom_filter=bloom_filter)
+                row.append(time_per_call(m.get, probes))
+
+            memory, estimated, observed = m.bloom_filter_stats()
+            print(f"{label:>6} {name:>16} {row[0]:>7.2f} {row[1]:>7.2f} {memory / 1024:>12.1f} "
+                  f"{estimated:>8.2%} {observed:>7.2%}")
+
+
+def bench_frozen(sizes=(10_000, 100_000), lookups: int = 50_000) -> None:
+    """
+    Prints time per get of both hash maps and of the FrozenHashMap they freeze into,
+    for keys that are all present, and the time freeze takes to build the perfect hash
+    """
+    print(f"\nget of present keys, mutable maps vs frozen (us / call)")
+    print(f"{'size':>8} {'function':>16} {'OA':>7} {'SC':>7} {'frozen':>7} {'freeze (s)':>11}")
+
+    for size in sizes:
+        keys = ['key' + str(i) for i in range(size)]
+        probes = [keys[i * 7919 % size] for i in range(lookups)]
+
+        for name, function in (('hash_function_2', hash_function_2), ('hash', hash)):
+            oa_map = OAHashMap.from_items(((key, key) for key in keys), function=function)
+            sc_map = SCHashMap.from_items(((key, key) for key in keys), function=function)
+
+            start = time.perf_counter()
+            frozen = oa_map.freeze()
+            build = time.perf_counter() - start
+
+            assert all(frozen.get(key) == key for key in probes[:1000])
+            print(f"{size:>8} {name:>16} {time_per_call(oa_map.get, probes):>7.2f} "
+                  f"{time_per_call(sc_map.get, probes):>7.2f} {time_per_call(frozen.get, probes):>7.2f} {build:>11.2f}")
+
+
+def bench_shrink(size: int = 200_000, kept: float = 0.05) -> None:
+    """
+    Prints capacity, memory and time of whole-map operations of both hash maps after
+    removing all but kept of their keys, without shrinking, with a shrink_threshold
+    and with shrink_to_fit after the removals, and how long the removals took
+    """
+    print(f"\n{size} keys, all but {kept:.0%} removed (ms)")
+    print(f"{'map':>4} {'policy':>16} {'capacity':>9} {'remove':>8} {'memory (MB)':>12} "
+          f"{'keys_values':>12} {'empty_buckets':>14}")
+
+    keys = ['key' + str(i) for i in range(size)]
+    removed = keys[int(size * kept):]
+
+    for label, map_class, threshold in (('OA', OAHashMap, 0.125), ('SC', SCHashMap, 0.25)):
+        for policy in ('none', f'threshold {threshold}', 'shrink_to_fit'):
+            timings = {}
+
+            def build_and_purge():
+                m = map_class(11, hash, shrink_threshold=threshold if policy.startswith('threshold') else None)
+                for key in keys:
+                    m.put(key, 0)
+                start = time.perf_counter()
+                for key in removed:
+                    m.remove(key)
+                if policy == 'shrink_to_fit':
+                    m.shrink_to_fit()
+                timings['remove'] = time.perf_counter() - start
+                return m
+
+            memory = traced_bytes(build_and_purge)
+            m = build_and_purge()
+
+            start = time.perf_counter()
+            m.get_keys_and_values()
+            keys_values = time.perf_counter() - start
+
+            start = time.perf_counter()
+            m.empty_buckets()
+            empty_buckets = time.perf_counter() - start
+
+            print(f"{label:>4} {policy:>16} {m.get_capacity():>9} {timings['remove'] * 1e3:>8.0f} "
+                  f"{memory / 2 ** 20:>12.1f} {keys_values * 1e3:>12.2f} {empty_buckets * 1e3:>14.2f}")
+
+
+def bench_ordered(size: int = 200_000, kept: float = 0.1, lookups: int = 20_000) -> None:
+    """
+    Prints memory, time per get and time of iterating and exporting the whole map for the
+    HashEntry, parallel array and compact ordered OA layouts, with every key present and
+    after all but kept of them were removed
+    """
+    print(f"\nOA layouts, {size} keys (memory MB, get us / call, others ms)")
+    print(f"{'map':>16} {'keys':>8} {'memory':>8} {'get':>6} {'iterate':>8} {'keys_values':>12} {'save':>8}")
+
+    keys = ['key' + str(i) for i in range(size)]
+    removed = keys[int(size * kept):]
+
+    for map_class in (OAHashMap, PackedHashMap, OrderedHashMap):
+        for purge in (False, True):
+            def build():
+                m = map_class(11, hash)
+                for key in keys:
+                    m.put(key, 0)
+                if purge:
+                    for key in removed:
+                        m.remove(key)
+                return m
+
+            memory = traced_bytes(build)
+            m = build()
+            probes = [keys[i * 7919 % size] for i in range(lookups)]
+
+            start = time.perf_counter()
+            for _ in m:
+                pass
+            iterate = time.perf_counter() - start
+
+            start = time.perf_counter()
+            m.get_keys_and_values()
+            keys_values = time.perf_counter() - start
+
+            with tempfile.TemporaryDirectory() as directory:
+                start = time.perf_counter()
+                m.save(os.path.join(directory, 'map.hmap'))
+                save = time.perf_counter() - start
+
+            print(f"{map_class.__name__:>16} {m.get_size():>8} {memory / 2 ** 20:>8.1f} "
+                  f"{time_per_call(m.get, probes):>6.2f} {iterate * 1e3:>8.1f} {keys_values * 1e3:>12.1f} "
+                  f"{save * 1e3:>8.0f}")
+
+
+BENCHMARKS = {
+    'oa_lookup': bench_oa_lookup,
+    'sc_resize': bench_sc_resize,
+    'put_latency': bench_put_latency,
+    'oa_memory': bench_oa_memory,
+    'robin_hood': bench_robin_hood,
+    'swiss': bench_swiss,
+    'probing': bench_probing,
+    'long_key_resize': bench_long_key_resize,
+    'hash_distribution': bench_hash_distribution,
+    'bulk_build': bench_bulk_build,
+    'get_many': bench_get_many,
+    'counting': bench_counting,
+    'find_mode_stream': bench_find_mode_stream,
+    'find_mode_parallel': bench_find_mode_parallel,
+    'concurrent': bench_concurrent,
+    'shared_map': bench_shared_map,
+    'snapshot': bench_snapshot,
+    'cache': bench_cache,
+    'treeify': bench_treeify,
+    'small_maps': bench_small_maps,
+    'bloom': bench_bloom,
+    'frozen': bench_frozen,
+    'shrink': bench_shrink,
+    'ordered': bench_ordered,
+}
+
+
+if __name__ == "__main__":
+
+    for name in sys.argv[1:] or BENCHMARKS:
+        BENCHMARKS[name]()
@@ -0,0 +1,86 @@
+# Name: Daniel Kim
+# Description: Tests for the open addressing HashMap implementations
+#
+# Usage: python -m pytest 7_hash_map_OA_test.py
+
+import importlib.util
+import os
+import sys
+
+import pytest
+
+
+def load_module(name: str, filename: str):
+    """
+    Imports a numbered file of this directory under the module name the other files import it by
+
+    Input: Module name (string), File name (string)
+    Output: Module
+    """
+    if name not in sys.modules:
+        path = os.path.join(os.path.dirname(os.path.abspath(__file__)), filename)
+        spec = importlib.util.spec_from_file_location(name, path)
+        sys.modules[name] = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(sys.modules[name])
+    return sys.modules[name]
+
+
+a6_include = load_module('a6_include', '1_a6_include.py')
+hash_map_OA = load_module('hash_map_OA', '2_hash_map_OA.py')
+
+
+@pytest.mark.parametrize('compact_threshold', [0, 0.1, 0.5, 1.01, 2])
+def test_compact_threshold_out_of_range(compact_threshold):
+    with pytest.raises(ValueError):
+        hash_map_OA.HashMap(11, a6_include.hash_function_1, compact_threshold=compact_threshold)
+
+
+@pytest.mark.parametrize('compact_threshold', [0.51, 0.75, 1])
+def test_compact_threshold_in_range(compact_threshold):
+    m = hash_map_OA.HashMap(11, a6_include.hash_function_1, compact_threshold=compact_threshold)
+    for i in range(200):
+        m.put('key' + str(i), i)
+        if i % 3 == 0:
+            m.remove('key' + str(i))
+
+    assert m.get_size() == 133
+    assert m.get('key2') == 2 and m.get('key3') is None
+
+
+@pytest.mark.parametrize('max_load_factor', [0, 1.0, 1.5])
+def test_swiss_max_load_factor_out_of_range(max_load_factor):
+    pytest.importorskip('numpy')
+    with pytest.raises(ValueError):
+        hash_map_OA.SwissHashMap(16, a6_include.hash_function_1, max_load_factor=max_load_factor)
+
+
+def test_swiss_high_max_load_factor_keeps_an_empty_bucket():
+    pytest.importorskip('numpy')
+    m = hash_map_OA.SwissHashMap(16, a6_include.hash_function_1, max_load_factor=0.99)
+    for i in range(40):
+        m.put('key' + str(i), i)
+
+    assert m.get_size() == 40 and m.empty_buckets() > 0
+    assert m.get('key39') == 39 and m.get('missing') is None
+
+
+OA_CLASSES = [hash_map_OA.HashMap, hash_map_OA.RobinHoodHashMap, hash_map_OA.PackedHashMap,
+              hash_map_OA.SwissHashMap, hash_map_OA.OrderedHashMap]
+
+
+@pytest.mark.parametrize('map_class', OA_CLASSES, ids=lambda map_class: map_class.__name__)
+def test_probe_length_stats(map_class):
+    if map_class is hash_map_OA.SwissHashMap:
+        pytest.importorskip('numpy')
+
+    assert map_class(11, a6_include.hash_function_1).probe_length_stats() == (0.0, 0)
+
+    # Every key has the same hash, so all but the first key are reached only after extra probes
+    m = map_class(11, lambda key: 7)
+    for i in range(40):
+        m.put('key' + str(i), i)
+    m.remove('key0')
+
+    average, longest = m.probe_length_stats()
+    assert 0 < average <= longest < m.get_capacity()
+    assert m.get('key39') == 39